@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+import asyncio
+import time
+from typing import TYPE_CHECKING, Dict, Optional
 
-from discord import Attachment, Bot, TextChannel, Interaction
+from discord import ApplicationContext, Attachment, Bot, CheckFailure, Guild, TextChannel, Interaction
 
 from Classes.Database import Database
+from Utilities import log
 from .GuildManager import GuildManager
 from .LodestoneClient import LodestoneClient
 from .ImgurClient import ImgurClient
+from .CardImageRenderer import CardImageRenderer
+from .MessageCache import MessageCache
 
 if TYPE_CHECKING:
     from Classes import GuildData
@@ -24,9 +29,14 @@ class RentARaBot(Bot):
         "_guild_mgr",
         "_lodestone",
         "_imgur",
+        "_card_renderer",
+        "_msg_cache",
+        "_load_retries",
     )
     
     IMAGE_DUMP = 991902526188302427
+    LOAD_RETRIES = 3
+    LOAD_RETRY_DELAY = 30  # Seconds, multiplied by the attempt number
 
 ################################################################################
     def __init__(self, *args, **kwargs):
@@ -39,6 +49,10 @@ class RentARaBot(Bot):
         self._guild_mgr: GuildManager = GuildManager(self)
         self._lodestone: LodestoneClient = LodestoneClient(self)
         self._imgur: ImgurClient = ImgurClient(self)
+        self._card_renderer: CardImageRenderer = CardImageRenderer(self)
+        self._msg_cache: MessageCache = MessageCache()
+        # Guild ID -> the task retrying that guild's failed load
+        self._load_retries: Dict[int, asyncio.Task] = {}
         
 ################################################################################
     def __getitem__(self, guild_id: int) -> GuildData:
@@ -74,27 +88,136 @@ class RentARaBot(Bot):
         
         return self._imgur
     
+################################################################################
+    @property
+    def card_renderer(self) -> CardImageRenderer:
+        
+        return self._card_renderer
+    
+################################################################################
+    @property
+    def message_cache(self) -> MessageCache:
+        
+        return self._msg_cache
+    
 ################################################################################
     async def load_all(self) -> None:
 
         print("Initializing... Fetching image dump...")
         # Image dump can be hard-coded since it's never going to be different.
         self._img_dump = await self.fetch_channel(self.IMAGE_DUMP)
+        await self._card_renderer.load_assets()
         
         # Generate all GuildDatas to load database info into.
         for g in self.guilds:
             self._guild_mgr.add_guild(g)
 
+        print("Initializing... Asserting database structure...")
+        await asyncio.to_thread(self._db._assert_structure)
+
         print("Initializing... Retrieving database payload...")
-        # Retrieve (and parse) database payload.
-        payload = self.database.load_all()
+        # Retrieve (and parse) database payload off the event loop so
+        # interactions can still be answered in the meantime.
+        start = time.perf_counter()
+        payload = await asyncio.to_thread(
+            self.database.load_all, [g.id for g in self.guilds]
+        )
 
         print("Initializing... Loading Frogge guilds...")  
-        # Drop into each guild and load their data.
-        for frogge in self._guild_mgr.fguilds:
+        # Drop into each guild and load their data. Guilds hydrate
+        # concurrently and start serving commands as soon as they're ready.
+        first_ready: Optional[float] = None
+        
+        async def _load(frogge: GuildData) -> None:
+            nonlocal first_ready
             await frogge.load_all(payload[frogge.guild_id])
-
-        print("Done!")
+            if first_ready is None:
+                first_ready = time.perf_counter() - start
+                print(f"Initializing... First guild ready after {first_ready:.2f}s ({frogge.name})")
+        
+        frogges = self._guild_mgr.fguilds
+        results = await asyncio.gather(
+            *[_load(frogge) for frogge in frogges],
+            return_exceptions=True
+        )
+        for frogge, result in zip(frogges, results):
+            if isinstance(result, Exception):
+                log.error(frogge, f"Failed to load guild data: {result!r}")
+                self._schedule_retry(frogge.parent)
+
+        print(f"Done! All guilds ready after {time.perf_counter() - start:.2f}s")
+        
+################################################################################
+    async def load_guild(self, guild: Guild) -> None:
+        
+        frogge = self._guild_mgr.add_guild(guild)
+        try:
+            payload = await asyncio.to_thread(self.database.load_all, [guild.id])
+            await frogge.load_all(payload[guild.id])
+        except Exception as ex:
+            log.error(frogge, f"Failed to load guild data: {ex!r}")
+            self._schedule_retry(guild)
+        
+################################################################################
+    def _schedule_retry(self, guild: Guild) -> None:
+        
+        if guild.id not in self._load_retries:
+            self._load_retries[guild.id] = asyncio.create_task(self._retry_load(guild))
+        
+################################################################################
+    async def _retry_load(self, guild: Guild) -> None:
+        """Reloads a guild whose data failed to load, from a fresh GuildData
+        each time, backing off between attempts. Commands in the guild are
+        answered with a load failure error in the meantime."""
+        
+        try:
+            await self._retry_load_attempts(guild)
+        finally:
+            self._load_retries.pop(guild.id, None)
+            
+################################################################################
+    async def _retry_load_attempts(self, guild: Guild) -> None:
+        
+        for attempt in range(1, self.LOAD_RETRIES + 1):
+            await asyncio.sleep(self.LOAD_RETRY_DELAY * attempt)
+            
+            # Removed from the guild or reloaded some other way meanwhile.
+            # A GuildData that never got as far as loading counts as failed.
+            failed = self._guild_mgr[guild.id]
+            if failed is None or failed.is_ready:
+                return
+            
+            try:
+                payload = await asyncio.to_thread(self.database.load_all, [guild.id])
+                
+                failed.close()
+                self._guild_mgr.remove_guild(guild.id)
+                await self._guild_mgr.add_guild(guild).load_all(payload[guild.id])
+            except Exception as ex:
+                log.error(failed, f"Retry {attempt} of loading guild data failed: {ex!r}")
+            else:
+                log.info(failed, f"Guild data loaded on retry {attempt}.")
+                return
+        
+################################################################################
+    async def on_application_command_error(self, context: ApplicationContext, exception: Exception) -> None:
+        
+        # Failed readiness checks have already answered the interaction.
+        if isinstance(exception, CheckFailure) and context.interaction.response.is_done():
+            return
+        
+        await super().on_application_command_error(context, exception)
+        
+################################################################################
+    async def close(self) -> None:
+        
+        await super().close()
+        await self._card_renderer.close()
+        
+        # Flush deferred updates and let any queued database writes land
+        # before the process exits.
+        self._db.update.flush()
+        await asyncio.to_thread(self._db.close)
     
 ################################################################################
     async def dump_image(self, image: Attachment) -> str:
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import aiohttp
+from PIL import Image, ImageOps
+from discord import File
+
+if TYPE_CHECKING:
+    from Classes import RentARaBot
+################################################################################
+
+__all__ = ("CardImageRenderer", )
+
+################################################################################
+class CardImageRenderer:
+    """Fetches, caches and composites trading card images.
+
+    Card art is downloaded asynchronously and kept as pre-resized thumbnails
+    in a bounded in-memory LRU, backed by an on-disk cache keyed by permalink.
+    All decoding and compositing happens on a worker thread, and finished
+    images are uploaded straight from memory."""
+
+    __slots__ = (
+        "_state",
+        "_session",
+        "_executor",
+        "_thumbs",
+        "_pending",
+        "_overlay",
+        "_rendered",
+    )
+
+    THUMB_SIZE = (150, 210)
+    MEMORY_CACHE_SIZE = 256
+    DISK_CACHE_DIR = "Files/CardCache"
+    VERSUS_OVERLAY = "Assets/Versus.png"
+    # (Padding of 10 hardcoded in)
+    VERSUS_PADDING = 10
+    DECK_SLOTS = 6
+    # Bump whenever the deck layout changes so stale renders aren't reused.
+    DECK_LAYOUT_VERSION = 1
+    RENDER_CACHE_SIZE = 512
+    # Discord attachment URLs are signed and expire, so don't hand out
+    # uploads older than this.
+    RENDER_TTL = 12 * 60 * 60
+
+################################################################################
+    def __init__(self, state: RentARaBot) -> None:
+
+        self._state: RentARaBot = state
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="card-render"
+        )
+
+        self._thumbs: OrderedDict[str, Image.Image] = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._overlay: Optional[Image.Image] = None
+        self._rendered: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+
+################################################################################
+    async def _run(self, func, *args):
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+################################################################################
+    def _get_session(self) -> aiohttp.ClientSession:
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+
+        return self._session
+
+################################################################################
+    async def close(self) -> None:
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._executor.shutdown(wait=False)
+
+################################################################################
+    @classmethod
+    def _disk_path(cls, permalink: str) -> str:
+
+        digest = hashlib.sha1(permalink.encode("utf-8")).hexdigest()
+        return os.path.join(cls.DISK_CACHE_DIR, f"{digest}.png")
+
+################################################################################
+    @classmethod
+    def _load_from_disk(cls, permalink: str) -> Optional[Image.Image]:
+
+        path = cls._disk_path(permalink)
+        if not os.path.exists(path):
+            return
+
+        try:
+            with Image.open(path) as img:
+                return img.convert("RGBA")
+        except (OSError, ValueError):
+            # Corrupt or partially written entry; fetch it again.
+            return
+
+################################################################################
+    @classmethod
+    def _decode(cls, permalink: str, data: bytes) -> Image.Image:
+        """Decodes downloaded card art into a thumbnail and writes it to the
+        disk cache. Raises `UnidentifiedImageError` if it isn't an image."""
+
+        with Image.open(BytesIO(data)) as img:
+            thumb = img.convert("RGBA").resize(cls.THUMB_SIZE)
+
+        try:
+            os.makedirs(cls.DISK_CACHE_DIR, exist_ok=True)
+            thumb.save(cls._disk_path(permalink))
+        except OSError:
+            pass
+
+        return thumb
+
+################################################################################
+    def _remember(self, permalink: str, thumb: Image.Image) -> None:
+
+        self._thumbs[permalink] = thumb
+        self._thumbs.move_to_end(permalink)
+        while len(self._thumbs) > self.MEMORY_CACHE_SIZE:
+            self._thumbs.popitem(last=False)
+
+################################################################################
+    async def get_thumbnail(self, permalink: Optional[str]) -> Optional[Image.Image]:
+        """Returns the 150x210 thumbnail for the given card art, or ``None``
+        if there's no permalink. Concurrent requests for the same art share
+        a single download.
+
+        Raises `UnidentifiedImageError` if the permalink isn't an image."""
+
+        if not permalink:
+            return
+
+        thumb = self._thumbs.get(permalink)
+        if thumb is not None:
+            self._thumbs.move_to_end(permalink)
+            return thumb
+
+        pending = self._pending.get(permalink)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[permalink] = future
+        try:
+            thumb = await self._run(self._load_from_disk, permalink)
+            if thumb is None:
+                async with self._get_session().get(permalink) as response:
+                    response.raise_for_status()
+                    data = await response.read()
+                thumb = await self._run(self._decode, permalink, data)
+        except Exception as ex:
+            future.set_exception(ex)
+            # Mark it retrieved so an unawaited failure isn't logged.
+            future.exception()
+            raise
+        else:
+            self._remember(permalink, thumb)
+            future.set_result(thumb)
+            return thumb
+        finally:
+            self._pending.pop(permalink, None)
+
+################################################################################
+    async def get_thumbnails(self, permalinks: List[Optional[str]]) -> List[Optional[Image.Image] | Exception]:
+        """Fetches several thumbnails concurrently. Failures are returned in
+        place of the image rather than raised."""
+
+        return await asyncio.gather(
+            *[self.get_thumbnail(p) for p in permalinks], return_exceptions=True
+        )
+
+################################################################################
+    @classmethod
+    def _compose_deck(cls, slots: List[Tuple[Optional[Image.Image], bool]]) -> BytesIO:
+
+        slot_width, slot_height = cls.THUMB_SIZE
+        canvas = Image.new("RGBA", (slot_width * cls.DECK_SLOTS, slot_height), (255, 255, 255, 0))
+
+        for i, (thumb, overridden) in enumerate(slots):
+            if thumb is None:
+                continue
+
+            if overridden:
+                # Grey the card out at 50% transparency.
+                thumb = ImageOps.grayscale(thumb).convert("RGBA")
+                thumb.putalpha(Image.new("L", thumb.size, color=128))
+
+            canvas.paste(thumb, (i * slot_width, 0), thumb)
+
+        return cls._to_buffer(canvas)
+
+################################################################################
+    async def load_assets(self) -> None:
+        """Decodes the static battle assets into memory ahead of time. Die
+        faces and round banners are hosted images referenced by URL, so only
+        the versus overlay is composited locally."""
+
+        await self._run(self._get_overlay)
+
+################################################################################
+    def _get_overlay(self) -> Image.Image:
+
+        if self._overlay is None:
+            with Image.open(self.VERSUS_OVERLAY) as img:
+                self._overlay = img.convert("RGBA")
+
+        return self._overlay
+
+################################################################################
+    def _compose_versus(self, thumb1: Optional[Image.Image], thumb2: Optional[Image.Image]) -> BytesIO:
+
+        overlay = self._get_overlay()
+        canvas = Image.new("RGBA", overlay.size, (255, 255, 255, 0))
+
+        if thumb1 is not None:
+            canvas.paste(thumb1, (0, self.VERSUS_PADDING), thumb1)
+        if thumb2 is not None:
+            canvas.paste(thumb2, (overlay.width - self.THUMB_SIZE[0], self.VERSUS_PADDING), thumb2)
+
+        canvas.paste(overlay, (0, 0), overlay)
+
+        return self._to_buffer(canvas)
+
+################################################################################
+    @staticmethod
+    def _to_buffer(image: Image.Image) -> BytesIO:
+
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        buffer.seek(0)
+
+        return buffer
+
+################################################################################
+    async def render_deck(self, slots: List[Tuple[Optional[Image.Image], bool]]) -> BytesIO:
+        """Lays out up to six card thumbnails side by side as a PNG. Each slot
+        is a thumbnail (or ``None`` to leave a gap) and whether to grey it out."""
+
+        return await self._run(self._compose_deck, slots)
+
+################################################################################
+    async def render_versus(self, thumb1: Optional[Image.Image], thumb2: Optional[Image.Image]) -> BytesIO:
+
+        return await self._run(self._compose_versus, thumb1, thumb2)
+
+################################################################################
+    @classmethod
+    def deck_key(cls, slots: List[Tuple[Optional[str], bool]]) -> str:
+        """Hashes a deck's rendered state: each slot's permalink and whether
+        it's greyed out, in order, plus the layout version."""
+
+        digest = hashlib.sha256(str(cls.DECK_LAYOUT_VERSION).encode("utf-8"))
+        for permalink, overridden in slots:
+            digest.update(b"\0" + (permalink or "").encode("utf-8") + (b"\1" if overridden else b"\2"))
+
+        return digest.hexdigest()
+
+################################################################################
+    def get_rendered(self, key: str) -> Optional[str]:
+        """Returns the URL already uploaded for a render key, if still fresh."""
+
+        entry = self._rendered.get(key)
+        if entry is None:
+            return
+
+        url, uploaded_at = entry
+        if time.monotonic() - uploaded_at > self.RENDER_TTL:
+            del self._rendered[key]
+            return
+
+        self._rendered.move_to_end(key)
+        return url
+
+################################################################################
+    def remember_rendered(self, key: str, url: str) -> None:
+
+        self._rendered[key] = (url, time.monotonic())
+        self._rendered.move_to_end(key)
+        while len(self._rendered) > self.RENDER_CACHE_SIZE:
+            self._rendered.popitem(last=False)
+
+################################################################################
+    async def upload(self, buffer: BytesIO, filename: str) -> str:
+        """Posts a rendered image to the image dump channel and returns its URL."""
+
+        post = await self._state._img_dump.send(file=File(buffer, filename=filename))
+        return post.attachments[0].url
+
+################################################################################
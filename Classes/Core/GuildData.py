@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, Optional, Set, Tuple, Union
 
-from discord import Guild, NotFound, Role, Member, User, Emoji, Message
+from discord import ApplicationContext, Guild, NotFound, Role, Member, User, Emoji, Message
 from discord.abc import GuildChannel
 
 from Classes.Forms.FormsManager import FormsManager
 from Classes.Profiles.ProfileManager import ProfileManager
 from Classes.TradingCardGame.TCGManager import TCGManager
 from Classes.Verification.VerificationManager import VerificationManager
+from Errors import GuildLoadFailed, GuildNotReady
 from Utilities import log
+from .MessageCache import MessageCache
 
 if TYPE_CHECKING:
     from Classes import FroggeBot
@@ -27,7 +30,13 @@ class GuildData:
         "_profile_mgr",
         "_tcg_mgr",
         "_verification_mgr",
+        "_resolved",
+        "_ready",
+        "_load_error",
     )
+    
+    RESOLVE_CONCURRENCY = 10
+    READY_GRACE = 1.5
 
 ################################################################################
     def __init__(self, bot: FroggeBot, parent: Guild):
@@ -39,14 +48,130 @@ class GuildData:
         self._profile_mgr: ProfileManager = ProfileManager(self)
         self._tcg_mgr: TCGManager = TCGManager(self)
         self._verification_mgr: VerificationManager = VerificationManager(self)
+        
+        self._resolved: Dict[int, Any] = {}
+        self._ready: asyncio.Event = asyncio.Event()
+        self._load_error: Optional[Exception] = None
 
 ################################################################################
     async def load_all(self, payload: Dict[str, Any]) -> None:
         
-        await self._form_mgr.load_all(payload["forms"])
-        await self._profile_mgr.load_all(payload["profiles"])
-        await self._tcg_mgr.load_all(payload["trading_card_game"])
-        await self._verification_mgr.load_all(payload["verification"])
+        try:
+            await self._resolve_all(payload)
+            
+            # The subsystems don't depend on each other, so hydrate them all
+            # at once.
+            await asyncio.gather(
+                self._form_mgr.load_all(payload["forms"]),
+                self._profile_mgr.load_all(payload["profiles"]),
+                self._tcg_mgr.load_all(payload["trading_card_game"]),
+                self._verification_mgr.load_all(payload["verification"])
+            )
+        except Exception as ex:
+            self._load_error = ex
+            log.error(self, f"Guild data failed to load: {ex!r}")
+            raise
+        finally:
+            # The resolved objects are only meant to serve the load() calls
+            # above; the gateway cache stays the source of truth afterwards.
+            self._resolved.clear()
+            
+        self._ready.set()
+        log.info(self, "Guild data loaded and ready.")
+        
+################################################################################
+    @property
+    def is_ready(self) -> bool:
+        
+        return self._ready.is_set()
+    
+################################################################################
+    @property
+    def load_failed(self) -> bool:
+        
+        return self._load_error is not None
+    
+################################################################################
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Waits for this guild's data to finish loading. Returns whether it
+        did so within `timeout` seconds."""
+        
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        
+        return True
+        
+################################################################################
+    async def ensure_ready(self, ctx: ApplicationContext) -> bool:
+        """Gives a guild that's still loading `READY_GRACE` seconds to finish
+        before a command runs. If it doesn't, or its load failed, the command
+        is answered with an error and this returns ``False``."""
+        
+        if not self.load_failed and await self.wait_until_ready(self.READY_GRACE):
+            return True
+        
+        error = GuildLoadFailed() if self.load_failed else GuildNotReady()
+        await ctx.respond(embed=error, ephemeral=True)
+        return False
+        
+################################################################################
+    async def _resolve_all(self, payload: Dict[str, Any]) -> None:
+        """Resolves every channel, role and user referenced by the payload
+        before the managers load. Whatever the gateway cache can't provide is
+        fetched concurrently, at most `RESOLVE_CONCURRENCY` requests at a time.
+        The `get_or_fetch_*` methods serve these results while loading."""
+        
+        channel_ids: Set[int] = set()
+        role_ids: Set[int] = set()
+        user_ids: Set[int] = set()
+        
+        for form in payload["forms"]:
+            fdata = form["form"]
+            channel_ids.update((fdata[2], fdata[7]))
+            role_ids.update(fdata[6] or [])
+            
+        profiles = payload["profiles"]
+        channel_ids.add(profiles["category_id"])
+        for group in profiles["channels"]:
+            channel_ids.update(group[2] or [])
+            role_ids.update(group[3] or [])
+        user_ids.update(p["profile"][2] for p in profiles["profiles"])
+        
+        for relation in payload["verification"]["roles"]:
+            role_ids.update((relation[2], relation[3]))
+            
+        semaphore = asyncio.Semaphore(self.RESOLVE_CONCURRENCY)
+        
+        async def _fetch(_id: int, fetcher: Callable[[int], Coroutine]) -> None:
+            async with semaphore:
+                self._resolved[_id] = await fetcher(_id)
+        
+        tasks = []
+        for ids, getter, fetcher in (
+            (channel_ids, self.parent.get_channel, self.get_or_fetch_channel),
+            (role_ids, self.parent.get_role, self.get_or_fetch_role),
+            (user_ids, self.get_member_or_user, self.get_or_fetch_member_or_user),
+        ):
+            ids.discard(None)
+            for _id in ids:
+                if (obj := getter(_id)) is not None:
+                    self._resolved[_id] = obj
+                else:
+                    tasks.append(_fetch(_id, fetcher))
+                    
+        log.debug(
+            self, 
+            f"Resolved {len(self._resolved)} objects from cache, "
+            f"fetching {len(tasks)}"
+        )
+        await asyncio.gather(*tasks)
+        
+################################################################################
+    def get_member_or_user(self, user_id: int) -> Optional[Union[Member, User]]:
+        
+        return self.parent.get_member(user_id) or self._state.get_user(user_id)
         
 ################################################################################
     @property
@@ -104,6 +229,9 @@ class GuildData:
         if channel_id is None:
             return
         
+        if channel_id in self._resolved:
+            return self._resolved_as(channel_id, GuildChannel)
+        
         if channel := self.parent.get_channel(channel_id):
             log.debug(self, f"Channel Gotten: {channel.name}")
             return channel
@@ -124,6 +252,9 @@ class GuildData:
         if role_id is None:
             return
         
+        if role_id in self._resolved:
+            return self._resolved_as(role_id, Role)
+        
         if role := self.parent.get_role(role_id):
             log.debug(self, f"Role Gotten: {role.name}")
             return role
@@ -158,6 +289,9 @@ class GuildData:
         
         log.debug(self, f"Fetching Member or User: {user_id}")
         
+        if user_id in self._resolved:
+            return self._resolved_as(user_id, (Member, User))
+        
         if member := await self.get_or_fetch_member(user_id):
             return member
         
@@ -173,6 +307,14 @@ class GuildData:
             log.debug(self, f"User Fetched: {user.name}")
             return user
         
+################################################################################
+    def _resolved_as(self, _id: int, _type: Union[type, Tuple[type, ...]]) -> Optional[Any]:
+        
+        # Snowflakes are unique across object types, so a resolved object of
+        # another type means the ID doesn't refer to the requested type.
+        obj = self._resolved[_id]
+        return obj if isinstance(obj, _type) else None
+    
 ################################################################################
     async def get_or_fetch_emoji(self, emoji_id: int) -> Optional[Emoji]:
         
@@ -195,17 +337,36 @@ class GuildData:
         if message_url is None:
             return
         
-        url_parts = message_url.split("/")
+        key = MessageCache.key_for(message_url)
+        cache = self.bot.message_cache
+        if key in cache:
+            return cache.get(key)
         
-        if message := self.bot.get_message(int(url_parts[-1])):
-            return message
-        
-        if channel := await self.get_or_fetch_channel(int(url_parts[-2])):
+        message = self.bot.get_message(key[1])
+        if message is None:
+            channel = await self.get_or_fetch_channel(key[0])
+            if channel is None:
+                return
+            
             try:
-                return await channel.fetch_message(int(url_parts[-1]))  # type: ignore
+                message = await channel.fetch_message(key[1])  # type: ignore
             except NotFound:
+                # Only a confirmed miss is remembered, so a dangling URL isn't
+                # refetched every time but a transient failure is retried.
+                cache.put_missing(key)
                 return
+        
+        cache.put(message)
+        return message
 
+################################################################################
+    def close(self) -> None:
+        """Stops the guild's background work (profile revivals and battle
+        tasks) so its data can be released. Battle checkpoints are kept."""
+        
+        self._profile_mgr.reviver.stop()
+        self._tcg_mgr.close()
+        
 ################################################################################
     async def member_left(self, member: Member) -> None:
         
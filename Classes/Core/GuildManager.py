@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from discord import Guild
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
 
 from .GuildData import GuildData
 
@@ -23,32 +23,47 @@ class GuildManager:
     def __init__(self, bot: FroggeBot):
         
         self._state: FroggeBot = bot
-        self._fguilds: List[GuildData] = []
+        # Keyed by guild ID. Dicts keep insertion order, so iteration still
+        # follows the order guilds were added in.
+        self._fguilds: Dict[int, GuildData] = {}
     
 ################################################################################
-    def __getitem__(self, guild_id: int) -> GuildData:
+    def __getitem__(self, guild_id: int) -> Optional[GuildData]:
         
-        for frogge in self._fguilds:
-            if frogge.guild_id == guild_id:
-                return frogge
+        return self._fguilds.get(guild_id)
     
 ################################################################################
-    def __iter__(self):
+    def __iter__(self) -> Iterator[GuildData]:
         
-        return iter(self._fguilds)
+        return iter(self._fguilds.values())
+    
+################################################################################
+    def __len__(self) -> int:
+        
+        return len(self._fguilds)
     
 ################################################################################    
     @property
     def fguilds(self) -> List[GuildData]:
         
-        return self._fguilds
+        return list(self._fguilds.values())
     
 ################################################################################
-    def add_guild(self, guild: Guild) -> None:
+    def add_guild(self, guild: Guild) -> GuildData:
         
-        g = self[guild.id]
+        g = self._fguilds.get(guild.id)
         if g is None:
             self._state.database.insert.guild(guild.id)
-            self._fguilds.append(GuildData(self._state, guild))
+            g = GuildData(self._state, guild)
+            self._fguilds[guild.id] = g
+            
+        return g
+        
+################################################################################
+    def remove_guild(self, guild_id: int) -> Optional[GuildData]:
+        
+        # The guild's database rows are kept in case the bot is re-added;
+        # only the in-memory data is released.
+        return self._fguilds.pop(guild_id, None)
         
 ################################################################################
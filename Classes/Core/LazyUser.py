@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional, Type, TypeVar, Union
+
+if TYPE_CHECKING:
+    from discord import Member, User
+
+    from Classes import GuildData
+################################################################################
+
+__all__ = ("LazyUser", )
+
+LU = TypeVar("LU", bound="LazyUser")
+
+################################################################################
+class LazyUser:
+    """A reference to a Discord user that's only resolved when it's needed.
+
+    Stores the raw user ID. The user object is looked up in the gateway cache
+    on synchronous access, or fetched by `resolve()`, and memoised either way.
+    Compares equal to anything with the same ``id``."""
+
+    __slots__ = (
+        "_guild",
+        "_id",
+        "_user",
+        "_fetched",
+    )
+
+################################################################################
+    def __init__(
+        self,
+        guild: GuildData,
+        user_id: int,
+        user: Optional[Union[Member, User]] = None
+    ) -> None:
+
+        self._guild: GuildData = guild
+        self._id: int = user_id
+
+        self._user: Optional[Union[Member, User]] = user
+        self._fetched: bool = user is not None
+
+################################################################################
+    @classmethod
+    def from_user(cls: Type[LU], guild: GuildData, user: Union[Member, User]) -> LU:
+
+        return cls(guild, user.id, user)
+
+################################################################################
+    def __eq__(self, other: Any) -> bool:
+
+        return getattr(other, "id", None) == self._id
+
+################################################################################
+    def __hash__(self) -> int:
+
+        return hash(self._id)
+
+################################################################################
+    @property
+    def id(self) -> int:
+
+        return self._id
+
+################################################################################
+    @property
+    def cached(self) -> Optional[Union[Member, User]]:
+        """The user object if it's already known or in the gateway cache.
+        Never makes a request."""
+
+        if self._user is None:
+            self._user = self._guild.get_member_or_user(self._id)
+
+        return self._user
+
+################################################################################
+    @property
+    def mention(self) -> str:
+
+        return f"<@{self._id}>"
+
+################################################################################
+    @property
+    def name(self) -> str:
+
+        user = self.cached
+        return user.name if user is not None else str(self._id)
+
+################################################################################
+    @property
+    def display_name(self) -> str:
+
+        user = self.cached
+        return user.display_name if user is not None else str(self._id)
+
+################################################################################
+    async def resolve(self) -> Optional[Union[Member, User]]:
+        """Returns the user object, fetching it on the first call if it isn't
+        cached. Users that can't be found are remembered as ``None``."""
+
+        if self.cached is None and not self._fetched:
+            self._user = await self._guild.get_or_fetch_member_or_user(self._id)
+            self._fetched = True
+
+        return self._user
+
+################################################################################
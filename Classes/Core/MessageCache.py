@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from discord import Message
+################################################################################
+
+__all__ = ("MessageCache", )
+
+MessageKey = Tuple[int, int]
+
+################################################################################
+class MessageCache:
+    """Messages the bot keeps coming back to (profile posts and the like),
+    keyed by ``(channel ID, message ID)``.
+
+    Unlike the gateway's message cache this survives the churn of busy
+    channels, and it also remembers for a while that a message is gone, so a
+    dangling post URL doesn't cost a channel and message fetch every time
+    it's looked at. Entries expire after `TTL` seconds (`MISSING_TTL` for
+    missing messages) and the least recently used are dropped past
+    `MAX_ENTRIES`. Gateway edit and delete events keep entries current."""
+
+    __slots__ = (
+        "_entries",
+    )
+
+    MAX_ENTRIES = 2048
+    TTL = 6 * 60 * 60
+    MISSING_TTL = 10 * 60
+
+################################################################################
+    def __init__(self) -> None:
+
+        # Key -> (message, or None if it's known to be gone; expiry time)
+        self._entries: OrderedDict[MessageKey, Tuple[Optional[Message], float]] = OrderedDict()
+
+################################################################################
+    def __len__(self) -> int:
+
+        return len(self._entries)
+
+################################################################################
+    def __contains__(self, key: MessageKey) -> bool:
+
+        return self._entry(key) is not None
+
+################################################################################
+    @staticmethod
+    def key_for(message_url: str) -> MessageKey:
+
+        url_parts = message_url.split("/")
+        return int(url_parts[-2]), int(url_parts[-1])
+
+################################################################################
+    def _entry(self, key: MessageKey) -> Optional[Tuple[Optional[Message], float]]:
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return
+
+        self._entries.move_to_end(key)
+        return entry
+
+################################################################################
+    def _store(self, key: MessageKey, message: Optional[Message], ttl: float) -> None:
+
+        self._entries[key] = (message, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+################################################################################
+    def get(self, key: MessageKey) -> Optional[Message]:
+        """Returns the cached message, or ``None`` if it isn't cached or is
+        known to be missing. Check membership first to tell those apart."""
+
+        entry = self._entry(key)
+        return entry[0] if entry is not None else None
+
+################################################################################
+    def put(self, message: Message) -> None:
+
+        self._store((message.channel.id, message.id), message, self.TTL)
+
+################################################################################
+    def put_missing(self, key: MessageKey) -> None:
+
+        self._store(key, None, self.MISSING_TTL)
+
+################################################################################
+    def refresh(self, message: Message) -> None:
+        """Replaces a tracked message with its edited copy."""
+
+        if (message.channel.id, message.id) in self._entries:
+            self.put(message)
+
+################################################################################
+    def discard(self, key: MessageKey) -> None:
+
+        self._entries.pop(key, None)
+
+################################################################################
+    def deleted(self, key: MessageKey) -> None:
+
+        if key in self._entries:
+            self.put_missing(key)
+
+################################################################################
+    def channel_deleted(self, channel_id: int) -> None:
+
+        for key in [k for k in self._entries if k[0] == channel_id]:
+            self.put_missing(key)
+
+################################################################################
@@ -1,10 +1,13 @@
 from .Bot import RentARaBot
+from .CardImageRenderer import CardImageRenderer
 from .DatabaseItem import DatabaseItem
 from .GuildData import GuildData
 from .GuildManager import GuildManager
 from .Identifiable import Identifiable
 from .ImgurClient import ImgurClient
 from .ItemManager import ItemManager
+from .LazyUser import LazyUser
 from .LodestoneClient import LodestoneClient
 from .ManagedItem import ManagedItem
+from .MessageCache import MessageCache
 ################################################################################
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Tuple
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
 if TYPE_CHECKING:
@@ -42,18 +42,33 @@ class DBWorkerBranch:
         return uuid4().hex
     
 ################################################################################
-    def execute(self, query: str, *args: any) -> None:
+    def execute(self, query: str, *args: Any) -> None:
         
         self.database.execute(query, *args)
             
 ################################################################################
-    def fetchall(self) -> Tuple[Tuple[Any, ...]]:
+    def fetchall(self, query: str, *args: Any) -> Tuple[Tuple[Any, ...]]:
         
-        return self.database.fetchall()
+        return self.database.execute(query, *args, fetch="all")
     
 ################################################################################
-    def fetchone(self) -> Tuple[Any, ...]:
+    def fetchone(self, query: str, *args: Any) -> Optional[Tuple[Any, ...]]:
         
-        return self.database.fetchone()
+        return self.database.execute(query, *args, fetch="one")
     
+################################################################################
+    def stream(self, query: str, *args: Any) -> Iterator[Tuple[Any, ...]]:
+        
+        return self.database.stream(query, *args)
+    
+################################################################################
+    def submit(self, query: str, *args: Any) -> None:
+        
+        self.database.submit(query, *args)
+        
+################################################################################
+    def submit_batch(self, query: str, rows: List[Tuple[Any, ...]], values: bool = False) -> None:
+        
+        self.database.submit_batch(query, rows, values)
+        
 ################################################################################
@@ -10,6 +10,35 @@ class DatabaseBuilder(DBWorkerBranch):
 
     def build_all(self) -> None:
         
+        self.execute(
+            "ALTER TABLE tcg_booster_config "
+            "ADD COLUMN IF NOT EXISTS battle_pacing INTEGER NOT NULL DEFAULT 1;"
+        )
+        self.execute(
+            "ALTER TABLE tcg_booster_config "
+            "ADD COLUMN IF NOT EXISTS battle_limit INTEGER NOT NULL DEFAULT 3;"
+        )
+        self.execute(
+            "ALTER TABLE profile_managers "
+            "ADD COLUMN IF NOT EXISTS revive_budget INTEGER NOT NULL DEFAULT 10;"
+        )
+        self.execute(
+            "CREATE TABLE IF NOT EXISTS tcg_battles ("
+            "_id TEXT PRIMARY KEY, "
+            "guild_id BIGINT NOT NULL, "
+            "thread_id BIGINT NOT NULL, "
+            "p1_user_id BIGINT NOT NULL, "
+            "p2_user_id BIGINT NOT NULL, "
+            "p1_deck_id TEXT NOT NULL, "
+            "p2_deck_id TEXT NOT NULL, "
+            "round_idx INTEGER NOT NULL DEFAULT 1, "
+            "p1_wins INTEGER NOT NULL DEFAULT 0, "
+            "p2_wins INTEGER NOT NULL DEFAULT 0, "
+            "p1_overrides TEXT[] NOT NULL DEFAULT '{}', "
+            "p2_overrides TEXT[] NOT NULL DEFAULT '{}'"
+            ");"
+        )
+        
         print("Database lookin' good!")
 
 ################################################################################
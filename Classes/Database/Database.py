@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 import os
-from typing import TYPE_CHECKING, Any, Dict, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+from uuid import uuid4
 
 import psycopg2
 from dotenv import load_dotenv
-from psycopg2 import OperationalError
+from psycopg2 import InterfaceError, OperationalError
+from psycopg2.errors import UniqueViolation
+from psycopg2.extras import execute_batch, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 from .Worker import DatabaseWorker
 
@@ -27,9 +33,15 @@ class Database:
     __slots__ = (
         "_state",
         "_connection",
-        "_cursor",
         "_worker",
+        "_pool",
+        "_writer",
     )
+    
+    STREAM_BATCH_SIZE = 2000
+    POOL_MIN_SIZE = 1
+    POOL_MAX_SIZE = 10
+    MAX_RETRIES = 1
 
 ################################################################################
     def __init__(self, bot: RentARaBot):
@@ -37,9 +49,15 @@ class Database:
         self._state: RentARaBot = bot
 
         self._connection: connection = None  # type: ignore
-        self._cursor: cursor = None  # type: ignore
         self._worker: DatabaseWorker = DatabaseWorker(bot)
         
+        self._pool: Optional[ThreadedConnectionPool] = None
+        # Every write, and every synchronous `execute()`, runs on this single
+        # thread, so they're applied in the order they were issued.
+        self._writer: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="db-writer"
+        )
+        
 ################################################################################        
     def _connect(self) -> None:
 
@@ -48,7 +66,6 @@ class Database:
         self._reset_connection()
 
         self._connection = psycopg2.connect(os.getenv("DATABASE_URL"))
-        self._cursor = self._connection.cursor()
 
         print("Connecting to database")
 
@@ -58,51 +75,222 @@ class Database:
         self._worker.build_all()
 
 ################################################################################
-    def load_all(self) -> Dict[int, Dict[str, Any]]:
+    def load_all(self, guild_ids: Optional[List[int]] = None) -> Dict[int, Dict[str, Any]]:
 
-        return self._worker.load_all()
+        # The payload is streamed over its own connection, so rows inserted
+        # for newly joined guilds have to land before it's read.
+        self.drain()
+        return self._worker.load_all(guild_ids)
     
 ################################################################################
     def _reset_connection(self) -> None:
 
         try:
-            self._cursor.close()
             self._connection.close()
         except (OperationalError, AttributeError):
             pass
         finally:
             self._connection = None
-            self._cursor = None
 
 ################################################################################
-    def execute(self, query: str, *fmt_args: Any) -> None:
+    def execute(self, query: str, *fmt_args: Any, fetch: Optional[str] = None) -> Any:
+        """Executes a query synchronously and returns its results from the
+        same call, so they can't be clobbered by another execution.
+        
+        The query is run on the writer lane behind any queued writes, so it
+        sees everything submitted ahead of it. It blocks until then, so it's
+        only for use off the event loop (the loader and builder); writes made
+        from the loop go through `submit()` instead.
+        
+        Parameters:
+        -----------
+        query: :class:`str`
+            The query to execute.
+        fmt_args: Any
+            The query's format arguments.
+        fetch: Optional[:class:`str`]
+            ``"one"`` or ``"all"`` to return the query's results, or ``None``.
+        """
+
+        return self._writer.submit(
+            self._run, self._get_pool(), query, fmt_args, fetch
+        ).result()
 
-        try:
-            self._cursor.execute("SELECT 1")
-        except:
-            print("Database", "Connection to database lost, reconnecting")
-            self._connect()
+################################################################################
+    def _get_pool(self) -> ThreadedConnectionPool:
+
+        if self._pool is None or self._pool.closed:
+            load_dotenv()
+            self._pool = ThreadedConnectionPool(
+                self.POOL_MIN_SIZE, self.POOL_MAX_SIZE, os.getenv("DATABASE_URL")
+            )
+            
+        return self._pool
+    
+################################################################################
+    def _run(self, pool: ThreadedConnectionPool, query: str, fmt_args: Tuple[Any, ...], fetch: Optional[str]) -> Any:
+        """Executes a query on its own pooled connection and cursor. Runs on
+        an executor thread, never on the event loop.
+        
+        Parameters:
+        -----------
+        pool: :class:`ThreadedConnectionPool`
+            The pool to borrow a connection from.
+        query: :class:`str`
+            The query to execute.
+        fmt_args: Tuple[Any, ...]
+            The query's format arguments.
+        fetch: Optional[:class:`str`]
+            ``"one"`` or ``"all"`` to return the query's results, ``"batch"``
+            or ``"values"`` to run `fmt_args` as a batch of argument rows (see
+            `_apply`), or ``None``.
+            
+        Raises:
+        -------
+        :class:`psycopg2.Error`
+            If the query fails, or the connection is still lost after
+            `MAX_RETRIES` retries. A unique violation on a retry isn't an
+            error, since it means the first attempt was committed.
+        """
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            conn = pool.getconn()
+            try:
+                with conn.cursor() as cursor:
+                    result = self._apply(cursor, query, fmt_args, fetch)
+                conn.commit()
+            except (OperationalError, InterfaceError):
+                # The connection died underneath us. Drop it from the pool and
+                # retry on a fresh one.
+                pool.putconn(conn, close=True)
+                if attempt < self.MAX_RETRIES:
+                    print("Database", "Connection to database lost, reconnecting")
+                    continue
+                raise
+            except UniqueViolation:
+                conn.rollback()
+                pool.putconn(conn)
+                # The connection can drop after the commit went through but
+                # before it was acknowledged. Inserted rows carry
+                # client-generated IDs, so a retry that collides with one is
+                # replaying our own write, which has already landed.
+                if attempt > 0:
+                    return
+                raise
+            except Exception:
+                # Anything else is the caller's to handle rather than an empty
+                # result. Queued writes have theirs reported by
+                # `_report_failure()`.
+                conn.rollback()
+                pool.putconn(conn)
+                raise
+            else:
+                pool.putconn(conn)
+                if os.getenv("DEBUG") == "True":
+                    print(f"Database execution succeeded on query: '{query}', Args: {fmt_args}")
+                return result
+    
+################################################################################
+    @staticmethod
+    def _apply(cursor: cursor, query: str, fmt_args: Tuple[Any, ...], fetch: Optional[str]) -> Any:
+
+        if fetch == "batch":
+            # Sends the statement once per argument row, but pages many rows
+            # into each round trip.
+            execute_batch(cursor, query, fmt_args)
+            return
+        if fetch == "values":
+            # Expands the rows into a single `VALUES %s` list.
+            execute_values(cursor, query, fmt_args)
+            return
+        
+        cursor.execute(query, fmt_args)
+        if fetch == "one":
+            return cursor.fetchone()
+        elif fetch == "all":
+            return cursor.fetchall()
+    
+################################################################################
+    def submit(self, query: str, *fmt_args: Any) -> None:
+        """Queues a write that doesn't need its results on the writer lane.
+        Writes are applied in submission order without blocking the caller."""
 
-        load_dotenv()
+        future = self._writer.submit(self._run, self._get_pool(), query, fmt_args, None)
+        future.add_done_callback(partial(self._report_failure, query, fmt_args))
         
-        try:
-            self._cursor.execute(query, fmt_args)
-            self._connection.commit()
-            if os.getenv("DEBUG") == "True":
-                print(f"Database execution succeeded on query: '{query}', Args: {fmt_args}")
-        except:
-            print(f"Database execution failed on query: '{query}', Args: {fmt_args}")
+################################################################################
+    def submit_batch(self, query: str, rows: List[Tuple[Any, ...]], values: bool = False) -> None:
+        """Queues a batch of writes on the writer lane.
+        
+        Parameters:
+        -----------
+        query: :class:`str`
+            The query to execute. If `values` is ``True`` it must contain a
+            single ``VALUES %s`` placeholder that all rows are expanded into.
+            Otherwise it's run once per row.
+        rows: List[Tuple[Any, ...]]
+            The argument rows.
+        values: :class:`bool`
+            Whether to expand the rows into a single statement.
+        """
+
+        if not rows:
+            return
+        
+        future = self._writer.submit(
+            self._run, self._get_pool(), query, rows, "values" if values else "batch"
+        )
+        future.add_done_callback(partial(self._report_failure, query, rows))
+        
+################################################################################
+    @staticmethod
+    def _report_failure(query: str, fmt_args: Any, future: Future) -> None:
+        """Reports a queued write that failed, since nothing awaits its
+        future to see the exception."""
 
+        if future.cancelled():
+            return
+        
+        ex = future.exception()
+        if ex is not None:
+            print(f"Queued database write failed: {ex!r}, Query: '{query}', Args: {fmt_args}")
+        
 ################################################################################
-    def fetchall(self) -> Tuple[Tuple[Any, ...]]:
+    def drain(self) -> None:
+        """Blocks until every write queued so far has been applied."""
 
-        return self._cursor.fetchall()
+        self._writer.submit(lambda: None).result()
+    
+################################################################################
+    def close(self) -> None:
+        """Flushes any deferred updates, waits for all queued writes to finish
+        and releases every connection."""
 
+        self._worker._updater.flush()
+        self._writer.shutdown(wait=True)
+        
+        if self._pool is not None and not self._pool.closed:
+            self._pool.closeall()
+        self._reset_connection()
+            
 ################################################################################
-    def fetchone(self) -> Tuple[Any, ...]:
+    def stream(self, query: str, *fmt_args: Any) -> Iterator[Tuple[Any, ...]]:
+        """Executes a read query on a server-side (named) cursor and yields the
+        resulting rows, fetching `STREAM_BATCH_SIZE` rows per round trip."""
+
+        if self._connection is None or self._connection.closed:
+            self._connect()
+
+        cursor = self._connection.cursor(name=f"stream_{uuid4().hex}")
+        cursor.itersize = self.STREAM_BATCH_SIZE
+        
+        try:
+            cursor.execute(query, fmt_args)
+            yield from cursor
+        finally:
+            cursor.close()
+            self._connection.commit()
 
-        return self._cursor.fetchone()
-    
 ################################################################################
 
     @property
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from .Branch import DBWorkerBranch
 
@@ -13,7 +13,16 @@ __all__ = ("DatabaseDeleter",)
 ################################################################################
 class DatabaseDeleter(DBWorkerBranch):
     """A utility class for deleting data from the database."""
-    
+
+    def execute(self, query: str, *args: Any) -> None:
+        
+        # Deletes never read results back, so they're queued on the database's
+        # ordered writer lane instead of blocking the event loop. Deferred
+        # updates are queued first, so they land in the order they were made.
+        self.database.update.flush()
+        self.submit(query, *args)
+        
+################################################################################    
     def _delete_form(self, form: Form) -> None:
         
         self.execute(
@@ -158,6 +167,14 @@ class DatabaseDeleter(DBWorkerBranch):
             slot.id
         )
         
+################################################################################
+    def _delete_battle_checkpoint(self, battle_id: str) -> None:
+        
+        self.execute(
+            "DELETE FROM tcg_battles WHERE _id = %s;",
+            battle_id
+        )
+        
 ################################################################################
 
     form_option             = _delete_form_option
@@ -175,5 +192,6 @@ class DatabaseDeleter(DBWorkerBranch):
     rarity_weight           = _delete_rarity_weight
     booster_card_config     = _delete_booster_card_config
     deck_card_slot          = _delete_deck_card_slot
+    battle_checkpoint       = _delete_battle_checkpoint
     
 ################################################################################
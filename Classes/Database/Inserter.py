@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, List, Any
+from typing import TYPE_CHECKING, Optional, List, Any, Tuple
 
 from .Branch import DBWorkerBranch
 
@@ -12,17 +12,31 @@ __all__ = ("DatabaseInserter",)
 
 ################################################################################
 class DatabaseInserter(DBWorkerBranch):
-    """A utility class for inserting new records into the database."""
+    """A utility class for inserting new records into the database.
+    
+    New rows are given their IDs here rather than by the database, so inserts
+    can be queued like any other write and the ID handed back straight away."""
 
+    def execute(self, query: str, *args: Any) -> None:
+        
+        # Queued on the database's ordered writer lane like updates and
+        # deletes, so an insert still lands before any later write to the row.
+        # Deferred updates are queued first, so they land in the order they
+        # were made.
+        self.database.update.flush()
+        self.submit(query, *args)
+        
+################################################################################
     def _insert(self, table: str, columns: List[str], values: List[Any]) -> str:
 
         placeholders = ", ".join(["%s"] * len(values))
         columns_str = ", ".join(columns)
     
-        query = f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders}) RETURNING _id;"
+        query = f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders});"
         self.execute(query, *values)
     
-        return self.fetchone()[0]
+        # `_id` always leads the columns.
+        return values[0]
 
 ################################################################################
     def _insert_no_return(self, table: str, columns: List[str], values: List[Any]) -> None:
@@ -140,7 +154,7 @@ class DatabaseInserter(DBWorkerBranch):
             "INSERT INTO trading_card_details (card_id) VALUES (%s);"
             "INSERT INTO trading_card_stats (card_id) VALUES (%s);",
             new_id, series_id, idx, new_id, new_id
-        )#
+        )
         
         return new_id
     
@@ -171,6 +185,29 @@ class DatabaseInserter(DBWorkerBranch):
             [self.generate_id(), collection_id, card_id, count]
         )
         
+################################################################################
+    def _insert_card_counts(self, collection_id: str, counts: List[Tuple[str, int]]) -> List[str]:
+        
+        if not counts:
+            return []
+        
+        # The IDs are generated here, so they line up with `counts` without
+        # relying on the order of a RETURNING clause.
+        new_ids = [self.generate_id() for _ in counts]
+        
+        placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(counts))
+        values = []
+        for new_id, (card_id, qty) in zip(new_ids, counts):
+            values.extend([new_id, collection_id, card_id, qty])
+            
+        self.execute(
+            "INSERT INTO trading_card_counts (_id, collection_id, card_id, card_qty) "
+            f"VALUES {placeholders};",
+            *values
+        )
+        
+        return new_ids
+        
 ################################################################################
     def _insert_role_relation(self, guild_id: int) -> str:
         
@@ -267,6 +304,7 @@ class DatabaseInserter(DBWorkerBranch):
     card_series             = _insert_trading_card_series
     card_collection         = _insert_card_collection
     card_count              = _insert_card_count
+    card_counts             = _insert_card_counts
     role_relation           = _insert_role_relation
     profile_channel_group   = _insert_profile_channel_group
     preference_group        = _insert_preference_group
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from .Branch import DBWorkerBranch
 
@@ -14,63 +14,270 @@ __all__ = ("DatabaseLoader",)
 class DatabaseLoader(DBWorkerBranch):
     """A utility class for loading data from the database."""
 
-    def load_all(self) -> Dict[int, Dict[str, Any]]:
-        """Performs all sub-loaders and returns a dictionary of their results."""
+    # Guild-scoped queries for each table. Only the columns read by the
+    # corresponding `load()` are selected, in the positional order they're
+    # read in. Child tables are scoped through their parent's guild_id.
+    SCOPED_QUERIES = {
+        "form_options": (
+            "SELECT o._id, o.question_id, o.label, o.description, o.value, "
+            "o.emoji FROM form_options o "
+            "JOIN form_questions q ON q._id = o.question_id "
+            "JOIN forms f ON f._id = q.form_id WHERE f.guild_id = ANY(%s);"
+        ),
+        "form_questions": (
+            "SELECT q._id, q.form_id, q.sort_order, q.primary_text, "
+            "q.secondary_text, q.ui_type, q.required FROM form_questions q "
+            "JOIN forms f ON f._id = q.form_id WHERE f.guild_id = ANY(%s);"
+        ),
+        "form_response_collections": (
+            "SELECT r._id, r.form_id, r.user_id, r.questions, r.responses "
+            "FROM form_response_collections r "
+            "JOIN forms f ON f._id = r.form_id WHERE f.guild_id = ANY(%s);"
+        ),
+        "forms": (
+            "SELECT _id, guild_id, channel_id, form_name, to_notify, "
+            "create_channel, channel_roles, create_category FROM forms "
+            "WHERE guild_id = ANY(%s);"
+        ),
+        "form_responses": (
+            "SELECT r.question_id, r.user_id, r.values FROM form_responses r "
+            "JOIN form_questions q ON q._id = r.question_id "
+            "JOIN forms f ON f._id = q.form_id WHERE f.guild_id = ANY(%s);"
+        ),
+        "form_prompts": (
+            "SELECT p._id, p.form_id, p.title, p.description, p.thumbnail, "
+            "p.show_cancel, p.post_prompt FROM form_prompts p "
+            "JOIN forms f ON f._id = p.form_id WHERE f.guild_id = ANY(%s);"
+        ),
+        "form_question_prompts": (
+            "SELECT p._id, p.question_id, p.title, p.description, p.thumbnail, "
+            "p.show_after, p.show_cancel FROM form_question_prompts p "
+            "JOIN form_questions q ON q._id = p.question_id "
+            "JOIN forms f ON f._id = q.form_id WHERE f.guild_id = ANY(%s);"
+        ),
+        "profile_requirements": (
+            "SELECT guild_id, url, color, jobs, rates, gender, race, "
+            "orientation, height, age, mare, world, likes, dislikes, "
+            "personality, aboutme, thumbnail, main_image "
+            "FROM profile_requirements WHERE guild_id = ANY(%s);"
+        ),
+        "profiles": (
+            "SELECT _id, guild_id, user_id, post_url, is_public FROM profiles "
+            "WHERE guild_id = ANY(%s);"
+        ),
+        "profile_details": (
+            "SELECT d.profile_id, d.char_name, d.url, d.color, d.jobs, d.rates "
+            "FROM profile_details d JOIN profiles p ON p._id = d.profile_id "
+            "WHERE p.guild_id = ANY(%s);"
+        ),
+        "profile_ataglance": (
+            "SELECT a.profile_id, a.world, a.gender, a.pronouns, a.race, "
+            "a.clan, a.orientation, a.height, a.age, a.mare "
+            "FROM profile_ataglance a JOIN profiles p ON p._id = a.profile_id "
+            "WHERE p.guild_id = ANY(%s);"
+        ),
+        "profile_personality": (
+            "SELECT x.profile_id, x.likes, x.dislikes, x.personality, x.aboutme "
+            "FROM profile_personality x JOIN profiles p ON p._id = x.profile_id "
+            "WHERE p.guild_id = ANY(%s);"
+        ),
+        "profile_images": (
+            "SELECT i.profile_id, i.thumbnail, i.main_image "
+            "FROM profile_images i JOIN profiles p ON p._id = i.profile_id "
+            "WHERE p.guild_id = ANY(%s);"
+        ),
+        "profile_addl_images": (
+            "SELECT i._id, i.profile_id, i.url, i.caption "
+            "FROM profile_addl_images i JOIN profiles p ON p._id = i.profile_id "
+            "WHERE p.guild_id = ANY(%s);"
+        ),
+        "profile_channel_groups": (
+            "SELECT _id, guild_id, channel_ids, role_ids, is_private "
+            "FROM profile_channel_groups WHERE guild_id = ANY(%s);"
+        ),
+        "profile_preference_groups": (
+            "SELECT g._id, g.profile_id, g.gender, g.bedroom_pref, "
+            "g.preferences, g.restrictions FROM profile_preference_groups g "
+            "JOIN profiles p ON p._id = g.profile_id WHERE p.guild_id = ANY(%s);"
+        ),
+        "profile_preferences": (
+            "SELECT x.profile_id, x.activities, x.music, x.zodiac_self, "
+            "x.zodiac_partners FROM profile_preferences x "
+            "JOIN profiles p ON p._id = x.profile_id WHERE p.guild_id = ANY(%s);"
+        ),
+        "trading_card_details": (
+            "SELECT d.card_id, d.name, d.description, d.character_group, "
+            "d.image_url, d.rarity, d.imgur_url FROM trading_card_details d "
+            "JOIN trading_cards c ON c._id = d.card_id "
+            "JOIN trading_card_series s ON s._id = c.series_id "
+            "WHERE s.guild_id = ANY(%s);"
+        ),
+        "trading_card_stats": (
+            "SELECT x.card_id, x.bad, x.battle, x.nsfw, x.sfw, x.die_marker "
+            "FROM trading_card_stats x JOIN trading_cards c ON c._id = x.card_id "
+            "JOIN trading_card_series s ON s._id = c.series_id "
+            "WHERE s.guild_id = ANY(%s);"
+        ),
+        "trading_cards": (
+            "SELECT c._id, c.series_id, c.card_idx FROM trading_cards c "
+            "JOIN trading_card_series s ON s._id = c.series_id "
+            "WHERE s.guild_id = ANY(%s);"
+        ),
+        "trading_card_series": (
+            "SELECT _id, guild_id, sort_order, name FROM trading_card_series "
+            "WHERE guild_id = ANY(%s);"
+        ),
+        "trading_card_collections": (
+            "SELECT _id, guild_id, user_id, boosters FROM trading_card_collections "
+            "WHERE guild_id = ANY(%s);"
+        ),
+        "trading_card_counts": (
+            "SELECT x._id, x.collection_id, x.card_id, x.card_qty "
+            "FROM trading_card_counts x "
+            "JOIN trading_card_collections c ON c._id = x.collection_id "
+            "WHERE c.guild_id = ANY(%s);"
+        ),
+        "role_relations": (
+            "SELECT _id, guild_id, pending_id, final_id, message "
+            "FROM role_relations WHERE guild_id = ANY(%s);"
+        ),
+        "verification_config": (
+            "SELECT guild_id, log_events, captcha, change_name "
+            "FROM verification_config WHERE guild_id = ANY(%s);"
+        ),
+        "tcg_booster_card_config": (
+            "SELECT _id, guild_id, sort_order, always_new "
+            "FROM tcg_booster_card_config WHERE guild_id = ANY(%s);"
+        ),
+        "tcg_booster_config": (
+            "SELECT guild_id, slots, battle_pacing, battle_limit "
+            "FROM tcg_booster_config WHERE guild_id = ANY(%s);"
+        ),
+        "tcg_rarity_weights": (
+            "SELECT w._id, w.parent_id, w.rarity, w.weight "
+            "FROM tcg_rarity_weights w "
+            "JOIN tcg_booster_card_config c ON c._id = w.parent_id "
+            "WHERE c.guild_id = ANY(%s);"
+        ),
+        "tcg_card_decks": (
+            "SELECT d._id, d.collection_id, d.name, d.image FROM tcg_card_decks d "
+            "JOIN trading_card_collections c ON c._id = d.collection_id "
+            "WHERE c.guild_id = ANY(%s);"
+        ),
+        "tcg_deck_card_slots": (
+            "SELECT x._id, x.deck_id, x.sort_order, x.card_id "
+            "FROM tcg_deck_card_slots x JOIN tcg_card_decks d ON d._id = x.deck_id "
+            "JOIN trading_card_collections c ON c._id = d.collection_id "
+            "WHERE c.guild_id = ANY(%s);"
+        ),
+        "tcg_battles": (
+            "SELECT _id, guild_id, thread_id, p1_user_id, p2_user_id, "
+            "p1_deck_id, p2_deck_id, round_idx, p1_wins, p2_wins, "
+            "p1_overrides, p2_overrides FROM tcg_battles "
+            "WHERE guild_id = ANY(%s);"
+        ),
+        "profile_managers": (
+            "SELECT guild_id, category_id, revive_budget FROM profile_managers "
+            "WHERE guild_id = ANY(%s);"
+        ),
+    }
+    
+    # How each child table is indexed as its rows are read: the key
+    # column(s), and whether only the first row per key is kept (otherwise
+    # rows are grouped into lists, in their original order). Tables not
+    # listed are kept as plain row lists.
+    TABLE_INDEXES = {
+        "form_response_collections": (1, False),
+        "form_prompts": ((1, 6), True),
+        "form_questions": (1, False),
+        "form_options": (1, False),
+        "form_responses": (0, False),
+        "form_question_prompts": (1, True),
+        "profile_details": (0, True),
+        "profile_ataglance": (0, True),
+        "profile_personality": (0, True),
+        "profile_images": (0, True),
+        "profile_addl_images": (1, False),
+        "profile_preference_groups": (1, False),
+        "profile_preferences": (0, True),
+        "trading_cards": (1, False),
+        "trading_card_details": (0, True),
+        "trading_card_stats": (0, True),
+        "trading_card_counts": (1, False),
+        "tcg_card_decks": (1, False),
+        "tcg_deck_card_slots": (1, False),
+        "tcg_rarity_weights": (1, False),
+    }
+
+################################################################################
+    def load_all(self, guild_ids: Optional[List[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """Performs all sub-loaders and returns a dictionary of their results.
+        
+        Rows are read with the projected queries in `SCOPED_QUERIES`. If
+        `guild_ids` is provided, only rows belonging to those guilds are
+        loaded."""
 
         print("Database", "Performing database load_all.")
 
-        return self._parse_all(self._get_payload())
+        if guild_ids is None:
+            return self._parse_all(self._get_payload())
+        
+        return self._parse_all(self._get_scoped_payload(guild_ids))
 
 ################################################################################
-    def _load_data_from_table(self, table_name: str) -> Tuple[Tuple[Any, ...]]:
-        """Load data from a specific table."""
+    @classmethod
+    def _unscoped_query(cls, table: str) -> str:
+        """`table`'s query in `SCOPED_QUERIES` without its guild filter, so
+        rows come back in the same projection."""
 
-        self.execute(f"SELECT * FROM {table_name};")
-        return self.fetchall()
+        return cls.SCOPED_QUERIES[table].rsplit(" WHERE ", 1)[0] + ";"
     
 ################################################################################
     def _get_payload(self) -> Dict[str, Any]:
+        """Loads every guild's rows, streamed and indexed like
+        `_get_scoped_payload()`."""
 
-        table_list = [
-            "form_options",
-            "form_questions",
-            "form_response_collections",
-            "forms",
-            "form_responses",
-            "form_prompts",
-            "form_question_prompts",
-            "profile_requirements",
-            "profiles",
-            "profile_details",
-            "profile_ataglance",
-            "profile_personality",
-            "profile_images",
-            "profile_addl_images",
-            "profile_channel_groups",
-            "profile_preference_groups",
-            "profile_preferences",
-            "trading_card_details",
-            "trading_card_stats",
-            "trading_cards",
-            "trading_card_series",
-            "trading_card_collections",
-            "trading_card_counts",
-            "role_relations",
-            "verification_config",
-            "tcg_booster_card_config",
-            "tcg_booster_config",
-            "tcg_rarity_weights",
-            "tcg_card_decks",
-            "tcg_deck_card_slots",
-            "profile_managers",
-        ]
-
         ret = {}
-        for table in table_list:
-            ret[table] = self._load_data_from_table(table)
+        for table in self.SCOPED_QUERIES:
+            ret[table] = self._index_rows(table, self.stream(self._unscoped_query(table)))
+            
+        return ret
+        
+################################################################################
+    def _get_scoped_payload(self, guild_ids: List[int]) -> Dict[str, Any]:
+        """Loads only the rows belonging to the given guilds, streaming each
+        table through a server-side cursor. Child tables are indexed as the
+        rows arrive, so no table is ever held both as a flat list and as its
+        index."""
+        
+        ret = {}
+        for table, query in self.SCOPED_QUERIES.items():
+            ret[table] = self._index_rows(table, self.stream(query, list(guild_ids)))
             
         return ret
         
+################################################################################
+    def _index_rows(
+        self, table: str, rows: Iterable[Tuple[Any, ...]]
+    ) -> Union[List[Tuple[Any, ...]], Dict[Any, Any]]:
+        """Indexes a table's rows in a single pass, as described by
+        `TABLE_INDEXES`."""
+
+        if table not in self.TABLE_INDEXES:
+            return list(rows)
+        
+        idx, first = self.TABLE_INDEXES[table]
+        
+        ret = {}
+        for row in rows:
+            key = tuple(row[i] for i in idx) if isinstance(idx, tuple) else row[idx]
+            if first:
+                ret.setdefault(key, row)
+            else:
+                ret.setdefault(key, []).append(row)
+
+        return ret
+
 ################################################################################
     def _parse_all(self, payload: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
         
@@ -79,6 +286,7 @@ class DatabaseLoader(DBWorkerBranch):
                 "forms": [],
                 "profiles": {
                     "category_id": None,
+                    "revive_budget": None,
                     "requirements": None,
                     "profiles": [],
                     "channels": [],
@@ -90,6 +298,7 @@ class DatabaseLoader(DBWorkerBranch):
                         "booster_config": None,
                         "card_configs": [],
                     },
+                    "battles": [],
                 },
                 "verification": {
                     "config": None,
@@ -99,49 +308,48 @@ class DatabaseLoader(DBWorkerBranch):
             for g in self.bot.guilds
         }
         
+        # Child tables arrive already indexed by their foreign key (see
+        # `TABLE_INDEXES`), so each is only walked once.
+        response_colls = payload["form_response_collections"]
+        prompts = payload["form_prompts"]
+        questions = payload["form_questions"]
+        options = payload["form_options"]
+        responses = payload["form_responses"]
+        question_prompts = payload["form_question_prompts"]
+
+        details = payload["profile_details"]
+        ataglances = payload["profile_ataglance"]
+        personalities = payload["profile_personality"]
+        images = payload["profile_images"]
+        addl_images = payload["profile_addl_images"]
+        pref_groups = payload["profile_preference_groups"]
+        preferences = payload["profile_preferences"]
+
+        cards = payload["trading_cards"]
+        card_details = payload["trading_card_details"]
+        card_stats = payload["trading_card_stats"]
+        card_counts = payload["trading_card_counts"]
+        decks = payload["tcg_card_decks"]
+        deck_slots = payload["tcg_deck_card_slots"]
+        rarity_weights = payload["tcg_rarity_weights"]
+        
         # Forms
         for form in payload["forms"]:
             ret[form[1]]["forms"].append({
                 "form": form,
-                "questions": [],
-                "responses": [
-                    response 
-                    for response in payload["form_response_collections"]
-                    if response[1] == form[0]
+                "questions": [
+                    {
+                        "question": question,
+                        "options": options.get(question[0], []),
+                        "responses": responses.get(question[0], []),
+                        "prompt": question_prompts.get(question[0]),
+                    }
+                    for question in questions.get(form[0], [])
                 ],
-                "pre_prompt": next((
-                    prompt
-                    for prompt in payload["form_prompts"]
-                    if prompt[1] == form[0]
-                    and prompt[6] is False
-                ), None),
-                "post_prompt": next((
-                    prompt
-                    for prompt in payload["form_prompts"]
-                    if prompt[1] == form[0]
-                    and prompt[6] is True
-                ), None),
+                "responses": response_colls.get(form[0], []),
+                "pre_prompt": prompts.get((form[0], False)),
+                "post_prompt": prompts.get((form[0], True)),
             })
-            for question in payload["form_questions"]:
-                if question[1] == form[0]:
-                    ret[form[1]]["forms"][-1]["questions"].append({
-                        "question": question,
-                        "options": [
-                            option
-                            for option in payload["form_options"]
-                            if option[1] == question[0]
-                        ],
-                        "responses": [
-                            response
-                            for response in payload["form_responses"]
-                            if response[0] == question[0]
-                        ],
-                        "prompt": next((
-                            prompt
-                            for prompt in payload["form_question_prompts"]
-                            if prompt[1] == question[0]
-                        ), None)
-                    })
                     
         # Profiles
         for req in payload["profile_requirements"]:
@@ -149,100 +357,55 @@ class DatabaseLoader(DBWorkerBranch):
         for profile in payload["profiles"]:
             ret[profile[1]]["profiles"]["profiles"].append({
                 "profile": profile,
-                "details": next((
-                    detail
-                    for detail in payload["profile_details"]
-                    if detail[0] == profile[0]
-                ), None),
-                "aag": next((
-                    ataglance
-                    for ataglance in payload["profile_ataglance"]
-                    if ataglance[0] == profile[0]
-                ), None),
-                "personality": next((
-                    personality
-                    for personality in payload["profile_personality"]
-                    if personality[0] == profile[0]
-                ), None),
+                "details": details.get(profile[0]),
+                "aag": ataglances.get(profile[0]),
+                "personality": personalities.get(profile[0]),
                 "images": {
-                    "images": next((
-                        image
-                        for image in payload["profile_images"]
-                        if image[0] == profile[0]
-                    ), None),
-                    "additional": [
-                        addl_image
-                        for addl_image in payload["profile_addl_images"]
-                        if addl_image[1] == profile[0]
-                    ],
+                    "images": images.get(profile[0]),
+                    "additional": addl_images.get(profile[0], []),
                 },
                 "preferences": {
-                    "groups": [
-                        group
-                        for group in payload["profile_preference_groups"]
-                        if group[1] == profile[0]
-                    ],
-                    "preferences": next((
-                        pref
-                        for pref in payload["profile_preferences"]
-                        if pref[0] == profile[0]
-                    ), None),
+                    "groups": pref_groups.get(profile[0], []),
+                    "preferences": preferences.get(profile[0]),
                 }
             })
         for group in payload["profile_channel_groups"]:
             ret[group[1]]["profiles"]["channels"].append(group)
         for mgr in payload["profile_managers"]:
             ret[mgr[0]]["profiles"]["category_id"] = mgr[1]
+            ret[mgr[0]]["profiles"]["revive_budget"] = mgr[2]
             
         # Trading Cards
         for series in payload["trading_card_series"]:
             ret[series[1]]["trading_card_game"]["cards"].append({
                 "series": series,
-                "cards": [],
-            })
-            for card in payload["trading_cards"]:
-                if card[1] == series[0]:
-                    ret[series[1]]["trading_card_game"]["cards"][-1]["cards"].append({
+                "cards": [
+                    {
                         "card": card,
-                        "details": next((
-                            details
-                            for details in payload["trading_card_details"]
-                            if details[0] == card[0]
-                        ), None),
-                        "stats": next((
-                            stats
-                            for stats in payload["trading_card_stats"]
-                            if stats[0] == card[0]
-                        ), None),
-                    })
+                        "details": card_details.get(card[0]),
+                        "stats": card_stats.get(card[0]),
+                    }
+                    for card in cards.get(series[0], [])
+                ],
+            })
         for collection in payload["trading_card_collections"]:
             ret[collection[1]]["trading_card_game"]["collections"].append({
                 "collection": collection,
-                "cards": [
-                    card
-                    for card in payload["trading_card_counts"]
-                    if card[1] == collection[0]
-                ],
+                "cards": card_counts.get(collection[0], []),
                 "decks": [{
                     "deck": deck,
-                    "cards": [
-                        card
-                        for card in payload["tcg_deck_card_slots"]
-                        if card[1] == deck[0]
-                    ],
-                } for deck in payload["tcg_card_decks"] if deck[1] == collection[0]],
+                    "cards": deck_slots.get(deck[0], []),
+                } for deck in decks.get(collection[0], [])],
             })
         for booster in payload["tcg_booster_config"]:
             ret[booster[0]]["trading_card_game"]["booster_data"]["booster_config"] = booster
         for config in payload["tcg_booster_card_config"]:
             ret[config[1]]["trading_card_game"]["booster_data"]["card_configs"].append({
                 "config": config,
-                "weights": [
-                    weight
-                    for weight in payload["tcg_rarity_weights"]
-                    if weight[1] == config[0]
-                ],
+                "weights": rarity_weights.get(config[0], []),
             })
+        for battle in payload["tcg_battles"]:
+            ret[battle[1]]["trading_card_game"]["battles"].append(battle)
             
         # Verification
         for config in payload["verification_config"]:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from .Branch import DBWorkerBranch
 
@@ -12,8 +13,67 @@ __all__ = ("DatabaseUpdater",)
 
 ################################################################################
 class DatabaseUpdater(DBWorkerBranch):
-    """A utility class for updating records in the database."""
+    """A utility class for updating records in the database.
+    
+    Updates for high-frequency rows (card counts, collection booster counts
+    and profile details/at-a-glance) are deferred: the entity is marked dirty
+    and all dirty rows are written in one batch after `FLUSH_DELAY` seconds,
+    so repeated updates to the same row collapse into a single write."""
+
+    __slots__ = (
+        "_dirty",
+        "_flush_handle",
+    )
+    
+    FLUSH_DELAY = 0.5
+
+################################################################################
+    def __init__(self, _state: RentARaBot):
+        
+        super().__init__(_state)
+        
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
 
+################################################################################
+    def execute(self, query: str, *args: Any) -> None:
+        
+        # Updates never read results back, so they're queued on the database's
+        # ordered writer lane instead of blocking the event loop.
+        self.submit(query, *args)
+        
+################################################################################
+    def _defer(self, kind: str, key: str, entity: Any) -> None:
+        
+        # Only the latest state of each entity matters, so re-marking an
+        # already-dirty row is free.
+        self._dirty.setdefault(kind, {})[key] = entity
+        
+        if self._flush_handle is not None:
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+        else:
+            self._flush_handle = loop.call_later(self.FLUSH_DELAY, self.flush)
+            
+################################################################################
+    def flush(self) -> None:
+        """Writes all deferred updates immediately. Inserts and deletes call
+        this before they're queued, as a transaction would flush at its end,
+        so no write overtakes an update made before it."""
+        
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+            
+        dirty, self._dirty = self._dirty, {}
+        for kind, entities in dirty.items():
+            getattr(self, f"_flush_{kind}")(list(entities.values()))
+            
+################################################################################
     def _update_form_option(self, option: FormOption) -> None:
         
         self.execute(
@@ -70,9 +130,10 @@ class DatabaseUpdater(DBWorkerBranch):
     def _update_profile_system(self, mgr: ProfileManager) -> None:
         
         self.execute(
-            "UPDATE profile_managers SET category_id = %s WHERE guild_id = %s",
+            "UPDATE profile_managers SET category_id = %s, revive_budget = %s "
+            "WHERE guild_id = %s",
             mgr.match_category.id if mgr.match_category is not None else None,
-            mgr.guild.guild_id
+            mgr.revive_budget, mgr.guild.guild_id
         )
         
 ################################################################################
@@ -101,9 +162,16 @@ class DatabaseUpdater(DBWorkerBranch):
 ################################################################################
     def _update_card_count(self, count: CardCount) -> None:
         
-        self.execute(
-            "UPDATE trading_card_counts SET card_qty = %s WHERE _id = %s",
-            count.quantity, count.id
+        self._defer("card_count", count.id, count)
+        
+################################################################################
+    def _flush_card_count(self, counts: List[CardCount]) -> None:
+        
+        self.submit_batch(
+            "UPDATE trading_card_counts AS t SET card_qty = v.card_qty "
+            "FROM (VALUES %s) AS v(_id, card_qty) WHERE t._id = v._id",
+            [(c.id, c.quantity) for c in counts],
+            values=True
         )
         
 ################################################################################
@@ -182,6 +250,51 @@ class DatabaseUpdater(DBWorkerBranch):
             config.slots, config.guild_id
         )
         
+################################################################################
+    def _update_battle_pacing(self, mgr: BattleManager) -> None:
+        
+        self.execute(
+            "UPDATE tcg_booster_config SET battle_pacing = %s WHERE guild_id = %s",
+            mgr.pacing.value, mgr.guild_id
+        )
+        
+################################################################################
+    def _update_battle_limit(self, mgr: BattleManager) -> None:
+        
+        self.execute(
+            "UPDATE tcg_booster_config SET battle_limit = %s WHERE guild_id = %s",
+            mgr.limit, mgr.guild_id
+        )
+        
+################################################################################
+    def _update_battle_checkpoint(self, battle: CardBattle) -> None:
+        
+        self.execute(
+            "INSERT INTO tcg_battles (_id, guild_id, thread_id, p1_user_id, "
+            "p2_user_id, p1_deck_id, p2_deck_id, round_idx, p1_wins, p2_wins, "
+            "p1_overrides, p2_overrides) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+            "ON CONFLICT (_id) DO UPDATE SET round_idx = EXCLUDED.round_idx, "
+            "p1_wins = EXCLUDED.p1_wins, p2_wins = EXCLUDED.p2_wins, "
+            "p1_overrides = EXCLUDED.p1_overrides, "
+            "p2_overrides = EXCLUDED.p2_overrides",
+            battle.id, battle.guild_id, battle.channel.id,
+            battle.p1.user.id, battle.p2.user.id,
+            battle.p1_deck.id, battle.p2_deck.id,
+            battle.round, *battle.wins,
+            battle.p1_deck.overrides, battle.p2_deck.overrides
+        )
+        
+################################################################################
+    def _update_deck_slot_orders(self, slots: List[DeckCardSlot]) -> None:
+        
+        self.execute(
+            "UPDATE tcg_deck_card_slots AS s SET sort_order = v.sort_order "
+            "FROM UNNEST(%s::TEXT[], %s::INTEGER[]) AS v(_id, sort_order) "
+            "WHERE s._id = v._id",
+            [slot.id for slot in slots], [slot.order for slot in slots]
+        )
+        
 ################################################################################
     def _update_booster_card_config(self, config: BoosterCardConfig) -> None:
         
@@ -201,27 +314,47 @@ class DatabaseUpdater(DBWorkerBranch):
 ################################################################################
     def _update_profile_details(self, details: ProfileDetails) -> None:
         
-        self.execute(
+        self._defer("profile_details", details.profile_id, details)
+        
+################################################################################
+    def _flush_profile_details(self, details_list: List[ProfileDetails]) -> None:
+        
+        self.submit_batch(
             "UPDATE profile_details SET char_name = %s, url = %s, color = %s, "
             "jobs = %s, rates = %s where profile_id = %s",
-            details.name, details.custom_url, 
-            details.color.value if details.color else None, 
-            details.jobs, details.rates, details.profile_id
+            [
+                (
+                    details.name, details.custom_url, 
+                    details.color.value if details.color else None, 
+                    details.jobs, details.rates, details.profile_id
+                )
+                for details in details_list
+            ]
         )
         
 ################################################################################
     def _update_profile_ataglance(self, aag: ProfileAtAGlance) -> None:
         
-        self.execute(
+        self._defer("profile_ataglance", aag.profile_id, aag)
+        
+################################################################################
+    def _flush_profile_ataglance(self, aags: List[ProfileAtAGlance]) -> None:
+        
+        self.submit_batch(
             "UPDATE profile_ataglance SET world = %s, gender = %s, pronouns = %s, "
             "race = %s, clan = %s, orientation = %s, height = %s, age = %s, "
             "mare = %s WHERE profile_id = %s",
-            aag.world.value if aag.world else None,
-            aag.gender.value if aag.gender else None,
-            [p.value for p in aag.pronouns], aag.race.value if aag.race else None,
-            aag.clan.value if aag.clan else None,
-            aag.orientation.value if aag.orientation else None,
-            aag.height, aag.age, aag.mare, aag.profile_id
+            [
+                (
+                    aag.world.value if aag.world else None,
+                    aag.gender.value if aag.gender else None,
+                    [p.value for p in aag.pronouns], aag.race.value if aag.race else None,
+                    aag.clan.value if aag.clan else None,
+                    aag.orientation.value if aag.orientation else None,
+                    aag.height, aag.age, aag.mare, aag.profile_id
+                )
+                for aag in aags
+            ]
         )
         
 ################################################################################
@@ -262,9 +395,16 @@ class DatabaseUpdater(DBWorkerBranch):
 ################################################################################
     def _update_card_collection(self, coll: CardCollection) -> None:
         
-        self.execute(
-            "UPDATE trading_card_collections SET boosters = %s WHERE _id = %s",
-            coll.booster_packs, coll.id
+        self._defer("card_collection", coll.id, coll)
+        
+################################################################################
+    def _flush_card_collection(self, colls: List[CardCollection]) -> None:
+        
+        self.submit_batch(
+            "UPDATE trading_card_collections AS t SET boosters = v.boosters "
+            "FROM (VALUES %s) AS v(_id, boosters) WHERE t._id = v._id",
+            [(c.id, c.booster_packs) for c in colls],
+            values=True
         )
         
 ################################################################################
@@ -311,6 +451,9 @@ class DatabaseUpdater(DBWorkerBranch):
     profile_preferences     = _update_profile_preferences
     booster_pack_config     = _update_booster_pack_config
     booster_card_config     = _update_booster_card_config
+    battle_pacing           = _update_battle_pacing
+    battle_limit            = _update_battle_limit
+    battle_checkpoint       = _update_battle_checkpoint
     rarity_weight           = _update_rarity_weight
     profile_details         = _update_profile_details
     profile_ataglance       = _update_profile_ataglance
@@ -322,5 +465,6 @@ class DatabaseUpdater(DBWorkerBranch):
     trading_card            = _update_trading_card
     card_deck               = _update_card_deck
     deck_card_slot          = _update_deck_card_slot
+    deck_slot_orders        = _update_deck_slot_orders
     
 ################################################################################
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from .Builder import DatabaseBuilder
 from .Deleter import DatabaseDeleter
@@ -48,8 +48,8 @@ class DatabaseWorker:
         self._builder.build_all()
 
 ################################################################################
-    def load_all(self) -> Dict[int, Dict[str, Any]]:
+    def load_all(self, guild_ids: Optional[List[int]] = None) -> Dict[int, Dict[str, Any]]:
 
-        return self._loader.load_all()
+        return self._loader.load_all(guild_ids)
 
 ################################################################################
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING, List, Optional, Type, TypeVar, Dict, Any, Union
 
 from discord import (
@@ -14,6 +15,7 @@ from discord import (
 from discord.ext.pages import Page
 
 from Assets import BotEmojis
+from Classes.Core.LazyUser import LazyUser
 from Errors import MaxItemsReached, ChannelNotSet, IncompleteForm
 from UI.Common import (
     BasicTextModal,
@@ -76,7 +78,7 @@ class Form:
         self._pre_prompt: Optional[FormPrompt] = kwargs.get("pre_prompt")
         self._post_prompt: Optional[FormPrompt] = kwargs.get("post_prompt")
         
-        self._to_notify: List[Union[User, Role]] = kwargs.get("to_notify", [])
+        self._to_notify: List[Union[LazyUser, Role]] = kwargs.get("to_notify", [])
         self._create_channel: bool = kwargs.get("create_channel", False)
         self._channel_roles: List[Role] = kwargs.get("channel_roles", [])
         self._category: Optional[CategoryChannel] = kwargs.get("category")
@@ -102,10 +104,7 @@ class Form:
         self._name = fdata[3]
         
         self._questions = [await FormQuestion.load(self, q) for q in data["questions"]]       
-        self._responses = [
-            await FormResponseCollection.load(self, r) 
-            for r in data["responses"]
-        ]
+        self._responses = [FormResponseCollection.load(self, r) for r in data["responses"]]
         
         self._pre_prompt = (
             FormPrompt.load(self, data["pre_prompt"])
@@ -118,12 +117,7 @@ class Form:
             else None
         )
         
-        possible_notifications = [
-            await self._fetch_user_or_role(mgr.guild, notif)
-            for notif in fdata[4]
-        ]
-
-        self._to_notify = [n for n in possible_notifications if n is not None]
+        self._to_notify = [self._user_or_role(mgr.guild, notif) for notif in fdata[4]]
         self._create_channel = fdata[5]
         self._channel_roles = [
             await mgr.guild.get_or_fetch_role(r)
@@ -135,13 +129,14 @@ class Form:
     
 ################################################################################
     @staticmethod
-    async def _fetch_user_or_role(guild: GuildData, _id: int) -> Union[User, Role]:
+    def _user_or_role(guild: GuildData, _id: int) -> Union[LazyUser, Role]:
 
-        ret = await guild.get_or_fetch_role(_id)
-        if ret is not None:
-            return ret
+        # Roles are always fully cached, so anything else is taken to be a
+        # user and only resolved once a notification is actually sent.
+        if role := guild.parent.get_role(_id):
+            return role
 
-        return await guild.get_or_fetch_member_or_user(_id)
+        return LazyUser(guild, _id)
 
 ################################################################################
     def __eq__(self, other: Form) -> bool:
@@ -385,6 +380,9 @@ class Form:
 ################################################################################
     async def paginate_responses(self, interaction: Interaction) -> None:
 
+        # Response authors are only resolved once someone actually looks.
+        await asyncio.gather(*(r.user.resolve() for r in self._responses))
+        
         pages = [
             Page(embeds=[response.compile()])
             for response
@@ -495,8 +493,9 @@ class Form:
         for notif in self._to_notify:
             if isinstance(notif, Role):
                 roles.append(notif)
-            elif isinstance(notif, User):
-                users.append(notif)
+            elif isinstance(notif, LazyUser):
+                if user := await notif.resolve():
+                    users.append(user)
 
         role_str = ", ".join(r.mention for r in roles)
 
@@ -667,7 +666,7 @@ class Form:
         if user is None:
             return
         
-        self._to_notify.append(user)
+        self._to_notify.append(LazyUser.from_user(self._mgr.guild, user))
         self.update()
     
 ################################################################################
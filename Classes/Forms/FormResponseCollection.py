@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, List, Optional, Type, TypeVar, Tuple, Any
 
 from discord import User, Embed, EmbedField
 
+from Classes.Core.LazyUser import LazyUser
 from Utilities import Utilities as U
 
 if TYPE_CHECKING:
@@ -30,7 +31,7 @@ class FormResponseCollection:
 
         self._id: str = _id
         self._parent: Form = parent
-        self._user: User = kwargs.pop("user")
+        self._user: LazyUser = kwargs.pop("user")
         
         self._questions: List[str] = kwargs.get("questions", [])
         self._responses: List[str] = kwargs.get("responses", [])
@@ -40,23 +41,29 @@ class FormResponseCollection:
     def new(cls: Type[FRC], parent: Form, user: User, q: List[str], r: List[str]) -> FRC:
         
         new_id = parent.bot.database.insert.form_response_coll(parent.id, user.id, q, r)
-        return cls(parent, new_id, user=user, questions=q, responses=r)
+        return cls(
+            parent, 
+            new_id, 
+            user=LazyUser.from_user(parent._mgr.guild, user), 
+            questions=q, 
+            responses=r
+        )
     
 ################################################################################
     @classmethod
-    async def load(cls: Type[FRC], parent: Form, data: Tuple[Any, ...]) -> FRC:
+    def load(cls: Type[FRC], parent: Form, data: Tuple[Any, ...]) -> FRC:
         
         return cls(
             parent=parent,
             _id=data[0],
-            user=await parent.bot.fetch_user(data[2]),
+            user=LazyUser(parent._mgr.guild, data[2]),
             questions=data[3],
             responses=data[4]
         )
     
 ################################################################################
     @property
-    def user(self) -> User:
+    def user(self) -> LazyUser:
         
         return self._user
     
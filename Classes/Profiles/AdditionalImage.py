@@ -82,12 +82,14 @@ class AdditionalImage:
     def update(self) -> None:
         
         self.bot.database.update.additional_image(self)
+        self._parent.parent.invalidate_compiled("images")
         
 ################################################################################
     def delete(self) -> None:
         
         self.bot.database.delete.additional_image(self)
         self._parent.additional.remove(self)
+        self._parent.parent.invalidate_compiled("images")
         
 ################################################################################
     def compile(self) -> str:
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type, TypeVar
+
+from Enums import Gender, Race
+
+if TYPE_CHECKING:
+    from Classes import Profile, ProfileManager
+################################################################################
+
+__all__ = (
+    "MatchFeatures",
+    "MatchingIndex",
+)
+
+MF = TypeVar("MF", bound="MatchFeatures")
+
+################################################################################
+class MatchFeatures(NamedTuple):
+    """The parts of a profile that matching looks at, with every multi-valued
+    enum packed into an integer bitmask (bit ``n`` set for value ``n``)."""
+
+    gender: Optional[int]
+    race: Optional[int]
+    zodiac_self: Optional[int]
+    zodiac_partners: int
+    activities: int
+    activity_count: int
+    music: int
+    music_count: int
+    race_prefs: Dict[int, int]
+    """Gender value -> bitmask of preferred races."""
+    race_restrictions: Dict[int, int]
+    """Gender value -> bitmask of restricted races."""
+    complete_groups: int
+    """Bitmask of gender values whose preference group is complete."""
+
+################################################################################
+    @classmethod
+    def from_profile(cls: Type[MF], profile: Profile) -> MF:
+
+        prefs = profile.preferences
+        aag = profile.ataglance
+
+        race_prefs = {}
+        race_restrictions = {}
+        complete_groups = 0
+        for group in prefs.preference_groups:
+            race_prefs[group.gender.value] = MatchingIndex.mask(group.preferences)
+            race_restrictions[group.gender.value] = MatchingIndex.mask(group.restrictions)
+            if group.is_complete:
+                complete_groups |= 1 << group.gender.value
+
+        return cls(
+            gender=aag.gender.value if isinstance(aag.gender, Gender) else None,
+            race=aag.race.value if isinstance(aag.race, Race) else None,
+            zodiac_self=prefs.zodiac_self.value if prefs.zodiac_self else None,
+            zodiac_partners=MatchingIndex.mask(prefs.zodiac_partners),
+            activities=MatchingIndex.mask(prefs.activities),
+            activity_count=len(set(prefs.activities)),
+            music=MatchingIndex.mask(prefs.music_prefs),
+            music_count=len(set(prefs.music_prefs)),
+            race_prefs=race_prefs,
+            race_restrictions=race_restrictions,
+            complete_groups=complete_groups,
+        )
+
+################################################################################
+class MatchingIndex:
+    """The features of every public, matchable profile in a guild.
+
+    Entries are refreshed whenever a profile saves a change that could affect
+    matching, so a search only scores the candidates with a handful of bitwise
+    operations each and keeps the best few on a heap, rather than rebuilding
+    and comparing everyone's preference lists."""
+
+    __slots__ = (
+        "_mgr",
+        "_entries",
+    )
+
+    TOP_MATCHES = 5
+
+################################################################################
+    def __init__(self, mgr: ProfileManager) -> None:
+
+        self._mgr: ProfileManager = mgr
+
+        # Profile ID -> (profile, features)
+        self._entries: Dict[str, Tuple[Profile, MatchFeatures]] = {}
+
+################################################################################
+    def __len__(self) -> int:
+
+        return len(self._entries)
+
+################################################################################
+    def __contains__(self, profile: Profile) -> bool:
+
+        return profile.id in self._entries
+
+################################################################################
+    @staticmethod
+    def mask(values: Iterable) -> int:
+
+        ret = 0
+        for value in values:
+            ret |= 1 << value.value
+
+        return ret
+
+################################################################################
+    def rebuild(self, profiles: Iterable[Profile]) -> None:
+
+        self._entries.clear()
+        for profile in profiles:
+            self.refresh(profile)
+
+################################################################################
+    def refresh(self, profile: Profile) -> None:
+        """Re-reads a profile's features, adding or dropping it depending on
+        whether it's currently public and matchable."""
+
+        if profile.is_public and profile.preferences.is_matchable():
+            self._entries[profile.id] = (profile, MatchFeatures.from_profile(profile))
+        else:
+            self._entries.pop(profile.id, None)
+
+################################################################################
+    def remove(self, profile: Profile) -> None:
+
+        self._entries.pop(profile.id, None)
+
+################################################################################
+    @staticmethod
+    def score(seeker: MatchFeatures, candidate: MatchFeatures) -> Optional[int]:
+        """Scores a candidate from the seeker's point of view, as a percentage.
+        Returns ``None`` when there's nothing to compare."""
+
+        value = 0
+        total = 0
+
+        if seeker.race is not None:
+            total += 1
+            bit = 1 << seeker.race
+            if candidate.race_prefs.get(seeker.gender, 0) & bit:
+                value += 1
+            if candidate.race_restrictions.get(seeker.gender, 0) & bit:
+                value -= 1
+
+        if seeker.gender is not None:
+            total += 1
+            if candidate.complete_groups >> seeker.gender & 1:
+                value += 1
+
+        if seeker.zodiac_self is not None and seeker.zodiac_partners:
+            total += 2
+            if candidate.zodiac_self is not None and seeker.zodiac_partners >> candidate.zodiac_self & 1:
+                value += 1
+            if candidate.zodiac_partners >> seeker.zodiac_self & 1:
+                value += 1
+
+        total += candidate.activity_count + candidate.music_count
+        value += (seeker.activities & candidate.activities).bit_count()
+        value += (seeker.music & candidate.music).bit_count()
+
+        if not total:
+            return
+
+        return int((value / total) * 100)
+
+################################################################################
+    def top_matches(self, profile: Profile, count: Optional[int] = None) -> List[Tuple[Profile, int]]:
+        """Returns the best scoring candidates for the given profile, highest
+        first."""
+
+        seeker = MatchFeatures.from_profile(profile)
+
+        def scored():
+            for profile_id, (candidate, features) in self._entries.items():
+                if profile_id == profile.id:
+                    continue
+                score = self.score(seeker, features)
+                if score is not None:
+                    yield candidate, score
+
+        return heapq.nlargest(count or self.TOP_MATCHES, scored(), key=lambda m: m[1])
+
+################################################################################
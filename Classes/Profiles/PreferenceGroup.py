@@ -130,6 +130,8 @@ class PreferenceGroup:
     def update(self) -> None:
         
         self.bot.database.update.preference_group(self)
+        self._parent.parent.invalidate_compiled("preferences")
+        self._parent.parent.refresh_matching()
         
 ################################################################################
     def status(self) -> Embed:
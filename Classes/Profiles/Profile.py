@@ -47,7 +47,7 @@ from .ProfilePreferences import ProfilePreferences
 from Utilities.Constants import *
 
 if TYPE_CHECKING:
-    from Classes import ProfileManager, RentARaBot
+    from Classes import ProfileManager, ProfileSection, RentARaBot
 ################################################################################
 
 __all__ = ("Profile", )
@@ -66,9 +66,9 @@ class Profile:
         "_personality",
         "_images",
         "_post_url",
-        "_post_msg",
         "_preferences",
         "_public",
+        "_compiled",
     )
     
     MAX_ADDL_IMAGES = 3
@@ -88,7 +88,9 @@ class Profile:
         self._preferences: ProfilePreferences = ProfilePreferences(self)
         
         self._post_url: Optional[str] = None
-        self._post_msg: Optional[Message] = None
+        
+        # Section name -> that section's last compile() result.
+        self._compiled: Dict[str, Any] = {}
     
 ################################################################################
     @classmethod
@@ -117,7 +119,8 @@ class Profile:
         self._preferences = ProfilePreferences.load(self, data["preferences"])
         
         self._post_url = profile_data[3]
-        self._post_msg = None
+        
+        self._compiled = {}
         
         return self
     
@@ -162,6 +165,8 @@ class Profile:
         self._post_url = value
         self.update()
         
+        self._mgr.reviver.track(self, posted=value is not None)
+        
 ################################################################################
     @property
     def details(self) -> ProfileDetails:
@@ -210,6 +215,8 @@ class Profile:
         self._public = value
         self.update()
         
+        self._mgr.reviver.track(self)
+        
 ################################################################################
     def is_complete(self) -> bool:
         
@@ -218,15 +225,18 @@ class Profile:
 ################################################################################
     async def post_message(self) -> Optional[Message]:
         
-        if self._post_msg is not None:
-            return self._post_msg
-        
         return await self._mgr.guild.get_or_fetch_message(self._post_url)
     
 ################################################################################
     def update(self) -> None:
 
         self.bot.database.update.profile(self)
+        self.refresh_matching()
+        
+################################################################################
+    def refresh_matching(self) -> None:
+        
+        self._mgr.matching.refresh(self)
 
 ################################################################################
     async def menu(self, interaction: Interaction) -> None:
@@ -246,11 +256,11 @@ class Profile:
 ################################################################################
     def compile(self) -> Tuple[Embed, Optional[Embed], Optional[Embed]]:
 
-        char_name, url, color, jobs, rates_field = self._details.compile()
-        ataglance = self._aag.compile()
-        likes, dislikes, personality, aboutme = self._personality.compile()
-        thumbnail, main_image, additional_imgs = self._images.compile()
-        preferences = self._preferences.compile()
+        char_name, url, color, jobs, rates_field = self._compile_section("details", self._details)
+        ataglance = self._compile_section("ataglance", self._aag)
+        likes, dislikes, personality, aboutme = self._compile_section("personality", self._personality)
+        thumbnail, main_image, additional_imgs = self._compile_section("images", self._images)
+        preferences = self._compile_section("preferences", self._preferences)
 
         if char_name is None:
             char_name = f"Character Name: `Not Set`"
@@ -284,6 +294,47 @@ class Profile:
 
         return main_profile, preferences, aboutme
     
+################################################################################
+    def _compile_section(self, name: str, section: ProfileSection) -> Any:
+        """Returns a section's compiled parts, only re-rendering them if the
+        section has changed since they were last compiled. Embeds and fields
+        are handed out as copies, since callers are free to modify them."""
+        
+        try:
+            parts = self._compiled[name]
+        except KeyError:
+            parts = self._compiled[name] = section.compile()
+            self._mgr.count_compile(hit=False)
+        else:
+            self._mgr.count_compile(hit=True)
+            
+        return self._fresh(parts)
+    
+################################################################################
+    @staticmethod
+    def _fresh(parts: Any) -> Any:
+        
+        if isinstance(parts, tuple):
+            return tuple(Profile._fresh(p) for p in parts)
+        if isinstance(parts, EmbedField):
+            return EmbedField(name=parts.name, value=parts.value, inline=parts.inline)
+        if isinstance(parts, Embed):
+            return parts.copy()
+        
+        return parts
+    
+################################################################################
+    def invalidate_compiled(self, *sections: str) -> None:
+        """Drops the named sections' compiled parts, or every section's if
+        none are named."""
+        
+        if not sections:
+            self._compiled.clear()
+            return
+        
+        for name in sections:
+            self._compiled.pop(name, None)
+    
 ################################################################################
     async def main_details_menu(self, interaction: Interaction) -> None:
         
@@ -458,8 +509,9 @@ class Profile:
         
         post_embeds = [e for e in self.compile() if e is not None]
         if channel.type == ChannelType.text:
-            self._post_msg = await channel.send(embeds=post_embeds)
-            self.post_url = self._post_msg.jump_url
+            message = await channel.send(embeds=post_embeds)
+            self.bot.message_cache.put(message)
+            self.post_url = message.jump_url
             await interaction.respond(embed=self.success_message(not self.is_public))
             return
 
@@ -478,10 +530,11 @@ class Profile:
         try:
             result = await action(embeds=post_embeds)
             if isinstance(result, Thread):
-                self._post_msg = await result.fetch_message(result.last_message_id)
+                message = await result.fetch_message(result.last_message_id)
             else:
-                self._post_msg = result
-            self.post_url = self._post_msg.jump_url
+                message = result
+            self.bot.message_cache.put(message)
+            self.post_url = message.jump_url
             await interaction.respond(embed=self.success_message(not self.is_public))
         except Forbidden:
             error = InsufficientPermissions(channel, "Send Messages")
@@ -498,7 +551,8 @@ class Profile:
             return False
         
         try:
-            await message.edit(embeds=[e for e in self.compile() if e is not None])
+            message = await message.edit(embeds=[e for e in self.compile() if e is not None])
+            self.bot.message_cache.refresh(message)
         except NotFound:
             self.post_url = None
             return False
@@ -555,7 +609,7 @@ class Profile:
         await view.wait()
 
 ################################################################################
-    async def run_matching_routine(self, interaction: Interaction, public_profiles: List[Profile]) -> None:
+    async def run_matching_routine(self, interaction: Interaction) -> None:
 
         post_msg = await self.post_message()
         if post_msg is None:
@@ -563,7 +617,7 @@ class Profile:
             await interaction.respond(embed=error, ephemeral=True)
             return
         
-        if not self.preferences.is_matchable:
+        if not self.preferences.is_matchable():
             error = PreferencesIncomplete(self)
             await interaction.respond(embed=error, ephemeral=True)
             return
@@ -584,17 +638,7 @@ class Profile:
         if not view.complete or view.value is False:
             return
         
-        matches = []
-        for profile in public_profiles:
-            if profile == self:
-                continue
-            if not profile.preferences.is_matchable():
-                continue
-            if match := self._preferences.match(profile):
-                matches.append(match)
-                
-        matches.sort(key=lambda x: x[1], reverse=True)
-        matches = matches[:5]
+        matches = self._mgr.matching.top_matches(self)
         
         if not matches:
             await interaction.respond(
@@ -649,19 +693,20 @@ class Profile:
             return True
 
 ################################################################################
-    async def revive_if_necessary(self):
+    async def revive(self, thread: Thread) -> None:
+        """Reposts the profile at the bottom of its thread, which also keeps
+        the thread from archiving, then removes the old post."""
         
-        message = await self.post_message()
-        if message is None:
-            return
+        old_id = int(self._post_url.split("/")[-1])
         
-        if not isinstance(message.channel, Thread):
-            return
+        message = await thread.send(embeds=[e for e in self.compile() if e is not None])
+        self.bot.message_cache.put(message)
+        try:
+            await thread.get_partial_message(old_id).delete()
+        except NotFound:
+            pass
         
-        if message.channel.archived:
-            new_msg = await message.channel.send(embeds=[e for e in self.compile() if e is not None])
-            await self.delete_profile_post()
-            self.post_url = new_msg.jump_url
+        self.post_url = message.jump_url
 
 ################################################################################
     async def make_contact(self, interaction: Interaction) -> None:
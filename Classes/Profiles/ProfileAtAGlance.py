@@ -211,6 +211,8 @@ class ProfileAtAGlance(ProfileSection):
     def update(self) -> None:
         
         self.bot.database.update.profile_ataglance(self)
+        self.parent.invalidate_compiled("ataglance")
+        self.parent.refresh_matching()
 
 ################################################################################
     @staticmethod
@@ -113,12 +113,14 @@ class ProfileChannelGroup:
     def update(self) -> None:
         
         self.bot.database.update.profile_channel_group(self)
+        self._mgr.invalidate_channel_index()
         
 ################################################################################
     def delete(self) -> None:
         
         self.bot.database.delete.profile_channel_group(self)
         self._mgr._channels.remove(self)
+        self._mgr.invalidate_channel_index()
         
 ################################################################################
     def status(self) -> Embed:
@@ -118,6 +118,8 @@ class ProfileDetails(ProfileSection):
     def update(self) -> None:
     
         self.bot.database.update.profile_details(self)
+        # Other sections use the name, URL and color, so they're stale too.
+        self.parent.invalidate_compiled()
 
 ################################################################################
     def status(self) -> Embed:
@@ -100,6 +100,7 @@ class ProfileImages(ProfileSection):
     def update(self) -> None:
         
         self.bot.database.update.profile_images(self)
+        self.parent.invalidate_compiled("images")
         
 ################################################################################
     async def menu(self, interaction: Interaction) -> None:
@@ -327,6 +328,7 @@ class ProfileImages(ProfileSection):
         
         if image := await U.wait_for_image(interaction, prompt):
             self.additional.append(AdditionalImage.new(self, image))
+            self.parent.invalidate_compiled("images")
             
 ################################################################################
     async def paginate_additional(self, interaction: Interaction) -> None:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Any, Dict, Optional, Union
+from typing import TYPE_CHECKING, List, Any, Dict, Optional, Set, Tuple, Union
 
 from discord import (
     EmbedField,
@@ -18,8 +18,10 @@ from Utilities import Utilities as U
 from Errors import MaxItemsReached
 from UI.Common import FroggeSelectView
 from UI.Profiles import ProfileManagerMenuView, ProfileChannelsMenuView
+from .MatchingIndex import MatchingIndex
 from .Profile import Profile
 from .ProfileRequirements import ProfileRequirements
+from .ProfileReviver import ProfileReviver
 from .ProfileChannelGroup import ProfileChannelGroup
 
 if TYPE_CHECKING:
@@ -37,6 +39,15 @@ class ProfileManager:
         "_requirements",
         "_channels",
         "_category",
+        "_matching",
+        "_compile_hits",
+        "_compile_misses",
+        "_reviver",
+        "_revive_budget",
+        "_groups_by_role",
+        "_roles",
+        "_post_channels",
+        "_index_stale",
     )
     
     MAX_CHANNEL_GROUPS = 8  # (Three fields per line in the embed) 
@@ -52,6 +63,22 @@ class ProfileManager:
         self._channels: List[ProfileChannelGroup] = []
 
         self._category: Optional[CategoryChannel] = None
+        
+        self._matching: MatchingIndex = MatchingIndex(self)
+        
+        self._compile_hits: int = 0
+        self._compile_misses: int = 0
+        
+        self._reviver: ProfileReviver = ProfileReviver(self)
+        self._revive_budget: int = ProfileReviver.DEFAULT_BUDGET
+        
+        # (Private?, role ID) -> the channel groups that role may post to,
+        # plus the de-duplicated roles and channels across all groups.
+        # Rebuilt lazily after any channel group changes.
+        self._groups_by_role: Dict[Tuple[bool, int], List[ProfileChannelGroup]] = {}
+        self._roles: Dict[int, Role] = {}
+        self._post_channels: Dict[int, Union[TextChannel, ForumChannel]] = {}
+        self._index_stale: bool = True
     
 ################################################################################
     async def load_all(self, payload: Dict[str, Any]) -> None:
@@ -60,6 +87,7 @@ class ProfileManager:
             await ProfileChannelGroup.load(self, c) 
             for c in payload["channels"]
         ]
+        self.invalidate_channel_index()
         
         profiles = []
         for p in payload["profiles"]:
@@ -67,10 +95,15 @@ class ProfileManager:
             if profile is not None:  # Profile is None if user is not found.
                 profiles.append(profile)
         self._profiles = profiles
+        self._matching.rebuild(profiles)
         
         self._requirements.load(payload["requirements"])
 
         self._category = await self.guild.get_or_fetch_channel(payload["category_id"])
+        
+        if payload["revive_budget"] is not None:
+            self._revive_budget = payload["revive_budget"]
+        self._reviver.start()
     
 ################################################################################
     def __getitem__(self, profile_id: str) -> Optional[Profile]:
@@ -106,23 +139,91 @@ class ProfileManager:
         
         return [p for p in self._profiles if p.is_public]
     
+################################################################################
+    @property
+    def matching(self) -> MatchingIndex:
+        
+        return self._matching
+    
+################################################################################
+    @property
+    def reviver(self) -> ProfileReviver:
+        
+        return self._reviver
+    
+################################################################################
+    @property
+    def revive_budget(self) -> int:
+        """The REST calls per minute profile revivals may use."""
+        
+        return self._revive_budget
+    
+    @revive_budget.setter
+    def revive_budget(self, value: int) -> None:
+        
+        self._revive_budget = value
+        self.update()
+        
+################################################################################
+    @property
+    def compile_stats(self) -> Tuple[int, int]:
+        """How many profile sections were served from cache vs. re-rendered."""
+        
+        return self._compile_hits, self._compile_misses
+    
+################################################################################
+    def count_compile(self, hit: bool) -> None:
+        
+        if hit:
+            self._compile_hits += 1
+        else:
+            self._compile_misses += 1
+            
 ################################################################################
     @property
     def profile_requirements(self) -> ProfileRequirements:
         
         return self._requirements
     
+################################################################################
+    def invalidate_channel_index(self) -> None:
+        """Marks the role -> channel group index for rebuilding. Called
+        whenever a channel group is added, changed or removed."""
+        
+        self._index_stale = True
+        
+################################################################################
+    def _ensure_channel_index(self) -> None:
+        
+        if not self._index_stale:
+            return
+        
+        self._groups_by_role.clear()
+        self._roles.clear()
+        self._post_channels.clear()
+        
+        for group in self._channels:
+            for role in group.roles:
+                self._groups_by_role.setdefault((group.is_private, role.id), []).append(group)
+                self._roles.setdefault(role.id, role)
+            for channel in group.channels:
+                self._post_channels.setdefault(channel.id, channel)
+                
+        self._index_stale = False
+        
 ################################################################################
     @property
     def allowed_roles(self) -> List[Role]:
         
-        return [r for group in self._channels for r in group.roles]
+        self._ensure_channel_index()
+        return list(self._roles.values())
     
 ################################################################################
     @property
     def post_channels(self) -> List[Union[TextChannel, ForumChannel]]:
         
-        return [c for group in self._channels for c in group.channels]
+        self._ensure_channel_index()
+        return list(self._post_channels.values())
     
 ################################################################################
     @property
@@ -144,15 +245,7 @@ class ProfileManager:
 ################################################################################
     def status(self) -> Embed:
         
-        channels = []
-        roles = []
-        for group in self._channels:
-            for channel in group.channels:
-                if channel not in channels:
-                    channels.append(channel)
-            for role in group.roles:
-                if role not in roles:
-                    roles.append(role)
+        self._ensure_channel_index()
         
         posted_profiles = [p for p in self._profiles if p.post_url is not None]
         posted_names = [p.name for p in posted_profiles]
@@ -175,8 +268,8 @@ class ProfileManager:
                 f"**[`{len(self._requirements)}/17`]** Profile Requirements Selected\n\n"
                 
                 f"**[`{len(self._channels)}`]** Channel Groups Defined with...\n"
-                f"**[`{len(channels)}`]** Channels available for posting by...\n"
-                f"**[`{len(roles)}`]** Roles\n\n"
+                f"**[`{len(self._post_channels)}`]** Channels available for posting by...\n"
+                f"**[`{len(self._roles)}`]** Roles\n\n"
                 
                 f"__**Matching System Channel Create Category:**__\n"
                 f"**[`{self._category.name if self._category else 'Not Set'}`]**"
@@ -288,6 +381,7 @@ class ProfileManager:
         
         new_group = ProfileChannelGroup.new(self)
         self._channels.append(new_group)
+        self.invalidate_channel_index()
         
         await new_group.menu(interaction)
         
@@ -351,7 +445,8 @@ class ProfileManager:
         if member is None:
             return False
         
-        return any(r in member.roles for r in self.allowed_roles)
+        self._ensure_channel_index()
+        return not self._roles.keys().isdisjoint(r.id for r in member.roles)
 
 ################################################################################
     async def post_channels_for(self, user: User, private: bool) -> List[Union[TextChannel, ForumChannel]]:
@@ -360,15 +455,21 @@ class ProfileManager:
         if member is None:
             return []
         
-        ret = []
+        self._ensure_channel_index()
+        
+        matched: Set[str] = set()
+        for role in member.roles:
+            for group in self._groups_by_role.get((private, role.id), []):
+                matched.add(group.id)
+        
+        # Keep the groups' configured order, listing each channel once.
+        ret = {}
         for group in self._channels:
-            if any(r in member.roles for r in group.roles):
-                if private and group.is_private:
-                    ret.extend(group.channels)
-                elif not private and not group.is_private:
-                    ret.extend(group.channels)
+            if group.id in matched:
+                for channel in group.channels:
+                    ret.setdefault(channel.id, channel)
                 
-        return ret
+        return list(ret.values())
 
 ################################################################################
     async def user_matching(self, interaction: Interaction) -> None:
@@ -377,13 +478,7 @@ class ProfileManager:
         if profile is None:
             profile = self.new_profile(interaction.user)
             
-        await profile.run_matching_routine(interaction, self.public_profiles)
-
-################################################################################
-    async def revive_profiles(self) -> None:
-        
-        for profile in self.public_profiles:
-            await profile.revive_if_necessary()
+        await profile.run_matching_routine(interaction)
 
 ################################################################################
     async def member_left(self, member: Member) -> None:
@@ -102,6 +102,7 @@ class ProfilePersonality(ProfileSection):
     def update(self) -> None:
         
         self.bot.database.update.profile_personality(self)
+        self.parent.invalidate_compiled("personality")
         
 ################################################################################
     async def menu(self, interaction: Interaction) -> None:
@@ -7,6 +7,7 @@ from discord import Embed, EmbedField, Interaction, User
 from Enums import Gender, FFXIVActivity, MusicGenre, ZodiacSign, Race
 from UI.Common import FroggeSelectView
 from .ProfileSection import ProfileSection
+from .MatchingIndex import MatchFeatures, MatchingIndex
 from .PreferenceGroup import PreferenceGroup
 from Utilities import Utilities as U
 from UI.Profiles import ProfilePreferencesMenuView
@@ -288,6 +289,8 @@ class ProfilePreferences(ProfileSection):
     def update(self) -> None:
         
         self.bot.database.update.profile_preferences(self)
+        self.parent.invalidate_compiled("preferences")
+        self.parent.refresh_matching()
         
 ################################################################################
     async def menu(self, interaction: Interaction) -> None:
@@ -424,41 +427,13 @@ class ProfilePreferences(ProfileSection):
 ################################################################################
     def match(self, profile: Profile) -> Optional[Tuple[Profile, int]]:
 
-        preferences = profile.preferences
-
-        match_value = 0
-        match_max = 0
-
-        self_gender = self.parent.ataglance.gender
-        self_race = self.parent.ataglance.race
-        if isinstance(self_race, Race):
-            match_max += 1
-            if self_race in preferences.get_preference(self_gender).preferences:
-                match_value += 1
-            if self_race in preferences.get_preference(self_gender).restrictions:
-                match_value -= 1
-
-        if isinstance(self_gender, Gender):
-            match_max += 1
-            if preferences.get_preference(self_gender).is_complete:
-                match_value += 1
-
-        if self.zodiac_self and self.zodiac_partners:
-            match_max += 2
-            if preferences.zodiac_self in self.zodiac_partners:
-                match_value += 1
-            if self.zodiac_self in preferences.zodiac_partners:
-                match_value += 1
-
-        for activity in preferences.activities:
-            match_max += 1
-            if activity in self.activities:
-                match_value += 1
-        for music in preferences.music_prefs:
-            match_max += 1
-            if music in self.music_prefs:
-                match_value += 1
+        score = MatchingIndex.score(
+            MatchFeatures.from_profile(self.parent),
+            MatchFeatures.from_profile(profile)
+        )
+        if score is None:
+            return
 
-        return profile, int((match_value / match_max) * 100)
+        return profile, score
 
 ################################################################################
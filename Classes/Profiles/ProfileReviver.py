@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from discord import Thread
+from discord.utils import snowflake_time
+
+from Utilities import log
+
+if TYPE_CHECKING:
+    from Classes import Profile, ProfileManager
+################################################################################
+
+__all__ = ("ProfileReviver", )
+
+################################################################################
+class ProfileReviver:
+    """Keeps posted profiles' threads from auto-archiving.
+
+    Each tracked thread's archive deadline is worked out from its last
+    activity and auto-archive duration, and kept current from gateway thread
+    and message events rather than by fetching the post. A profile is only
+    reposted once its thread is within `REVIVE_MARGIN` of that deadline (or
+    has already archived). Reposts are paced by a token bucket refilling at
+    the guild's `revive_budget` REST calls per minute, so a large guild's
+    revivals are spread out instead of arriving as one burst."""
+
+    __slots__ = (
+        "_mgr",
+        "_threads",
+        "_profile_threads",
+        "_due",
+        "_heap",
+        "_wakeup",
+        "_task",
+        "_tokens",
+        "_refilled",
+    )
+
+    # Fraction of a thread's auto-archive duration before the deadline at
+    # which its profile is reposted.
+    REVIVE_MARGIN = 0.1
+    DEFAULT_BUDGET = 10
+    # Sending the new post and deleting the old one.
+    CALLS_PER_REVIVE = 2
+    # Fetching a thread that isn't in the gateway cache.
+    CALLS_PER_FETCH = 1
+
+################################################################################
+    def __init__(self, mgr: ProfileManager) -> None:
+
+        self._mgr: ProfileManager = mgr
+
+        # Thread ID -> profile ID, and back
+        self._threads: Dict[int, str] = {}
+        self._profile_threads: Dict[str, int] = {}
+        # Profile ID -> when it's next due, as a POSIX timestamp. Heap entries
+        # that no longer match this are stale and skipped.
+        self._due: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self._tokens: float = 0.0
+        self._refilled: float = time.monotonic()
+
+################################################################################
+    @property
+    def budget(self) -> int:
+
+        return self._mgr.revive_budget
+
+################################################################################
+    @property
+    def pending(self) -> int:
+
+        return len(self._due)
+
+################################################################################
+    def start(self) -> None:
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+################################################################################
+    def stop(self) -> None:
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+################################################################################
+    @staticmethod
+    def thread_id_for(profile: Profile) -> Optional[int]:
+
+        if profile.post_url is None:
+            return
+
+        return int(profile.post_url.split("/")[-2])
+
+################################################################################
+    def track(self, profile: Profile, posted: bool = False) -> None:
+        """Starts (or restarts) watching the thread the profile is posted in.
+        
+        `posted` means the profile was just (re)posted, which the cached
+        thread won't reflect yet, so its deadline runs from now."""
+
+        old_thread_id = self._profile_threads.pop(profile.id, None)
+        if old_thread_id is not None:
+            del self._threads[old_thread_id]
+
+        thread_id = self.thread_id_for(profile)
+        if thread_id is None or not profile.is_public:
+            self._due.pop(profile.id, None)
+            return
+
+        self._threads[thread_id] = profile.id
+        self._profile_threads[profile.id] = thread_id
+
+        # Threads that aren't in the gateway cache (usually archived ones)
+        # are looked at straight away, within the budget.
+        thread = self._mgr.guild.parent.get_thread(thread_id)
+        if thread is None:
+            when = time.time()
+        elif posted:
+            when = self._revive_from_now(thread)
+        else:
+            when = self._revive_at(thread)
+            
+        self._schedule(profile.id, when)
+
+################################################################################
+    def untrack(self, profile: Profile) -> None:
+
+        thread_id = self._profile_threads.pop(profile.id, None)
+        if thread_id is not None:
+            del self._threads[thread_id]
+
+        self._due.pop(profile.id, None)
+
+################################################################################
+    def thread_updated(self, thread: Thread) -> None:
+
+        if profile_id := self._threads.get(thread.id):
+            self._schedule(profile_id, self._revive_at(thread))
+
+################################################################################
+    def thread_active(self, thread: Thread) -> None:
+        """Pushes a thread's deadline back after a message is sent in it."""
+
+        if profile_id := self._threads.get(thread.id):
+            self._schedule(profile_id, self._revive_from_now(thread))
+
+################################################################################
+    def thread_deleted(self, thread_id: int) -> None:
+
+        if profile_id := self._threads.pop(thread_id, None):
+            del self._profile_threads[profile_id]
+            self._due.pop(profile_id, None)
+
+################################################################################
+    def _revive_at(self, thread: Thread) -> float:
+
+        if thread.archived:
+            return time.time()
+
+        last_active = thread.archive_timestamp.timestamp()
+        if thread.last_message_id is not None:
+            last_active = max(last_active, snowflake_time(thread.last_message_id).timestamp())
+
+        duration = thread.auto_archive_duration * 60
+        return last_active + duration * (1 - self.REVIVE_MARGIN)
+
+################################################################################
+    def _revive_from_now(self, thread: Thread) -> float:
+        """The deadline of a thread that has just seen activity."""
+
+        duration = thread.auto_archive_duration * 60
+        return time.time() + duration * (1 - self.REVIVE_MARGIN)
+
+################################################################################
+    def _schedule(self, profile_id: str, when: float) -> None:
+
+        self._due[profile_id] = when
+        heapq.heappush(self._heap, (when, profile_id))
+
+        # Only the earliest entry decides how long the loop sleeps.
+        if self._heap[0] == (when, profile_id):
+            self._wakeup.set()
+
+################################################################################
+    async def _run(self) -> None:
+
+        await self._mgr.guild.wait_until_ready()
+
+        for profile in self._mgr.public_profiles:
+            self.track(profile)
+
+        while True:
+            self._wakeup.clear()
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            when, profile_id = self._heap[0]
+            if self._due.get(profile_id) != when:
+                heapq.heappop(self._heap)
+                continue
+
+            delay = when - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            del self._due[profile_id]
+
+            try:
+                await self._revive(profile_id)
+            except Exception as ex:
+                log.warning(self._mgr.guild, f"Reviving profile {profile_id} failed: {ex!r}")
+
+################################################################################
+    async def _spend(self, calls: int) -> None:
+        """Waits until the guild's REST budget allows `calls` more requests."""
+
+        rate = max(self.budget, 1) / 60
+
+        now = time.monotonic()
+        self._tokens = min(float(self.budget), self._tokens + (now - self._refilled) * rate)
+        self._refilled = now
+
+        if self._tokens < calls:
+            await asyncio.sleep((calls - self._tokens) / rate)
+            self._tokens = float(calls)
+            self._refilled = time.monotonic()
+
+        self._tokens -= calls
+
+################################################################################
+    async def _revive(self, profile_id: str) -> None:
+
+        profile = self._mgr[profile_id]
+        if profile is None or not profile.is_public or profile.post_url is None:
+            return
+
+        thread_id = self.thread_id_for(profile)
+        # Only the REST calls actually made are charged to the budget.
+        thread = self._mgr.guild.parent.get_thread(thread_id)
+        if thread is None:
+            await self._spend(self.CALLS_PER_FETCH)
+            thread = await self._mgr.guild.get_or_fetch_channel(thread_id)
+        if not isinstance(thread, Thread):
+            self.untrack(profile)
+            return
+
+        # Activity we didn't hear about (e.g. before a restart) may have
+        # moved the deadline.
+        when = self._revive_at(thread)
+        if when > time.time():
+            self._schedule(profile_id, when)
+            return
+
+        await self._spend(self.CALLS_PER_REVIVE)
+        await profile.revive(thread)
+
+        hits, misses = self._mgr.compile_stats
+        log.debug(
+            self._mgr.guild,
+            f"Revived profile {profile_id} in thread {thread_id}. Profile sections "
+            f"compiled so far: {hits} from cache, {misses} rendered."
+        )
+
+################################################################################
@@ -1,4 +1,5 @@
 from .AdditionalImage import AdditionalImage
+from .MatchingIndex import MatchFeatures, MatchingIndex
 from .ProfileChannelGroup import ProfileChannelGroup
 from .ProfilePreferences import ProfilePreferences
 from .PreferenceGroup import PreferenceGroup
@@ -9,5 +10,6 @@ from .ProfileImages import ProfileImages
 from .ProfileManager import ProfileManager
 from .ProfilePersonality import ProfilePersonality
 from .ProfileRequirements import ProfileRequirements
+from .ProfileReviver import ProfileReviver
 from .ProfileSection import ProfileSection
 ################################################################################
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING, Callable, Collection, List, NamedTuple, Optional, Sequence, Set, Tuple, Type, TypeVar
+
+if TYPE_CHECKING:
+    from Classes import TradingCard
+################################################################################
+
+__all__ = (
+    "BattleCard",
+    "BattleEngine",
+    "BattleResult",
+)
+
+BC = TypeVar("BC", bound="BattleCard")
+
+################################################################################
+class BattleCard(NamedTuple):
+    """A snapshot of the stats a card battles with."""
+
+    id: str
+    die: Optional[int]
+    bad: Optional[int]
+    cute: Optional[int]
+    cuddle: Optional[int]
+    crush: Optional[int]
+
+################################################################################
+    @classmethod
+    def from_card(cls: Type[BC], card: TradingCard) -> BC:
+
+        return cls(card.id, card.die_marker, card.bad, card.cute, card.cuddle, card.crush)
+
+################################################################################
+    @property
+    def is_complete(self) -> bool:
+
+        return None not in self
+
+################################################################################
+    def stat(self, name: str) -> Optional[int]:
+
+        match name.lower():
+            case "cute":
+                return self.cute
+            case "cuddle":
+                return self.cuddle
+            case "crush":
+                return self.crush
+            case _:
+                raise ValueError(f"Invalid Stat: {name}")
+
+################################################################################
+class BattleResult(NamedTuple):
+
+    winner: Optional[int]
+    """``1`` or ``2`` for the winning player, ``None`` if the battle couldn't finish."""
+    wins: Tuple[int, int]
+    rounds: int
+    stat_rolls: int
+    plays: List[Tuple[BattleCard, BattleCard, int]]
+    """Each round's cards and the player who won it."""
+
+################################################################################
+class BattleEngine:
+    """The trading card battle rules, free of any Discord I/O.
+
+    A battle is played in rounds until a player has won `ROUNDS_TO_WIN`.
+    Each round a die is rolled and both players play a card whose die marker
+    is nearest the roll, from cards they haven't played yet. The two cards
+    then duel over `STATS`, best of three: each stat is decided by a 0-999
+    roll, where a card whose BAD digits share a position with the roll loses,
+    and otherwise the card whose stat is closest to the roll wins. Ties and
+    double BAD matches are re-rolled."""
+
+    __slots__ = (
+        "_rng",
+        "_choose",
+    )
+
+    DIE_FACES = 6
+    ROLL_RANGE = 1000
+    STATS = ("cute", "cuddle", "crush")
+    ROUNDS_TO_WIN = 3
+    STATS_TO_WIN = 2
+    # Guards against decks that can only ever play the same card as each other.
+    MAX_PICK_ATTEMPTS = 100
+
+################################################################################
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        choose: Optional[Callable[[List[BattleCard], random.Random], BattleCard]] = None
+    ) -> None:
+        """
+        Parameters:
+        -----------
+        rng: Optional[:class:`random.Random`]
+            The source of every roll. Seed it for reproducible battles.
+        choose: Optional[Callable]
+            Picks a card to play from the matching cards. Defaults to a
+            uniformly random choice.
+        """
+
+        self._rng: random.Random = rng or random.Random()
+        self._choose = choose or (lambda cards, rng: rng.choice(cards))
+
+################################################################################
+    @staticmethod
+    def digits(value: int) -> List[int]:
+
+        return [int(c) for c in str(value).zfill(3)]
+
+################################################################################
+    @staticmethod
+    def bad_match(bad: Optional[int], roll: int) -> Optional[Tuple[int, int]]:
+        """Returns the position and digit of the first BAD digit matching the
+        roll's digit in the same position, if any."""
+
+        if bad is None:
+            return
+
+        for i, (b, r) in enumerate(zip(BattleEngine.digits(bad), BattleEngine.digits(roll))):
+            if b == r:
+                return i, b
+
+################################################################################
+    @staticmethod
+    def distance(stat: int, roll: int) -> int:
+
+        return abs(stat - roll)
+
+################################################################################
+    @classmethod
+    def matching_cards(cls, deck: Sequence[BattleCard], played: Collection[str], roll: int) -> List[BattleCard]:
+        """Returns the unplayed cards whose die marker matches the roll,
+        widening the search one step either side until something matches."""
+
+        available = [c for c in deck if c.id not in played and c.die is not None]
+        for spread in range(cls.DIE_FACES):
+            matching = [c for c in available if abs(c.die - roll) == spread]
+            if matching:
+                return matching
+
+        return []
+
+################################################################################
+    @classmethod
+    def stat_outcome(cls, card1: BattleCard, card2: BattleCard, stat: str, roll: int) -> int:
+        """Returns ``1`` or ``2`` for the card that wins the roll, or ``0`` if
+        it has to be re-rolled."""
+
+        bad1 = cls.bad_match(card1.bad, roll) is not None
+        bad2 = cls.bad_match(card2.bad, roll) is not None
+        if bad1 or bad2:
+            return 0 if bad1 and bad2 else (2 if bad1 else 1)
+
+        dist1 = cls.distance(card1.stat(stat), roll)
+        dist2 = cls.distance(card2.stat(stat), roll)
+        if dist1 == dist2:
+            return 0
+
+        return 1 if dist1 < dist2 else 2
+
+################################################################################
+    def roll_die(self) -> int:
+
+        return self._rng.randint(1, self.DIE_FACES)
+
+################################################################################
+    def roll_stat(self) -> int:
+
+        return self._rng.randint(0, self.ROLL_RANGE - 1)
+
+################################################################################
+    def pick_cards(
+        self,
+        deck1: Sequence[BattleCard],
+        deck2: Sequence[BattleCard],
+        played: Tuple[Set[str], Set[str]]
+    ) -> Optional[Tuple[BattleCard, BattleCard]]:
+        """Rolls the die and picks each player's card, re-rolling when both
+        pick the same card. Returns ``None`` if a deck has nothing to play."""
+
+        for _ in range(self.MAX_PICK_ATTEMPTS):
+            roll = self.roll_die()
+            matching1 = self.matching_cards(deck1, played[0], roll)
+            matching2 = self.matching_cards(deck2, played[1], roll)
+            if not matching1 or not matching2:
+                return
+
+            card1 = self._choose(matching1, self._rng)
+            card2 = self._choose(matching2, self._rng)
+            if card1.id != card2.id:
+                return card1, card2
+
+################################################################################
+    def duel(self, card1: BattleCard, card2: BattleCard) -> Tuple[int, int]:
+        """Plays a best of three over `STATS`. Returns the winning player and
+        the number of stat rolls it took."""
+
+        wins = [0, 0]
+        rolls = 0
+
+        for stat in self.STATS:
+            outcome = 0
+            while not outcome:
+                outcome = self.stat_outcome(card1, card2, stat, self.roll_stat())
+                rolls += 1
+
+            wins[outcome - 1] += 1
+            if max(wins) == self.STATS_TO_WIN:
+                break
+
+        return (1 if wins[0] > wins[1] else 2), rolls
+
+################################################################################
+    def play(self, deck1: Sequence[BattleCard], deck2: Sequence[BattleCard]) -> BattleResult:
+
+        wins = [0, 0]
+        played: Tuple[Set[str], Set[str]] = (set(), set())
+        plays = []
+        stat_rolls = 0
+
+        while max(wins) < self.ROUNDS_TO_WIN:
+            cards = self.pick_cards(deck1, deck2, played)
+            if cards is None:
+                break
+
+            winner, rolls = self.duel(*cards)
+            wins[winner - 1] += 1
+            stat_rolls += rolls
+            plays.append((cards[0], cards[1], winner))
+
+            played[0].add(cards[0].id)
+            played[1].add(cards[1].id)
+
+        if max(wins) < self.ROUNDS_TO_WIN:
+            winner = None
+        else:
+            winner = 1 if wins[0] > wins[1] else 2
+
+        return BattleResult(winner, (wins[0], wins[1]), len(plays), stat_rolls, plays)
+
+################################################################################
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+from discord import Embed, Message, Thread
+from discord.ui import View
+
+from Enums import BattlePacing
+################################################################################
+
+__all__ = ("BattleLog", )
+
+################################################################################
+class BattleLog:
+    """Collects a battle's announcements into as few messages as possible.
+
+    Posted embeds are buffered and appended to the current section's message
+    by editing it, only when the battle pauses for effect or needs player
+    input. A new message is started per section (round) or whenever the
+    current one is full. Pauses are scaled by the guild's pacing, and skipped
+    entirely (along with the edits they'd force) when pacing is instant."""
+
+    __slots__ = (
+        "_channel",
+        "_pacing",
+        "_message",
+        "_shown",
+        "_pending",
+        "_requests",
+    )
+
+    # Discord's per-message limits.
+    MAX_EMBEDS = 10
+    MAX_CHARS = 6000
+
+################################################################################
+    def __init__(self, channel: Thread, pacing: BattlePacing) -> None:
+
+        self._channel: Thread = channel
+        self._pacing: BattlePacing = pacing
+
+        self._message: Optional[Message] = None
+        self._shown: List[Embed] = []
+        self._pending: List[Embed] = []
+
+        self._requests: int = 0
+
+################################################################################
+    @property
+    def requests(self) -> int:
+        """The number of messages sent or edited so far."""
+
+        return self._requests
+
+################################################################################
+    def post(self, embed: Embed) -> None:
+
+        self._pending.append(embed)
+
+################################################################################
+    def _fits(self, embeds: List[Embed]) -> bool:
+
+        return (
+            len(embeds) <= self.MAX_EMBEDS
+            and sum(len(e) for e in embeds) <= self.MAX_CHARS
+        )
+
+################################################################################
+    async def flush(self) -> None:
+
+        if not self._pending:
+            return
+
+        if self._message is not None and self._fits(self._shown + self._pending):
+            self._shown += self._pending
+            await self._message.edit(embeds=self._shown)
+            self._requests += 1
+        else:
+            chunk: List[Embed] = []
+            for embed in self._pending:
+                if chunk and not self._fits(chunk + [embed]):
+                    await self._channel.send(embeds=chunk)
+                    self._requests += 1
+                    chunk = []
+                chunk.append(embed)
+
+            self._message = await self._channel.send(embeds=chunk)
+            self._shown = chunk
+            self._requests += 1
+
+        self._pending.clear()
+
+################################################################################
+    async def pause(self, seconds: float) -> None:
+
+        delay = seconds * self._pacing.delay_scale
+        if delay <= 0:
+            return
+
+        await self.flush()
+        await asyncio.sleep(delay)
+
+################################################################################
+    async def new_section(self) -> None:
+
+        await self.flush()
+        self._message = None
+        self._shown = []
+
+################################################################################
+    async def prompt(self, embed: Embed, view: View) -> Message:
+        """Shows everything posted so far, then asks for player input in its
+        own message."""
+
+        await self.flush()
+        self._requests += 1
+
+        return await self._channel.send(embed=embed, view=view)
+
+################################################################################
@@ -1,60 +1,140 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
 
 from discord import Interaction, User
 
+from Enums import BattlePacing
 from Errors import InvalidUserChallenge
+from Utilities import Utilities as U, log
 from .CardBattle import CardBattle
 from .Challenge import Challenge
 from .TCGPlayer import TCGPlayer
 
 if TYPE_CHECKING:
-    from Classes import TCGManager, RentARaBot
+    from Classes import TCGManager, RentARaBot, GuildData
 ################################################################################
 
 __all__ = ("BattleManager", )
 
 ################################################################################
 class BattleManager:
+    """Tracks a guild's players, challenges and battles.
+
+    Players and challenges are indexed by user ID. Battles are run as
+    background tasks, at most `limit` at a time, with the rest queued in the
+    order they were accepted. Each battle is checkpointed to the database
+    after every round so it can be resumed after a restart, and is called
+    off if it hasn't finished within `BATTLE_TIMEOUT` seconds."""
 
     __slots__ = (
         "_mgr",
         "_battles",
+        "_tasks",
+        "_in_battle",
         "_challenges",
         "_players",
+        "_pacing",
+        "_limit",
+        "_running",
+        "_queue",
+        "_resume_task",
     )
-    
+
+    MAX_CONCURRENT_BATTLES = 3
+    BATTLE_TIMEOUT = 60 * 60
+
 ################################################################################
     def __init__(self, mgr: TCGManager) -> None:
 
         self._mgr: TCGManager = mgr
-        
-        self._battles: List[CardBattle] = []
-        self._challenges: List[Challenge] = []
-        self._players: List[TCGPlayer] = []
-    
+
+        self._battles: Dict[str, CardBattle] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+        # User ID -> the battle or challenge they're taking part in. A
+        # challenge is listed under both of its participants.
+        self._in_battle: Dict[int, CardBattle] = {}
+        self._challenges: Dict[int, Challenge] = {}
+        self._players: Dict[int, TCGPlayer] = {}
+
+        self._pacing: BattlePacing = BattlePacing.Normal
+
+        self._limit: int = self.MAX_CONCURRENT_BATTLES
+        self._running: int = 0
+        self._queue: Deque[asyncio.Future] = deque()
+
+        self._resume_task: Optional[asyncio.Task] = None
+
+################################################################################
+    def load_all(self, config: Optional[Tuple[Any, ...]]) -> None:
+
+        if config is not None:
+            self._pacing = BattlePacing(config[2])
+            self._limit = config[3]
+
 ################################################################################
     @property
     def bot(self) -> RentARaBot:
-        
+
         return self._mgr.bot
-    
+
+################################################################################
+    @property
+    def guild(self) -> GuildData:
+
+        return self._mgr._state
+
 ################################################################################
     @property
     def guild_id(self) -> int:
-        
+
         return self._mgr.guild_id
-    
+
+################################################################################
+    @property
+    def pacing(self) -> BattlePacing:
+
+        return self._pacing
+
+    @pacing.setter
+    def pacing(self, value: BattlePacing) -> None:
+
+        self._pacing = value
+        self.bot.database.update.battle_pacing(self)
+
+################################################################################
+    @property
+    def limit(self) -> int:
+        """The number of battles that may be in play at once."""
+
+        return self._limit
+
+    @limit.setter
+    def limit(self, value: int) -> None:
+
+        self._limit = value
+        self.bot.database.update.battle_limit(self)
+
+        self._dispatch()
+
 ################################################################################
     @property
     def challenges(self) -> List[Challenge]:
-        
-        return self._challenges
-    
+
+        return list({c.id: c for c in self._challenges.values()}.values())
+
+################################################################################
+    @property
+    def battles(self) -> List[CardBattle]:
+
+        return list(self._battles.values())
+
 ################################################################################
     async def challenge_user(self, interaction: Interaction, user: User) -> None:
-        
+
         error = None
         # if interaction.user == user:
         #     error = InvalidUserChallenge()
@@ -62,45 +142,292 @@ class BattleManager:
             error = InvalidUserChallenge()
         elif _ := self.get_challenge(user):
             error = InvalidUserChallenge()
+        elif self.get_battle(interaction.user) or self.get_battle(user):
+            error = InvalidUserChallenge()
         if error:
             await interaction.respond(embed=error, ephemeral=True)
             return
-        
+
         player = self.get_player(interaction.user)
         opponent = self.get_player(user)
-        
+
         new_challenge = Challenge(self, player, opponent)
-        self._challenges.append(new_challenge)
-        
-        await new_challenge.issue(interaction)
-    
-################################################################################
-    def get_challenge(self, user: User) -> Challenge:
-        
-        for challenge in self._challenges:
-            if challenge.player.user == user or challenge.opponent.user == user:
-                return challenge
-    
+        self._add_challenge(new_challenge)
+
+        try:
+            await new_challenge.issue(interaction)
+        finally:
+            # Accepted challenges have already become battles by now, so
+            # this only clears out ones that were declined or timed out.
+            self.remove_challenge(new_challenge)
+
+################################################################################
+    def _add_challenge(self, challenge: Challenge) -> None:
+
+        self._challenges[challenge.player.user.id] = challenge
+        self._challenges[challenge.opponent.user.id] = challenge
+
+################################################################################
+    def remove_challenge(self, challenge: Challenge) -> None:
+
+        for player in (challenge.player, challenge.opponent):
+            if self._challenges.get(player.user.id) is challenge:
+                del self._challenges[player.user.id]
+
+        for player in (challenge.player, challenge.opponent):
+            self._release_player(player)
+
+################################################################################
+    def get_challenge(self, user: User) -> Optional[Challenge]:
+
+        return self._challenges.get(user.id)
+
+################################################################################
+    def get_battle(self, user: User) -> Optional[CardBattle]:
+
+        return self._in_battle.get(user.id)
+
 ################################################################################
     def get_player(self, user: User) -> TCGPlayer:
-        
-        for player in self._players:
-            if player.user == user:
-                return player
-            
-        player = TCGPlayer.new(self, user)
-        self._players.append(player)
-        
+
+        player = self._players.get(user.id)
+        if player is None:
+            player = TCGPlayer.new(self, user)
+            self._players[user.id] = player
+
         return player
-            
+
+################################################################################
+    def _release_player(self, player: TCGPlayer) -> None:
+        """Forgets a player once they're no longer in a challenge or battle."""
+
+        user_id = player.user.id
+        if user_id in self._challenges or user_id in self._in_battle:
+            return
+
+        if self._players.get(user_id) is player:
+            del self._players[user_id]
+            player.current_deck = None
+
 ################################################################################
     async def start_battle(self, challenge: Challenge) -> None:
-        
+
         battle = CardBattle(self, challenge)
-        self._battles.append(battle)
-        
-        await battle.start()
-        
+        self._register(battle)
+        self.remove_challenge(challenge)
+
+        battle.checkpoint()
+        self._schedule(battle)
+
+################################################################################
+    def _register(self, battle: CardBattle) -> None:
+
+        self._battles[battle.id] = battle
+        self._in_battle[battle.p1.user.id] = battle
+        self._in_battle[battle.p2.user.id] = battle
+
+################################################################################
+    def _unregister(self, battle: CardBattle) -> None:
+
+        self._battles.pop(battle.id, None)
+        self._tasks.pop(battle.id, None)
+
+        for player in (battle.p1, battle.p2):
+            if self._in_battle.get(player.user.id) is battle:
+                del self._in_battle[player.user.id]
+
+        for player in (battle.p1, battle.p2):
+            self._release_player(player)
+
+################################################################################
+    def _schedule(self, battle: CardBattle) -> None:
+
+        self._tasks[battle.id] = asyncio.create_task(self._run(battle))
+
+################################################################################
+    async def _run(self, battle: CardBattle) -> None:
+
+        try:
+            await self._play(battle)
+        except asyncio.CancelledError:
+            # Only happens on shutdown or reset. The checkpoint is left alone
+            # so a shutdown can resume from it; reset() deletes it itself.
+            try:
+                await battle.release()
+            finally:
+                self._unregister(battle)
+            raise
+        except Exception as ex:
+            log.error(self.guild, f"Battle {battle.id} failed and was ended: {ex!r}")
+
+        await self.end_battle(battle)
+
+################################################################################
+    async def _play(self, battle: CardBattle) -> None:
+
+        await self._acquire(battle)
+        try:
+            await asyncio.wait_for(battle.start(), self.BATTLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            log.info(self.guild, f"Battle {battle.id} timed out and was abandoned.")
+            await battle.abandon()
+        finally:
+            self._release()
+
+################################################################################
+    async def end_battle(self, battle: CardBattle) -> None:
+
+        try:
+            await battle.close()
+        finally:
+            self._unregister(battle)
+
+################################################################################
+    async def _acquire(self, battle: CardBattle) -> None:
+        """Waits for one of the guild's battle slots to come free."""
+
+        if self._running < self._limit and not self._queue:
+            self._running += 1
+            return
+
+        prompt = U.make_embed(
+            color=CardBattle.SYSTEM_COLOR,
+            title="__Battle Queued__",
+            description=(
+                f"There are already {self._running} battles underway in this "
+                f"server. This one will begin as soon as one of them finishes."
+            )
+        )
+        await battle.channel.send(embed=prompt)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queue.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # A slot handed over just as we were cancelled must be given back.
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+################################################################################
+    def _release(self) -> None:
+
+        self._running -= 1
+        self._dispatch()
+
+################################################################################
+    def _dispatch(self) -> None:
+        """Hands free battle slots to queued battles, in order."""
+
+        while self._queue and self._running < self._limit:
+            waiter = self._queue.popleft()
+            if waiter.done():
+                continue
+
+            self._running += 1
+            waiter.set_result(None)
+
+################################################################################
+    def resume_all(self, battles: List[Tuple[Any, ...]]) -> None:
+        """Restarts battles checkpointed before the last shutdown, once the
+        guild has finished loading."""
+
+        # on_ready fires again after a reconnect, reloading the guild while
+        # the battles resumed the first time are still running.
+        if self._resume_task is not None and not self._resume_task.done():
+            return
+
+        if battles:
+            self._resume_task = asyncio.create_task(self._resume_all(battles))
+
+################################################################################
+    async def _resume_all(self, battles: List[Tuple[Any, ...]]) -> None:
+
+        await self.guild.wait_until_ready()
+
+        resumed = 0
+        for data in battles:
+            if data[0] in self._battles or data[0] in self._tasks:
+                continue
+
+            battle = await self._restore(data)
+            if battle is None:
+                log.info(self.guild, f"Battle {data[0]} could not be resumed and was dropped.")
+                self.bot.database.delete.battle_checkpoint(data[0])
+                continue
+
+            self._register(battle)
+            self._schedule(battle)
+            resumed += 1
+
+        log.info(self.guild, f"Resumed {resumed} of {len(battles)} battles.")
+
+################################################################################
+    async def _restore(self, data: Tuple[Any, ...]) -> Optional[CardBattle]:
+
+        thread = await self.guild.get_or_fetch_channel(data[2])
+        p1_user = await self.guild.get_or_fetch_member_or_user(data[3])
+        p2_user = await self.guild.get_or_fetch_member_or_user(data[4])
+        if thread is None or p1_user is None or p2_user is None:
+            return
+
+        p1 = self.get_player(p1_user)
+        p2 = self.get_player(p2_user)
+
+        for player, deck_id in ((p1, data[5]), (p2, data[6])):
+            if player.collection is not None:
+                player.current_deck = player.collection.deck_manager[deck_id]
+        if p1.current_deck is None or p2.current_deck is None:
+            self._release_player(p1)
+            self._release_player(p2)
+            return
+
+        return CardBattle.resume(self, data, p1, p2, thread)
+
+################################################################################
+    async def reset(self) -> None:
+        """Calls off every challenge and battle in the guild."""
+
+        for battle in self._battles.values():
+            self.bot.database.delete.battle_checkpoint(battle.id)
+
+        # Each battle releases its decks and unregisters itself as it
+        # unwinds from the cancellation.
+        tasks = list(self._tasks.values())
+        if self._resume_task is not None:
+            tasks.append(self._resume_task)
+            self._resume_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Tasks cancelled before they got to run never reach that cleanup.
+        for battle in list(self._battles.values()):
+            await battle.release()
+
+        for player in self._players.values():
+            player.current_deck = None
+
+        self._battles.clear()
+        self._tasks.clear()
+        self._in_battle.clear()
+        self._challenges.clear()
+        self._players.clear()
+
+################################################################################
+    def close(self) -> None:
+        """Stops every battle task, queued or running, without deleting their
+        checkpoints, so the battles can be resumed if the guild is loaded
+        again."""
+
+        if self._resume_task is not None:
+            self._resume_task.cancel()
+            self._resume_task = None
+
+        for task in list(self._tasks.values()):
+            task.cancel()
+
 ################################################################################
     async def test_battle(self, interaction: Interaction) -> None:
 
@@ -108,7 +435,7 @@ class BattleManager:
         p2 = await self._mgr._state.get_or_fetch_member_or_user(265695573527625731)
 
         challenge = Challenge(self, self.get_player(p1), self.get_player(p2))
-        self._challenges.append(challenge)
+        self._add_challenge(challenge)
         await challenge.initiate_test(interaction)
 
         await self.start_battle(challenge)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for balance simulations.
+    np = None
+
+from .BattleEngine import BattleCard, BattleEngine
+
+if TYPE_CHECKING:
+    from Classes import CardManager, TradingCard
+################################################################################
+
+__all__ = (
+    "BattleSimulator",
+    "SimulationReport",
+)
+
+################################################################################
+class SimulationReport(NamedTuple):
+
+    battles: int
+    unfinished: int
+    mean_rounds: float
+    mean_stat_rolls: float
+    card_stats: Dict[str, Tuple[int, float]]
+    """Card ID -> (rounds played, round win rate)."""
+
+################################################################################
+    def summary(self, names: Optional[Dict[str, str]] = None, top: int = 10) -> str:
+
+        names = names or {}
+        ranked = sorted(self.card_stats.items(), key=lambda kv: kv[1][1], reverse=True)
+
+        def fmt(item) -> str:
+            card_id, (played, rate) = item
+            return f"  {names.get(card_id, card_id)}: {rate:.1%} over {played:,} rounds"
+
+        lines = [
+            f"Battles: {self.battles:,} ({self.unfinished:,} unfinished)",
+            f"Mean rounds per battle: {self.mean_rounds:.2f}",
+            f"Mean stat rolls per battle: {self.mean_stat_rolls:.2f}",
+            "Strongest cards:",
+            *[fmt(item) for item in ranked[:top]],
+            "Weakest cards:",
+            *[fmt(item) for item in ranked[-top:]],
+        ]
+        return "\n".join(lines)
+
+################################################################################
+class BattleSimulator:
+    """Monte Carlo balance simulation over a card pool, following
+    `BattleEngine`'s rules.
+
+    Stat duels are solved exactly: every 0-999 roll is evaluated for every
+    pair of cards at once, giving each pair's best-of-three win probability
+    and expected number of rolls. Whole battles are then simulated in
+    vectorised batches, with die rolls, nearest-marker matching and
+    same-card re-rolls played out, and each duel resolved from the table.
+    Players pick uniformly among their matching cards."""
+
+    __slots__ = (
+        "_cards",
+        "_rng",
+        "_duel_p",
+        "_duel_rolls",
+    )
+
+    DECK_SIZE = 6
+    BATCH_SIZE = 100_000
+    # Bounds the (cards x cards x rolls) scratch arrays to roughly this many
+    # elements while solving duels.
+    DUEL_CHUNK_ELEMENTS = 20_000_000
+
+################################################################################
+    def __init__(self, cards: Sequence[BattleCard], seed: Optional[int] = None) -> None:
+
+        if np is None:
+            raise RuntimeError("Battle simulations require NumPy to be installed.")
+
+        self._cards: Tuple[BattleCard, ...] = tuple(c for c in cards if c.is_complete)
+        if len(self._cards) < self.DECK_SIZE:
+            raise ValueError(
+                f"At least {self.DECK_SIZE} cards with complete stats are "
+                f"needed to simulate battles, found {len(self._cards)}."
+            )
+
+        self._rng = np.random.default_rng(seed)
+        self._duel_p, self._duel_rolls = self._solve_duels()
+
+################################################################################
+    @classmethod
+    def from_cards(cls, cards: Sequence[TradingCard], seed: Optional[int] = None) -> BattleSimulator:
+
+        return cls([BattleCard.from_card(c) for c in cards], seed)
+
+################################################################################
+    @classmethod
+    def from_card_manager(cls, mgr: CardManager, seed: Optional[int] = None) -> BattleSimulator:
+
+        return cls.from_cards(mgr.all_cards, seed)
+
+################################################################################
+    @property
+    def cards(self) -> Tuple[BattleCard, ...]:
+
+        return self._cards
+
+################################################################################
+    @property
+    def duel_matrix(self):
+        """``[i, j]`` is the chance card ``i`` beats card ``j`` in a duel."""
+
+        return self._duel_p
+
+################################################################################
+    def _solve_duels(self):
+
+        n = len(self._cards)
+        rolls = np.arange(BattleEngine.ROLL_RANGE)
+        places = np.array([100, 10, 1])
+
+        roll_digits = (rolls[:, None] // places) % 10
+        bad_digits = (np.array([c.bad for c in self._cards])[:, None] // places) % 10
+        # (cards, rolls): whether the card's BAD stat matches the roll.
+        bad_hit = (bad_digits[:, None, :] == roll_digits[None, :, :]).any(axis=2)
+
+        stats = np.array([[c.stat(s) for s in BattleEngine.STATS] for c in self._cards])
+        # (cards, stats, rolls)
+        dist = np.abs(stats[:, :, None] - rolls[None, None, :])
+
+        wins1 = np.zeros((len(BattleEngine.STATS), n, n))
+        wins2 = np.zeros((len(BattleEngine.STATS), n, n))
+
+        chunk = max(1, self.DUEL_CHUNK_ELEMENTS // (n * BattleEngine.ROLL_RANGE))
+        for start in range(0, n, chunk):
+            rows = slice(start, start + chunk)
+            hit1 = bad_hit[rows, None, :]
+            hit2 = bad_hit[None, :, :]
+            clean = ~hit1 & ~hit2
+            for s in range(len(BattleEngine.STATS)):
+                d1 = dist[rows, None, s, :]
+                d2 = dist[None, :, s, :]
+                wins1[s, rows] = ((~hit1 & hit2) | (clean & (d1 < d2))).sum(axis=2)
+                wins2[s, rows] = ((hit1 & ~hit2) | (clean & (d2 < d1))).sum(axis=2)
+
+        decisive = wins1 + wins2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # A pair that can never be separated would re-roll forever live;
+            # call it even and cap its roll count at a full sweep.
+            p = np.where(decisive > 0, wins1 / decisive, 0.5)
+            expected_rolls = np.where(decisive > 0, BattleEngine.ROLL_RANGE / decisive, BattleEngine.ROLL_RANGE)
+
+        a, b, c = p
+        duel_p = a * b + (a * (1 - b) + (1 - a) * b) * c
+        split = a * (1 - b) + (1 - a) * b
+        duel_rolls = expected_rolls[0] + expected_rolls[1] + split * expected_rolls[2]
+
+        return duel_p, duel_rolls
+
+################################################################################
+    def _random_decks(self, count: int):
+
+        keys = self._rng.random((count, len(self._cards)))
+        return np.argpartition(keys, self.DECK_SIZE, axis=1)[:, :self.DECK_SIZE]
+
+################################################################################
+    def _pick(self, markers, available, roll):
+        """Returns each battle's chosen deck slot, and whether it had any
+        playable card, picking uniformly among the nearest die markers."""
+
+        dist = np.abs(markers - roll[:, None]).astype(float)
+        dist[~available] = np.inf
+        nearest = dist.min(axis=1)
+
+        keys = self._rng.random(dist.shape)
+        keys[dist != nearest[:, None]] = -1.0
+
+        return keys.argmax(axis=1), np.isfinite(nearest)
+
+################################################################################
+    def run(self, battles: int = 1_000_000) -> SimulationReport:
+
+        n = len(self._cards)
+        markers = np.array([c.die for c in self._cards])
+
+        played = np.zeros(n, dtype=np.int64)
+        won = np.zeros(n, dtype=np.int64)
+        total_rounds = 0
+        total_rolls = 0.0
+        unfinished = 0
+
+        for start in range(0, battles, self.BATCH_SIZE):
+            size = min(self.BATCH_SIZE, battles - start)
+
+            decks = (self._random_decks(size), self._random_decks(size))
+            deck_markers = (markers[decks[0]], markers[decks[1]])
+            available = (np.ones((size, self.DECK_SIZE), bool), np.ones((size, self.DECK_SIZE), bool))
+            wins = np.zeros((size, 2), dtype=np.int64)
+            active = np.ones(size, bool)
+
+            while active.any():
+                pending = np.flatnonzero(active)
+                slots = (np.zeros(size, np.int64), np.zeros(size, np.int64))
+
+                for _ in range(BattleEngine.MAX_PICK_ATTEMPTS):
+                    roll = self._rng.integers(1, BattleEngine.DIE_FACES + 1, size=pending.size)
+                    slot1, ok1 = self._pick(deck_markers[0][pending], available[0][pending], roll)
+                    slot2, ok2 = self._pick(deck_markers[1][pending], available[1][pending], roll)
+
+                    # Battles where a deck has nothing left to play end here.
+                    stuck = ~(ok1 & ok2)
+                    active[pending[stuck]] = False
+                    unfinished += int(stuck.sum())
+
+                    same = decks[0][pending, slot1] == decks[1][pending, slot2]
+                    done = ~stuck & ~same
+                    slots[0][pending[done]] = slot1[done]
+                    slots[1][pending[done]] = slot2[done]
+
+                    pending = pending[~stuck & same]
+                    if not pending.size:
+                        break
+                else:
+                    active[pending] = False
+                    unfinished += pending.size
+
+                idx = np.flatnonzero(active)
+                if not idx.size:
+                    break
+
+                card1 = decks[0][idx, slots[0][idx]]
+                card2 = decks[1][idx, slots[1][idx]]
+                p1_won = self._rng.random(idx.size) < self._duel_p[card1, card2]
+
+                wins[idx, 0] += p1_won
+                wins[idx, 1] += ~p1_won
+                available[0][idx, slots[0][idx]] = False
+                available[1][idx, slots[1][idx]] = False
+
+                np.add.at(played, card1, 1)
+                np.add.at(played, card2, 1)
+                np.add.at(won, card1[p1_won], 1)
+                np.add.at(won, card2[~p1_won], 1)
+                total_rounds += idx.size
+                total_rolls += float(self._duel_rolls[card1, card2].sum())
+
+                active[idx] = wins[idx].max(axis=1) < BattleEngine.ROUNDS_TO_WIN
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = np.where(played > 0, won / played, 0.0)
+
+        return SimulationReport(
+            battles=battles,
+            unfinished=unfinished,
+            mean_rounds=total_rounds / battles if battles else 0.0,
+            mean_stat_rolls=total_rolls / battles if battles else 0.0,
+            card_stats={
+                card.id: (int(played[i]), float(rates[i]))
+                for i, card in enumerate(self._cards)
+            },
+        )
+
+################################################################################
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import random
-from typing import TYPE_CHECKING, Type, TypeVar, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Type, TypeVar, Any, Dict, List, Optional, Set, Tuple
 
 from discord import Embed, EmbedField, Interaction, SelectOption
 
@@ -28,8 +28,11 @@ class BoosterCardConfig:
         "_order",
         "_weights",
         "_always_new",
+        "_sampler",
     )
     
+    MAX_REJECTIONS = 32
+    
 ################################################################################
     def __init__(self, parent: BoosterPackConfig, _id: str, order: int, **kwargs) -> None:
 
@@ -39,6 +42,8 @@ class BoosterCardConfig:
 
         self._weights: List[RarityWeight] = kwargs.get("weights", [])
         self._always_new: bool = kwargs.get("always_new", False)
+        
+        self._sampler: Optional[Tuple[Any, List[TradingCard], List[int]]] = None
     
 ################################################################################
     @classmethod
@@ -63,6 +68,7 @@ class BoosterCardConfig:
         
         self._weights = [RarityWeight.load(self, d) for d in data["weights"]]
         self._always_new = config[3]
+        self._sampler = None
         
         return self
     
@@ -270,32 +276,69 @@ class BoosterCardConfig:
         self.delete()
         
 ################################################################################
-    def get_random_card(self, coll: CardCollection) -> Optional[TradingCard]:
+    def _get_sampler(self) -> Tuple[List[TradingCard], List[int]]:
+        """Returns the cards this slot can draw and their cumulative weights.
+        Rebuilt only when the card pool or this slot's weights change."""
         
-        allowed_rarities = [w.rarity for w in self.weights]
-        allowed = [c for c in self.card_manager.all_cards if c.rarity in allowed_rarities]
-        if not allowed:
+        key = (
+            self.card_manager.version,
+            tuple((w.rarity, w.weight) for w in self._weights)
+        )
+        if self._sampler is None or self._sampler[0] != key:
+            rarity_weights = {w.rarity: w.weight for w in self._weights}
+            cards = []
+            cum_weights = []
+            total = 0
+            
+            for card in self.card_manager.all_cards:
+                weight = rarity_weights.get(card.rarity)
+                if weight is None:
+                    continue
+                total += weight
+                cards.append(card)
+                cum_weights.append(total)
+                
+            self._sampler = (key, cards, cum_weights)
+            
+        return self._sampler[1], self._sampler[2]
+    
+################################################################################
+    def get_random_card(
+        self, 
+        coll: CardCollection, 
+        exclude: Optional[Set[TradingCard]] = None
+    ) -> Optional[TradingCard]:
+        
+        cards, cum_weights = self._get_sampler()
+        if not cards:
             return
         
-        if self.always_new:
-            final_cards = [c for c in allowed if c not in coll]
-        else:
-            final_cards = allowed
+        if not self.always_new:
+            return random.choices(cards, cum_weights=cum_weights, k=1)[0]
+        
+        # Rejection sampling keeps the weighted distribution over unowned
+        # cards without rebuilding a candidate list. It only runs out of
+        # tries when the user owns almost every eligible card.
+        exclude = exclude or set()
+        for card in random.choices(cards, cum_weights=cum_weights, k=self.MAX_REJECTIONS):
+            if card not in coll and card not in exclude:
+                return card
+            
+        final_cards = []
+        weights = []
+        prev = 0
+        for card, cum_weight in zip(cards, cum_weights):
+            if card not in coll and card not in exclude:
+                final_cards.append(card)
+                weights.append(cum_weight - prev)
+            prev = cum_weight
             
         # If there are no cards to choose from, most likely meaning the user already 
         # owns all the available cards, then return a random card from the allowed list
         if not final_cards:
-            return random.choice(allowed)
-
-        rarity_weights = {w.rarity: w.weight for w in self.weights}
-        cards = []
-        weights = []
-    
-        for card in final_cards:
-            cards.append(card)
-            weights.append(rarity_weights[card.rarity])
+            return random.choice(cards)
     
-        return random.choices(cards, weights=weights, k=1)[0]
+        return random.choices(final_cards, weights=weights, k=1)[0]
     
 ################################################################################
     def get_weight(self, rarity: CardRarity) -> int:
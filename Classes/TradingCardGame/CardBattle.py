@@ -1,22 +1,22 @@
 from __future__ import annotations
 
 import asyncio
-import os
 import random
+import time
 from datetime import datetime, UTC
 from io import BytesIO
-from typing import TYPE_CHECKING, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, TypeVar
 from uuid import uuid4
 
-import requests
-from PIL import Image, UnidentifiedImageError
-from discord import Thread, File, Interaction
+from PIL import UnidentifiedImageError
+from discord import Thread, Interaction
 
 from Assets import BotImages
 from Errors import PermalinkFailed
 from UI.Common import FroggeSelectView
 from UI.TradingCardGame import CardBattleRollView
-from Utilities import Utilities as U, FroggeColor
+from Utilities import Utilities as U, FroggeColor, log
+from .BattleLog import BattleLog
 
 if TYPE_CHECKING:
     from Classes import BattleManager, Challenge, TCGPlayer, CardDeck, TradingCard, DeckCardSlot
@@ -24,6 +24,8 @@ if TYPE_CHECKING:
 
 __all__ = ("CardBattle", )
 
+CB = TypeVar("CB", bound="CardBattle")
+
 ################################################################################
 class CardBattle:
 
@@ -34,6 +36,12 @@ class CardBattle:
         "_p2",
         "_thread",
         "_last_ts",
+        "_versus",
+        "_prerender",
+        "_log",
+        "_round",
+        "_wins",
+        "_resumed",
     )
 
     P1_COLOR = FroggeColor(0x00FF00)
@@ -56,23 +64,89 @@ class CardBattle:
         self._thread: Thread = challenge.thread
         self._last_ts: datetime = datetime.now(UTC)
         
-        # We can delete the challenge now
-        try:
-            self._mgr.challenges.remove(challenge)
-        except ValueError:
-            pass
+        # Versus composites for every (p1 card, p2 card) pair, keyed by
+        # card ids and rendered in the background while players choose.
+        self._versus: Dict[Tuple[str, str], bytes] = {}
+        self._prerender: Optional[asyncio.Task] = None
+        
+        self._log: BattleLog = BattleLog(self._thread, mgr.pacing)
+        
+        self._round: int = 1
+        self._wins: Dict[str, int] = {"Player 1": 0, "Player 2": 0}
+        self._resumed: bool = False
+    
+################################################################################
+    @classmethod
+    def resume(
+        cls: Type[CB],
+        mgr: BattleManager,
+        data: Tuple[Any, ...],
+        p1: TCGPlayer,
+        p2: TCGPlayer,
+        thread: Thread
+    ) -> CB:
+        """Rebuilds a battle from its `tcg_battles` checkpoint row. The
+        players' decks must already be set."""
+        
+        self: CB = cls.__new__(cls)
+        
+        self._id = data[0]
+        self._mgr = mgr
+        
+        self._p1 = p1
+        self._p2 = p2
+        
+        self._thread = thread
+        self._last_ts = datetime.now(UTC)
+        
+        self._versus = {}
+        self._prerender = None
+        
+        self._log = BattleLog(self._thread, mgr.pacing)
+        
+        self._round = data[7]
+        self._wins = {"Player 1": data[8], "Player 2": data[9]}
+        self._resumed = True
+        
+        self.p1_deck.overrides = data[10] or []
+        self.p2_deck.overrides = data[11] or []
+        
+        return self
     
 ################################################################################
     def __eq__(self, other: CardBattle) -> bool:
 
         return self._id == other._id
 
+################################################################################
+    @property
+    def id(self) -> str:
+        
+        return self._id
+    
+################################################################################
+    @property
+    def guild_id(self) -> int:
+        
+        return self._mgr.guild_id
+    
 ################################################################################
     @property
     def channel(self) -> Thread:
         
         return self._thread
     
+################################################################################
+    @property
+    def p1(self) -> TCGPlayer:
+        
+        return self._p1
+    
+    @property
+    def p2(self) -> TCGPlayer:
+        
+        return self._p2
+    
 ################################################################################
     @property
     def p1_deck(self) -> CardDeck:
@@ -85,54 +159,117 @@ class CardBattle:
         return self._p2.current_deck
     
 ################################################################################
-    @staticmethod
-    async def wait_for(seconds: int) -> None:
-
-        await asyncio.sleep(seconds)
-
+    @property
+    def round(self) -> int:
+        
+        return self._round
+    
 ################################################################################
-    async def start(self) -> None:
-
-        win_counts = {"Player 1": 0, "Player 2": 0}
-        round_idx = 1
-
-        prompt = U.make_embed(
+    @property
+    def wins(self) -> Tuple[int, int]:
+        
+        return self._wins["Player 1"], self._wins["Player 2"]
+    
+################################################################################
+    def checkpoint(self) -> None:
+        """Saves the battle's progress so it can be resumed after a restart."""
+        
+        self._mgr.bot.database.update.battle_checkpoint(self)
+        
+################################################################################
+    async def close(self) -> None:
+        """Releases everything the battle holds once it's over, however it
+        ended, and forgets its checkpoint."""
+        
+        self._mgr.bot.database.delete.battle_checkpoint(self._id)
+        await self.release()
+        
+################################################################################
+    async def release(self) -> None:
+        """Stops the pre-render and clears the cards marked as played from
+        both decks. The checkpoint is left alone."""
+        
+        if self._prerender is not None:
+            self._prerender.cancel()
+        
+        for deck in (self.p1_deck, self.p2_deck):
+            if deck is not None:
+                await deck.reset_overrides()
+        
+################################################################################
+    async def abandon(self) -> None:
+        
+        self._log.post(U.make_embed(
             color=self.SYSTEM_COLOR,
-            title="__Trading Card Battle__",
+            title="__Battle Abandoned__",
             description=(
-                f"**Player 1:** {self._p1.user.mention}\n"
-                f"**Player 2:** {self._p2.user.mention}\n\n"
-                
-                "The battle will be a best of 3 rounds. Each round, players "
-                "will roll a 6-sided die to determine the card they can play. "
-                "The card with the best stats wins the round. The first "
-                "player to win 3 rounds wins the battle!\n\n"
-                
-                "The battle will begin shortly..."
+                "This battle has gone too long without finishing and has been "
+                "called off."
             )
-        )
-        await self.channel.send(embed=prompt)
-        await self.wait_for(3)
+        ))
+        await self._log.flush()
+        await self.channel.archive()
+    
+################################################################################
+    async def start(self) -> None:
+        
+        started_at = time.perf_counter()
+        try:
+            await self._play()
+        finally:
+            await self._log.flush()
+            log.info(
+                self._mgr.guild,
+                f"Battle {self._id} ended after {time.perf_counter() - started_at:.0f}s "
+                f"and {self._log.requests} messages sent or edited."
+            )
+
+################################################################################
+    async def _play(self) -> None:
 
-        while max(win_counts.values()) < 3:
-            round_name, image = self.get_round_info(round_idx)
-            await self.channel.send(embed=U.make_embed(color=self.SYSTEM_COLOR, image_url=image))
-            await self.wait_for(3)
+        self._prerender = asyncio.create_task(self._prerender_versus())
+
+        if self._resumed:
+            self._log.post(U.make_embed(
+                color=self.SYSTEM_COLOR,
+                title="__Battle Resumed__",
+                description=(
+                    f"Picking up where we left off: round {self._round}, "
+                    f"`{self._p1.user.display_name}` {self._wins['Player 1']} - "
+                    f"{self._wins['Player 2']} `{self._p2.user.display_name}`."
+                )
+            ))
+            await self._log.pause(3)
+        else:
+            await self._introduce()
+
+        while max(self._wins.values()) < 3:
+            await self._log.new_section()
+            round_name, image = self.get_round_info(self._round)
+            self._log.post(U.make_embed(color=self.SYSTEM_COLOR, image_url=image))
+            await self._log.pause(3)
 
             while True:
-                roller = self._p1 if round_idx % 2 == 1 else self._p2
+                roller = self._p1 if self._round % 2 == 1 else self._p2
                 roll = await self.random_roll(1, 6, roller)
-                if not roll:
+                if roll is None:
                     return
 
-                await self.channel.send(embed=U.make_embed(
+                self._log.post(U.make_embed(
                     image_url=self._select_die_image(roll),
                     color=self.SYSTEM_COLOR
                 ))
-                await self.wait_for(2)
+                await self._log.pause(2)
     
                 p1_matching_cards = await self.get_matching_cards(self.p1_deck, roll, self._p1.user.display_name)
                 p2_matching_cards = await self.get_matching_cards(self.p2_deck, roll, self._p2.user.display_name)
+                if not p1_matching_cards or not p2_matching_cards:
+                    self._log.post(U.make_embed(
+                        color=self.SYSTEM_COLOR,
+                        title="__Out of Cards__",
+                        description="A deck has no cards left to play, so the battle can't continue."
+                    ))
+                    return
     
                 p1_selected_card = await self.select_card(self._p1.user, p1_matching_cards, self.p1_deck)
                 if p1_selected_card is None:
@@ -154,31 +291,38 @@ class CardBattle:
                         "**Please roll again and select different cards.**"
                     )
                 )
-                await self.channel.send(embed=prompt)
-                await self.wait_for(2)
+                self._log.post(prompt)
+                await self._log.pause(2)
                 
+            selected_at = time.perf_counter()
             versus_url = await self.draw_versus(self.channel, p1_selected_card, p2_selected_card)
-            await self.channel.send(embed=U.make_embed(color=self.SYSTEM_COLOR, image_url=versus_url))
+            self._log.post(U.make_embed(color=self.SYSTEM_COLOR, image_url=versus_url))
+            await self._log.flush()
+            log.info(
+                self._mgr.guild,
+                f"Versus image for battle {self._id} shown "
+                f"{time.perf_counter() - selected_at:.2f}s after selection."
+            )
 
-            await self.wait_for(5)
+            await self._log.pause(5)
 
             winner = await self.best_of_three(p1_selected_card, p2_selected_card)
             if winner == "None":
                 return
             elif winner == "tie":
-                await self.channel.send(embed=U.make_embed(
+                self._log.post(U.make_embed(
                     color=self.SYSTEM_COLOR,
                     title="__Tie Breaker__",
                     description="It's a tie! Replaying the round..."
                 ))
             else:
-                win_counts[winner] += 1
+                self._wins[winner] += 1
                 winner_name = (
                     self._p1.user.display_name
                     if winner == "Player 1"
                     else self._p2.user.display_name
                 )
-                await self.channel.send(embed=U.make_embed(
+                self._log.post(U.make_embed(
                     color=(
                         self.P1_COLOR
                         if winner == "Player 1"
@@ -190,10 +334,32 @@ class CardBattle:
 
             self.p1_deck.add_override(p1_selected_card)
             self.p2_deck.add_override(p2_selected_card)
-            round_idx += 1
+            self._round += 1
+            self.checkpoint()
 
-        await self._announce_winner(win_counts)
+        await self._announce_winner(self._wins)
+                
+################################################################################
+    async def _introduce(self) -> None:
+
+        prompt = U.make_embed(
+            color=self.SYSTEM_COLOR,
+            title="__Trading Card Battle__",
+            description=(
+                f"**Player 1:** {self._p1.user.mention}\n"
+                f"**Player 2:** {self._p2.user.mention}\n\n"
                 
+                "The battle will be a best of 3 rounds. Each round, players "
+                "will roll a 6-sided die to determine the card they can play. "
+                "The card with the best stats wins the round. The first "
+                "player to win 3 rounds wins the battle!\n\n"
+
+                "The battle will begin shortly..."
+            )
+        )
+        self._log.post(prompt)
+        await self._log.pause(3)
+
 ################################################################################
     async def random_roll(self, low: int, high: int, roller: TCGPlayer) -> Optional[int]:
         
@@ -210,7 +376,7 @@ class CardBattle:
                 f"`{roller.user.display_name}`, please roll a {high}-sided dice!"
             )
         )
-        await self.channel.send(embed=prompt, view=view)
+        await self._log.prompt(prompt, view)
         await view.wait()
         
         if not view.complete:
@@ -221,10 +387,12 @@ class CardBattle:
 ################################################################################
     async def get_matching_cards(self, deck: CardDeck, roll: int, player_name: str) -> List[DeckCardSlot]:
 
-        matching_cards = deck.get_die_marker_matching(roll)
-        addl = 1
-
-        while not matching_cards:
+        matching_cards = deck.get_nearest_available(roll)
+        if not matching_cards:
+            return matching_cards
+        
+        spread = abs(matching_cards[0].card.die_marker - roll)
+        if spread:
             prompt = U.make_embed(
                 color=(
                     self.P1_COLOR
@@ -234,13 +402,10 @@ class CardBattle:
                 title="__No Matching Cards__",
                 description=(
                     f"{player_name} has no cards matching the roll of `{roll}`.\n\n"
-                    f"Expanding search to an additional span of +/-{addl}."
+                    f"Expanding search to an additional span of +/-{spread}."
                 )
             )
-            await self.channel.send(embed=prompt)
-            matching_cards.extend(deck.get_die_marker_matching(roll - addl))
-            matching_cards.extend(deck.get_die_marker_matching(roll + addl))
-            addl += 1
+            self._log.post(prompt)
 
         return matching_cards
 
@@ -266,7 +431,7 @@ class CardBattle:
         )
         view = FroggeSelectView(user, [c.card.select_option() for c in matching_cards])
 
-        await self.channel.send(embed=prompt, view=view)
+        await self._log.prompt(prompt, view)
         await view.wait()
 
         return player_deck.get_card_by_id(view.value)
@@ -285,9 +450,9 @@ class CardBattle:
             description=f"**`{roller.user.display_name}`** will roll first!",
             thumbnail_url=roller.user.display_avatar.url
         )
-        await self.channel.send(embed=prompt)
+        self._log.post(prompt)
 
-        await self.wait_for(2)
+        await self._log.pause(2)
 
         for stat in round_stats:
             prompt = U.make_embed(
@@ -296,34 +461,35 @@ class CardBattle:
                 description=f"Comparing `{stat}` stats!",
                 image_url=self.get_stat_image(stat)
             )
-            await self.channel.send(embed=prompt)
-            await self.wait_for(2)
+            self._log.post(prompt)
+            await self._log.pause(2)
 
             while True:
+                # 0 is a legitimate roll; only None means the roll was abandoned.
                 roll_result = await self.random_roll(0, 999, roller)
-                if not roll_result:
+                if roll_result is None:
                     return "None"
 
-                await self.channel.send(embed=U.make_embed(
+                self._log.post(U.make_embed(
                     color=player_color,
                     description=(
                         f"{roller.user.display_name} rolled a __**`{roll_result}`**__!"
                     )
                 ))
-                await self.wait_for(2)
+                await self._log.pause(2)
 
                 p1_bad_flag, p2_bad_flag = await self.compare_bad_stats(p1_card, p2_card, roll_result)
-                await self.wait_for(2)
+                await self._log.pause(2)
 
                 if p1_bad_flag and p2_bad_flag:
-                    await self.channel.send(embed=U.make_embed(
+                    self._log.post(U.make_embed(
                         color=self.SYSTEM_COLOR,
                         title="__Tie Breaker__",
                         description=(
                             "Both players `BAD` stat matched! A tie! Rerolling..."
                         )
                     ))
-                    await self.wait_for(2)
+                    await self._log.pause(2)
                 elif p1_bad_flag:
                     p2_wins += 1
                     break
@@ -342,8 +508,8 @@ class CardBattle:
                     if p2_absolute_value < p1_absolute_value:
                         description += " *(WINNER)*"
 
-                    await self.channel.send(embed=U.make_embed(color=self.SYSTEM_COLOR, description=description))
-                    await self.wait_for(1)
+                    self._log.post(U.make_embed(color=self.SYSTEM_COLOR, description=description))
+                    await self._log.pause(1)
 
                     if p1_absolute_value < p2_absolute_value:
                         p1_wins += 1
@@ -359,8 +525,8 @@ class CardBattle:
                                 "Both players have the same absolute value! Re-rolling..."
                             )
                         )
-                        await self.channel.send(embed=prompt)
-                        await self.wait_for(3)
+                        self._log.post(prompt)
+                        await self._log.pause(3)
 
             if p1_wins == 2 or p2_wins == 2:
                 break
@@ -368,7 +534,7 @@ class CardBattle:
             roller = self._p1 if roller == self._p2 else self._p2
             player_color = self.P1_COLOR if roller == self._p1 else self.P2_COLOR
 
-            await self.wait_for(2)
+            await self._log.pause(2)
 
         if p1_wins > p2_wins:
             return "Player 1"
@@ -413,7 +579,7 @@ class CardBattle:
                     f"Player 1 `BAD` stat MATCHED {p1_bad_str}! They Lose!"
                 )
             )
-            await self.channel.send(embed=prompt)
+            self._log.post(prompt)
             p1_bad_flag = True
         if p2_result := p2_card.compare_bad(roll_result):
             p2_bad_list = p2_card.int_to_list(p2_card.bad)
@@ -431,7 +597,7 @@ class CardBattle:
                     f"Player 2 `BAD` stat MATCHED {p2_bad_str}! They Lose!"
                 )
             )
-            await self.channel.send(embed=prompt)
+            self._log.post(prompt)
             p2_bad_flag = True
 
         return p1_bad_flag, p2_bad_flag
@@ -456,14 +622,10 @@ class CardBattle:
             thumbnail_url=winner.user.avatar.url if winner else None,
             image_url=BotImages.Winner
         )
-        await self.channel.send(embed=prompt)
+        self._log.post(prompt)
+        await self._log.flush()
         await self.channel.archive()
 
-        self._mgr._battles.remove(self)
-
-        await self._p1.current_deck.reset_overrides()
-        await self._p2.current_deck.reset_overrides()
-
 ################################################################################
     @staticmethod
     def get_round_info(round_idx: int) -> Tuple[str, str]:
@@ -483,57 +645,55 @@ class CardBattle:
                 raise ValueError(f"Invalid round index: {round_idx}")
             
 ################################################################################
-    async def draw_versus(self, channel: Thread, card1: TradingCard, card2: TradingCard) -> str:
-
-        slot_width = 150
-        slot_height = 210
-
-        overlay = Image.open("Assets/Versus.png")
-        canvas_width = overlay.width
-        canvas_height = overlay.height
+    async def _prerender_versus(self) -> None:
+        """Composites every possible versus image for the two decks so the
+        one that's needed is ready by the time both players have chosen.
+        Pairs whose art fails to load are skipped and rendered live, which
+        also reports the failure."""
         
-        # (Padding of 10 hardcoded in)
-        card1_loc = (0, 10)
-        card2_loc = (canvas_width - slot_width, 10)
+        renderer = self._mgr.bot.card_renderer
+        p1_cards = [slot.card for slot in self.p1_deck._cards]
+        p2_cards = [slot.card for slot in self.p2_deck._cards]
         
-        canvas = Image.new('RGBA', (canvas_width, canvas_height), (255, 255, 255, 0))  # Transparent background
-        
-        # Draw the player 1 card
         try:
-            card1_image = Image.open(BytesIO(requests.get(card1.permalink).content))
-        except UnidentifiedImageError:
-            card1.permalink = None
-            await channel.send(embed=PermalinkFailed(card1.name))
-        else:
-            card1_image = card1_image.resize((slot_width, slot_height))
-            canvas.paste(card1_image, card1_loc, card1_image)
+            thumbs = await renderer.get_thumbnails(
+                [c.permalink for c in p1_cards] + [c.permalink for c in p2_cards]
+            )
+            p1_thumbs = thumbs[:len(p1_cards)]
+            p2_thumbs = thumbs[len(p1_cards):]
             
-        # Draw the player 2 card
-        try:
-            card2_image = Image.open(BytesIO(requests.get(card2.permalink).content))
-        except UnidentifiedImageError:
-            card2.permalink = None
-            await channel.send(embed=PermalinkFailed(card2.name))
-        else:
-            card2_image = card2_image.resize((slot_width, slot_height))
-            canvas.paste(card2_image, card2_loc, card2_image)
+            for card1, thumb1 in zip(p1_cards, p1_thumbs):
+                for card2, thumb2 in zip(p2_cards, p2_thumbs):
+                    if card1 == card2:
+                        continue
+                    if isinstance(thumb1, Exception) or isinstance(thumb2, Exception):
+                        continue
+                    buffer = await renderer.render_versus(thumb1, thumb2)
+                    self._versus[(card1.id, card2.id)] = buffer.getvalue()
+        except Exception as ex:
+            log.debug(self._mgr.guild, f"Versus pre-render for battle {self._id} stopped: {ex!r}")
             
-        # Draw the overlay
-        overlay = Image.open("Assets/Versus.png")
-        canvas.paste(overlay, (0, 0), overlay)
-
-        filepath = f"Files/Versus-{self._id}.png"
-        canvas.save(filepath)
-
-        file = File(filepath)
-        dump = await self._mgr.bot._img_dump.send(file=file)
-
-        try:
-            os.remove(filepath)
-        except FileNotFoundError:
-            pass
+################################################################################
+    async def draw_versus(self, channel: Thread, card1: TradingCard, card2: TradingCard) -> str:
 
-        return dump.attachments[0].url
+        renderer = self._mgr.bot.card_renderer
+        
+        rendered = self._versus.get((card1.id, card2.id))
+        if rendered is not None:
+            return await renderer.upload(BytesIO(rendered), f"Versus-{self._id}.png")
+        
+        thumbs = await renderer.get_thumbnails([card1.permalink, card2.permalink])
+        
+        for i, card in enumerate((card1, card2)):
+            if isinstance(thumbs[i], UnidentifiedImageError):
+                card.permalink = None
+                await channel.send(embed=PermalinkFailed(card.name))
+                thumbs[i] = None
+            elif isinstance(thumbs[i], Exception):
+                raise thumbs[i]
+            
+        buffer = await renderer.render_versus(thumbs[0], thumbs[1])
+        return await renderer.upload(buffer, f"Versus-{self._id}.png")
 
 ################################################################################
     @staticmethod
@@ -6,6 +6,7 @@ from discord import User, Embed, EmbedField, Interaction, SelectOption
 from Enums import CardRarity
 from discord.ext.pages import Page
 from Assets import BotEmojis, BotImages
+from Classes.Core.LazyUser import LazyUser
 from .CardCount import CardCount
 from .DeckManager import DeckManager
 from UI.Common import FroggeSelectView, Frogginator, CloseMessageView
@@ -30,6 +31,11 @@ class CardCollection:
         "_cards",
         "_boosters",
         "_deck_mgr",
+        "_by_card",
+        "_by_series",
+        "_by_rarity",
+        "_rarity_version",
+        "_total",
     )
     
 ################################################################################
@@ -37,7 +43,7 @@ class CardCollection:
         self,
         mgr: CollectionManager,
         _id: str,
-        user: User, 
+        user: LazyUser, 
         cards: Optional[List[CardCount]] = None,
         boosters: Optional[int] = None,
         deck_mgr: Optional[DeckManager] = None
@@ -46,22 +52,24 @@ class CardCollection:
         self._id: str = _id
         self._mgr: CollectionManager = mgr
         
-        self._user: User = user
+        self._user: LazyUser = user
         self._cards: List[CardCount] = cards or []
         self._deck_mgr: DeckManager = deck_mgr or DeckManager(self)
         
         self._boosters: int = boosters or 0
+        
+        self._build_indexes()
     
 ################################################################################
     @classmethod
     def new(cls: Type[CC], mgr: CollectionManager, user: User) -> CC:
         
         new_id = mgr.bot.database.insert.card_collection(mgr.guild_id, user.id)
-        return cls(mgr, new_id, user)
+        return cls(mgr, new_id, LazyUser.from_user(mgr.guild, user))
     
 ################################################################################
     @classmethod
-    async def load(cls: Type[CC], mgr: CollectionManager, data: Dict[str, Any]) -> CC:
+    def load(cls: Type[CC], mgr: CollectionManager, data: Dict[str, Any]) -> CC:
         
         cdata = data["collection"]
         
@@ -70,28 +78,82 @@ class CardCollection:
         self._id = cdata[0]
         self._mgr = mgr
         
-        self._user = await mgr.guild.get_or_fetch_member_or_user(data["collection"][2])
+        self._user = LazyUser(mgr.guild, cdata[2])
         self._cards = [CardCount.load(self, d) for d in data["cards"]]
         self._deck_mgr = DeckManager.load(self, data["decks"])
         
         self._boosters = cdata[3]
         
+        self._build_indexes()
+        
         return self
     
+################################################################################
+    def _build_indexes(self) -> None:
+        
+        self._by_card: Dict[str, CardCount] = {}
+        # Buckets are keyed by count ID, so a count can be dropped from them
+        # directly.
+        self._by_series: Dict[str, Dict[str, CardCount]] = {}
+        self._by_rarity: Dict[CardRarity, Dict[str, CardCount]] = {}
+        self._rarity_version: int = self.card_manager.version
+        self._total: int = 0
+        
+        for count_obj in self._cards:
+            self._index(count_obj)
+            
+################################################################################
+    def _index(self, count_obj: CardCount) -> None:
+        
+        self._by_card[count_obj.card.id] = count_obj
+        self._by_series.setdefault(count_obj.card.series.id, {})[count_obj.id] = count_obj
+        self._by_rarity.setdefault(count_obj.card.rarity, {})[count_obj.id] = count_obj
+        self._total += count_obj.quantity
+        
+################################################################################
+    def _remove_count(self, count_obj: CardCount) -> None:
+        
+        if self._by_card.get(count_obj.card.id) is not count_obj:
+            return
+        
+        self._cards.remove(count_obj)
+        
+        del self._by_card[count_obj.card.id]
+        self._by_series.get(count_obj.card.series.id, {}).pop(count_obj.id, None)
+        # The rarity buckets may be out of date if the card's rarity was just
+        # edited; `_rarity_index()` regroups them before they're read again.
+        self._by_rarity.get(count_obj.card.rarity, {}).pop(count_obj.id, None)
+        self._total -= count_obj.quantity
+        
+################################################################################
+    def _rarity_index(self) -> Dict[CardRarity, Dict[str, CardCount]]:
+        """Owned counts grouped by rarity. Regrouped whenever the card
+        manager reports a change, since a card's rarity can be edited after
+        it's been collected."""
+        
+        version = self.card_manager.version
+        if self._rarity_version != version:
+            self._by_rarity = {}
+            for count_obj in self._cards:
+                self._by_rarity.setdefault(count_obj.card.rarity, {})[count_obj.id] = count_obj
+            self._rarity_version = version
+            
+        return self._by_rarity
+    
 ################################################################################
     def __getitem__(self, card: TradingCard) -> Optional[CardCount]:
         
-        return next((c for c in self.cards if c.card == card), None)
+        return self._by_card.get(card.id)
     
 ################################################################################
     def __contains__(self, item: TradingCard) -> bool:
         
-        return any(c.card == item for c in self._cards)
+        return item.id in self._by_card
     
 ################################################################################
     def __len__(self) -> int:
         
-        return sum(c.quantity for c in self._cards)
+        return self._total
     
 ################################################################################
     @property
@@ -119,7 +181,7 @@ class CardCollection:
     
 ################################################################################
     @property
-    def user(self) -> User:
+    def user(self) -> LazyUser:
         
         return self._user
     
@@ -132,27 +194,27 @@ class CardCollection:
     @property
     def common_cards(self) -> List[CardCount]:
         
-        return [c for c in self._cards if c.card.rarity == CardRarity.Common]
+        return list(self._rarity_index().get(CardRarity.Common, {}).values())
     
     @property
     def uncommon_cards(self) -> List[CardCount]:
         
-        return [c for c in self._cards if c.card.rarity == CardRarity.Uncommon]
+        return list(self._rarity_index().get(CardRarity.Uncommon, {}).values())
     
     @property
     def rare_cards(self) -> List[CardCount]:
         
-        return [c for c in self._cards if c.card.rarity == CardRarity.Rare]
+        return list(self._rarity_index().get(CardRarity.Rare, {}).values())
     
     @property
     def ultra_rare_cards(self) -> List[CardCount]:
         
-        return [c for c in self._cards if c.card.rarity == CardRarity.UltraRare]
+        return list(self._rarity_index().get(CardRarity.UltraRare, {}).values())
     
     @property
     def legendary_cards(self) -> List[CardCount]:
         
-        return [c for c in self._cards if c.card.rarity == CardRarity.Legendary]
+        return list(self._rarity_index().get(CardRarity.Legendary, {}).values())
     
 ################################################################################
     @property
@@ -174,7 +236,7 @@ class CardCollection:
 ################################################################################
     def has_card(self, card: TradingCard) -> bool:
         
-        return any(c.card == card for c in self._cards)
+        return card.id in self._by_card
     
 ################################################################################
     def status(self) -> Embed:
@@ -183,17 +245,19 @@ class CardCollection:
         for series in self.card_manager.series_list:
             series_str += (
                 f"{series.order}. {series.name}: "
-                f"`{len([c for c in self._cards if c.card.series == series])}/{len(series)}`\n"
+                f"`{len(self._by_series.get(series.id, {}))}/{len(series)}`\n"
             )
         
+        by_rarity = self._rarity_index()
+        
         return U.make_embed(
             title=f"__`{self._user.display_name}'s` Collection__",
             description=(
-                f"[`{len(self.common_cards)}`] **Common Cards**\n"
-                f"[`{len(self.uncommon_cards)}`] **Uncommon Cards**\n"
-                f"[`{len(self.rare_cards)}`] **Rare Cards**\n"
-                f"[`{len(self.ultra_rare_cards)}`] **Ultra Rare Cards**\n"
-                f"[`{len(self.legendary_cards)}`] **Legendary Cards**\n\n"
+                f"[`{len(by_rarity.get(CardRarity.Common, {}))}`] **Common Cards**\n"
+                f"[`{len(by_rarity.get(CardRarity.Uncommon, {}))}`] **Uncommon Cards**\n"
+                f"[`{len(by_rarity.get(CardRarity.Rare, {}))}`] **Rare Cards**\n"
+                f"[`{len(by_rarity.get(CardRarity.UltraRare, {}))}`] **Ultra Rare Cards**\n"
+                f"[`{len(by_rarity.get(CardRarity.Legendary, {}))}`] **Legendary Cards**\n\n"
                 
                 f"[`{len(self._cards)}`] **Total Cards**\n"
                 f"[`{self.booster_packs}`] **Booster Packs**\n\n"
@@ -273,7 +337,7 @@ class CardCollection:
             options=[
                 c.select_option() 
                 for c 
-                in [c.card for c in self.cards if c.card.series == series]
+                in self.get_cards_by_series(series)
             ]
         )
         
@@ -321,7 +385,7 @@ class CardCollection:
         self.booster_packs += int(view.value)
         
 ################################################################################
-    async def open_booster(self, interaction: Interaction) -> None:
+    async def open_booster(self, interaction: Interaction, count: int = 1) -> None:
         
         if not self.booster_packs:
             error = U.make_embed(
@@ -331,17 +395,34 @@ class CardCollection:
             await interaction.respond(embed=error, ephemeral=True)
             return
         
-        cards = [
-            cfg.get_random_card(self) 
-            for cfg in self._mgr.booster_config.card_configs
-        ]
-        final_cards = [c for c in cards if c is not None]
+        count = min(count, self.booster_packs)
+        final_cards = self.draw_boosters(count)
         
-        self.booster_packs -= 1
+        # Granted before the packs are spent, so a failed insert leaves the
+        # player with their unopened packs.
+        self._add_cards(final_cards)
+        self.booster_packs -= count
         
-        for card in final_cards:
-            self._add_card(card)
-            await interaction.respond(embed=card.status())
+        # Discord caps a message at 10 embeds.
+        embeds = [card.status() for card in final_cards]
+        for i in range(0, len(embeds), 10):
+            await interaction.respond(embeds=embeds[i:i + 10])
+            
+################################################################################
+    def draw_boosters(self, count: int) -> List[TradingCard]:
+        """Draws the cards for `count` booster packs in memory without
+        persisting anything. Cards drawn in earlier packs count as owned for
+        always-new slots in later ones."""
+        
+        drawn = []
+        for _ in range(count):
+            pack = [
+                cfg.get_random_card(self, set(drawn)) 
+                for cfg in self._mgr.booster_config.card_configs
+            ]
+            drawn.extend(c for c in pack if c is not None)
+            
+        return drawn
 
 ################################################################################
     def _add_card(self, card: TradingCard) -> None:
@@ -350,9 +431,37 @@ class CardCollection:
         if count_obj is None:
             count_obj = CardCount.new(self, card)
             self._cards.append(count_obj)
+            self._index(count_obj)
         else:
             count_obj.quantity += 1
             
+################################################################################
+    def _add_cards(self, cards: List[TradingCard]) -> None:
+        """Grants all the given cards at once. New cards are inserted with a
+        single multi-row insert, and quantity changes to existing counts are
+        coalesced into one batched update by the database's write buffer."""
+        
+        tally: Dict[TradingCard, int] = {}
+        for card in cards:
+            tally[card] = tally.get(card, 0) + 1
+            
+        new_counts = []
+        existing = []
+        for card, qty in tally.items():
+            count_obj = self[card]
+            if count_obj is None:
+                new_counts.append((card, qty))
+            else:
+                existing.append((count_obj, qty))
+                
+        # The insert raises if it fails, before anything has changed here.
+        for count_obj in CardCount.bulk_new(self, new_counts):
+            self._cards.append(count_obj)
+            self._index(count_obj)
+            
+        for count_obj, qty in existing:
+            count_obj.quantity += qty
+            
 ################################################################################
     async def view(self, interaction: Interaction) -> None:
         
@@ -363,7 +472,7 @@ class CardCollection:
         pages = []
         chunks = [card_strs[i:i + 20] for i in range(0, len(card_strs), 20)]
         
-        total_owned = sum(c.quantity for c in self._cards)
+        total_owned = self._total
         num_owned = len(self._cards)
         
         for chunk in chunks:
@@ -398,6 +507,6 @@ class CardCollection:
 ################################################################################
     def get_cards_by_series(self, series: CardSeries) -> List[TradingCard]:
         
-        return [c.card for c in self._cards if c.card.series == series]
+        return [c.card for c in self._by_series.get(series.id, {}).values()]
 
 ################################################################################
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Type, TypeVar, Any, Tuple
+from typing import TYPE_CHECKING, Type, TypeVar, Any, Tuple, List
 
 from discord import Embed, Interaction
 from Utilities import Utilities as U
@@ -40,6 +40,15 @@ class CardCount:
         new_id = parent.bot.database.insert.card_count(parent.id, card.id, qty)
         return cls(parent, new_id, card, qty)
     
+################################################################################
+    @classmethod
+    def bulk_new(cls: Type[CC], parent: CardCollection, counts: List[Tuple[TradingCard, int]]) -> List[CC]:
+        
+        new_ids = parent.bot.database.insert.card_counts(
+            parent.id, [(card.id, qty) for card, qty in counts]
+        )
+        return [cls(parent, new_id, card, qty) for new_id, (card, qty) in zip(new_ids, counts)]
+    
 ################################################################################
     @classmethod
     def load(cls: Type[CC], parent: CardCollection, data: Tuple[Any, ...]) -> CC:
@@ -78,6 +87,7 @@ class CardCount:
     @quantity.setter
     def quantity(self, value: int) -> None:
         
+        self._parent._total += value - self._qty
         self._qty = value
         self.update()
         
@@ -90,7 +100,7 @@ class CardCount:
     def delete(self) -> None:
         
         self.bot.database.delete.card_count(self)
-        self._parent.cards.remove(self)
+        self._parent._remove_count(self)
         
 ################################################################################
     async def remove(self, interaction: Interaction) -> None:
@@ -1,13 +1,9 @@
 from __future__ import annotations
 
-import os
+from typing import TYPE_CHECKING, List, Type, TypeVar, Any, Dict, Optional, Set, Tuple
 
-from io import BytesIO
-from typing import TYPE_CHECKING, List, Type, TypeVar, Any, Dict, Optional
-
-import requests
-from PIL import Image, UnidentifiedImageError, ImageOps
-from discord import Embed, Interaction, SelectOption, File
+from PIL import UnidentifiedImageError
+from discord import Embed, Interaction, SelectOption
 
 from Errors import (
     DeckFull,
@@ -40,6 +36,9 @@ class CardDeck:
         "_name",
         "_image",
         "_overrides",
+        "_by_card",
+        "_by_marker",
+        "_marker_version",
     )
     
     MAX_DECK_SIZE = 6
@@ -54,7 +53,12 @@ class CardDeck:
         self._cards: List[DeckCardSlot] = kwargs.get("cards", [])
         self._image: Optional[str] = kwargs.get("image", None)
         
-        self._overrides: List[str] = []
+        self._overrides: Set[str] = set()
+        
+        self._by_card: Dict[str, DeckCardSlot] = {}
+        self._by_marker: Optional[Dict[int, List[DeckCardSlot]]] = None
+        self._marker_version: int = -1
+        self._build_indexes()
     
 ################################################################################
     @classmethod
@@ -78,7 +82,12 @@ class CardDeck:
         self._cards = [DeckCardSlot.load(self, card) for card in data["cards"]]
         self._image = ddata[3]
         
-        self._overrides = []
+        self._overrides = set()
+        
+        self._by_card = {}
+        self._by_marker = None
+        self._marker_version = -1
+        self._build_indexes()
         
         return self
     
@@ -95,7 +104,41 @@ class CardDeck:
 ################################################################################
     def __contains__(self, item: TradingCard) -> bool:
         
-        return any(slot.card == item for slot in self._cards)
+        return item.id in self._by_card
+    
+################################################################################
+    def _build_indexes(self) -> None:
+        
+        self._by_card = {slot.card.id: slot for slot in self._cards if slot.card is not None}
+        self._by_marker = None
+        
+################################################################################
+    def _marker_index(self) -> Dict[int, List[DeckCardSlot]]:
+        """Die marker -> slots, rebuilt whenever a card's stats may have changed."""
+        
+        version = self.card_manager.version
+        if self._by_marker is None or self._marker_version != version:
+            self._by_marker = {}
+            for slot in self._cards:
+                if slot.card is not None and slot.card.die_marker is not None:
+                    self._by_marker.setdefault(slot.card.die_marker, []).append(slot)
+            self._marker_version = version
+            
+        return self._by_marker
+    
+################################################################################
+    def _add_slot(self, slot: DeckCardSlot) -> None:
+        
+        self._cards.append(slot)
+        self._by_card[slot.card.id] = slot
+        self._by_marker = None
+        
+################################################################################
+    def _remove_slot(self, slot: DeckCardSlot) -> None:
+        
+        self._cards.remove(slot)
+        self._by_card.pop(slot.card.id, None)
+        self._by_marker = None
     
 ################################################################################
     @property
@@ -225,7 +268,7 @@ class CardDeck:
             return
         
         slot = DeckCardSlot.new(self, card)
-        self._cards.append(slot)
+        self._add_slot(slot)
         
         await self.generate_image(interaction)
         
@@ -296,32 +339,32 @@ class CardDeck:
         if not modal.complete:
             return
 
-        cards = self.card_manager.get_cards_by_name(modal.value)
+        cards = self.card_manager.search_cards(modal.value)
         if not cards:
             error = InvalidCardName(modal.value)
             await interaction.respond(embed=error, ephemeral=True)
             return
         
         if len(cards) == 1:
-            return cards[0]
+            card = cards[0]
+        else:
+            prompt = U.make_embed(
+                title="__Select Card__",
+                description="Multiple cards found. Please select one."
+            )
+            view = FroggeSelectView(interaction.user, [c.select_option() for c in cards])
             
-        prompt = U.make_embed(
-            title="__Select Card__",
-            description="Multiple cards found. Please select one."
-        )
-        view = FroggeSelectView(interaction.user, [c.select_option() for c in cards])
-        
-        await interaction.respond(embed=prompt, view=view)
-        await view.wait()
-        
-        if not view.complete or view.value is False:
-            return
-        
-        card = self.card_manager.get_card(view.value)
-        if card is None:
-            error = InvalidCardName(view.value)
-            await interaction.respond(embed=error, ephemeral=True)
-            return
+            await interaction.respond(embed=prompt, view=view)
+            await view.wait()
+            
+            if not view.complete or view.value is False:
+                return
+            
+            card = self.card_manager.get_card(view.value)
+            if card is None:
+                error = InvalidCardName(view.value)
+                await interaction.respond(embed=error, ephemeral=True)
+                return
 
         if card not in self.parent_collection:
             error = CardNotInCollection(card.name)
@@ -397,16 +440,33 @@ class CardDeck:
             return
         
         slot = self.get_slot_by_card(card)
-        missing_idx = slot.order
+        if slot is None:
+            return
         
         await slot.remove(interaction)
+        # Still in the deck if the removal was cancelled.
+        if self.get_slot_by_card(card) is slot:
+            return
         
-        for slot in self._cards:
-            if slot.order > missing_idx:
-                slot.order -= 1
-
+        self.reorder()
         await self.generate_image(interaction)
         
+################################################################################
+    def reorder(self) -> None:
+        """Closes any gaps in the slot order, saving every changed slot in a
+        single statement."""
+        
+        self._cards.sort(key=lambda s: s.order)
+        
+        changed = []
+        for i, slot in enumerate(self._cards, start=1):
+            if slot.order != i:
+                slot._order = i
+                changed.append(slot)
+                
+        if changed:
+            self.bot.database.update.deck_slot_orders(changed)
+        
 ################################################################################
     async def select_card(self, interaction: Interaction, prompt: Embed) -> Optional[TradingCard]:
         
@@ -424,12 +484,13 @@ class CardDeck:
 ################################################################################
     def get_card_by_id(self, card_id: str) -> Optional[TradingCard]:
         
-        return next((slot.card for slot in self._cards if slot.card.id == card_id), None)
+        slot = self._by_card.get(card_id)
+        return slot.card if slot is not None else None
     
 ################################################################################
     def get_slot_by_card(self, card: TradingCard) -> Optional[DeckCardSlot]:
         
-        return next((slot for slot in self._cards if slot.card == card), None)
+        return self._by_card.get(card.id)
     
 ################################################################################
     def select_option(self) -> SelectOption:
@@ -443,75 +504,91 @@ class CardDeck:
 ################################################################################
     async def generate_image(self, interaction: Optional[Interaction]) -> None:
         
-        slot_width = 150
-        slot_height = 210
-
-        canvas_width = slot_width * 6
-        canvas_height = slot_height
-        canvas = Image.new('RGBA', (canvas_width, canvas_height), (255, 255, 255, 0))  # Transparent background
-
-        for i, slot in enumerate(self._cards):
-            if not slot.card.permalink:
-                continue
-                
-            try:
-                # Download the card image from the URL
-                response = requests.get(slot.card.permalink)
-                card_image = Image.open(BytesIO(response.content))
-            except UnidentifiedImageError:
+        renderer = self.bot.card_renderer
+        
+        # Reuse the upload for an identical deck state instead of rendering
+        # it again.
+        key = renderer.deck_key(self._render_state())
+        url = renderer.get_rendered(key)
+        if url is not None:
+            if url != self.image:
+                self.image = url
+            return
+        
+        thumbs = await renderer.get_thumbnails([slot.card.permalink for slot in self._cards])
+        
+        slots = []
+        for slot, thumb in zip(self._cards, thumbs):
+            if isinstance(thumb, UnidentifiedImageError):
                 slot.card.permalink = None
                 if interaction:
                     await interaction.respond(embed=PermalinkFailed(slot.card.name), ephemeral=True)
-                    # card_image = Image.open(f"Files/DefaultCard.png")
-                    continue
-            else:
-                # Resize the card image to fit within the slot
-                card_image = card_image.resize((slot_width, slot_height))
-
-            # Check if the card id is in the overrides list
-            if slot.card.id in self._overrides:
-                # Apply grayscale filter to the image
-                card_image = ImageOps.grayscale(card_image)
-                # Convert to RGBA
-                card_image = card_image.convert("RGBA")
-                # Apply a gray tint by reducing the alpha (transparency)
-                alpha = Image.new('L', card_image.size, color=128)  # 128 is for 50% transparency
-                card_image.putalpha(alpha)
-
-            # Calculate the position to paste the card on the canvas
-            position = (i * slot_width, 0)
-            try:
-                canvas.paste(card_image, position, card_image)
-            except ValueError:
-                pass
-
-        filepath = f"Files/Deck-{self.id}.png"
-        canvas.save(filepath)
-
-        file = File(filepath)
-        dump = await self.bot._img_dump.send(file=file)
+                thumb = None
+            elif isinstance(thumb, Exception):
+                raise thumb
+            
+            slots.append((thumb, slot.card.id in self._overrides))
 
-        self.image = dump.attachments[0].url
+        buffer = await renderer.render_deck(slots)
+        url = await renderer.upload(buffer, f"Deck-{self.id}.png")
         
-        try:
-            os.remove(filepath)
-        except FileNotFoundError:
-            pass
+        # Permalinks that failed to load were cleared, which changes the key.
+        renderer.remember_rendered(renderer.deck_key(self._render_state()), url)
+        if url != self.image:
+            self.image = url
+        
+################################################################################
+    def _render_state(self) -> List[Tuple[Optional[str], bool]]:
+        
+        return [(slot.card.permalink, slot.card.id in self._overrides) for slot in self._cards]
         
 ################################################################################
     def get_die_marker_matching(self, roll: int) -> List[DeckCardSlot]:
         
         return [
             slot 
-            for slot in self._cards 
-            if slot.card.die_marker == roll 
-            and slot.card.id not in self._overrides
+            for slot in self._marker_index().get(roll, [])
+            if slot.card.id not in self._overrides
         ]
     
+################################################################################
+    def get_nearest_available(self, roll: int) -> List[DeckCardSlot]:
+        """Returns the unplayed cards whose die marker is closest to the roll,
+        from either side. Empty once every card has been played."""
+        
+        nearest = None
+        matching = []
+        
+        for marker, slots in self._marker_index().items():
+            available = [s for s in slots if s.card.id not in self._overrides]
+            if not available:
+                continue
+            
+            spread = abs(marker - roll)
+            if nearest is None or spread < nearest:
+                nearest = spread
+                matching = available
+            elif spread == nearest:
+                matching = matching + available
+                
+        return matching
+    
+################################################################################
+    @property
+    def overrides(self) -> List[str]:
+        """The IDs of cards already played from this deck in the current battle."""
+        
+        return list(self._overrides)
+    
+    @overrides.setter
+    def overrides(self, card_ids: List[str]) -> None:
+        
+        self._overrides = set(card_ids)
+        
 ################################################################################
     def add_override(self, card: TradingCard) -> None:
         
-        self._overrides.append(card.id)
+        self._overrides.add(card.id)
         
 ################################################################################
     async def reset_overrides(self) -> None:
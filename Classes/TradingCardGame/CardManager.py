@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Optional, Any, Dict
+import difflib
+from bisect import bisect_left
+from typing import TYPE_CHECKING, List, Optional, Any, Dict, Tuple
 
 from discord import Interaction, Embed, EmbedField
 
@@ -21,18 +23,112 @@ class CardManager:
     __slots__ = (
         "_mgr",
         "_series_list",
+        "_version",
+        "_by_id",
+        "_by_name",
+        "_by_position",
+        "_card_keys",
+        "_name_keys",
+        "_series_by_order",
     )
     
+    SEARCH_LIMIT = 25
+    FUZZY_CUTOFF = 0.6
+    
 ################################################################################
     def __init__(self, mgr: TCGManager) -> None:
 
         self._mgr: TCGManager = mgr
         self._series_list: List[CardSeries] = []
+        self._version: int = 0
+        
+        self._build_index()
     
 ################################################################################
     def load_all(self, data: List[Dict[str, Any]]) -> None:
         
         self._series_list = [CardSeries.load(self, s) for s in data]
+        self._build_index()
+        self.invalidate()
+            
+################################################################################
+    def _build_index(self) -> None:
+        
+        self._by_id: Dict[str, TradingCard] = {}
+        self._by_name: Dict[str, List[TradingCard]] = {}
+        self._by_position: Dict[Tuple[int, str], TradingCard] = {}
+        self._card_keys: Dict[str, Tuple[Optional[str], Tuple[int, str]]] = {}
+        self._name_keys: Optional[List[str]] = None
+        self._series_by_order: Dict[int, CardSeries] = {}
+        
+        for series in self._series_list:
+            self._series_by_order[series.order] = series
+            for card in series._cards:
+                self._index_card(card)
+            
+################################################################################
+    @staticmethod
+    def _normalize(name: Optional[str]) -> Optional[str]:
+        
+        if not name:
+            return None
+        
+        return " ".join(name.casefold().split())
+            
+################################################################################
+    def _index_card(self, card: TradingCard) -> None:
+        
+        name_key = self._normalize(card.name)
+        pos_key = (card.series.order, card.index.lower())
+        
+        self._by_id[card.id] = card
+        self._by_position[pos_key] = card
+        if name_key is not None:
+            self._by_name.setdefault(name_key, []).append(card)
+            self._name_keys = None
+        
+        self._card_keys[card.id] = (name_key, pos_key)
+        
+################################################################################
+    def _unindex_card(self, card: TradingCard) -> None:
+        
+        keys = self._card_keys.pop(card.id, None)
+        if keys is None:
+            return
+        
+        name_key, pos_key = keys
+        
+        self._by_id.pop(card.id, None)
+        if self._by_position.get(pos_key) is card:
+            del self._by_position[pos_key]
+        if name_key is not None:
+            cards = self._by_name.get(name_key, [])
+            if card in cards:
+                cards.remove(card)
+            if not cards:
+                self._by_name.pop(name_key, None)
+                self._name_keys = None
+                
+################################################################################
+    def register_card(self, card: TradingCard) -> None:
+        """Adds a newly created card to the catalog."""
+        
+        self._index_card(card)
+        self.invalidate()
+        
+################################################################################
+    def unregister_card(self, card: TradingCard) -> None:
+        """Drops a deleted card from the catalog."""
+        
+        self._unindex_card(card)
+        self.invalidate()
+        
+################################################################################
+    def reindex_card(self, card: TradingCard) -> None:
+        """Refreshes a card's catalog entries after its name or index changed."""
+        
+        self._unindex_card(card)
+        self._index_card(card)
             
 ################################################################################
     def __len__(self) -> int:
@@ -58,6 +154,19 @@ class CardManager:
         
         return self._mgr.guild_id
     
+################################################################################
+    @property
+    def version(self) -> int:
+        """Incremented whenever a card is added, removed or changes rarity, so
+        anything derived from the card pool knows when to rebuild."""
+        
+        return self._version
+    
+################################################################################
+    def invalidate(self) -> None:
+        
+        self._version += 1
+        
 ################################################################################
     @property
     def series_list(self) -> List[CardSeries]:
@@ -182,23 +291,60 @@ class CardManager:
         
         series = CardSeries.new(self, modal.value)
         self._series_list.append(series)
+        self._series_by_order[series.order] = series
         
 ################################################################################
     def get_card(self, card_id: str) -> Optional[TradingCard]:
         
-        for series in self._series_list:
-            for card in series.cards:
-                if card.id == card_id:
-                    return card
+        return self._by_id.get(card_id)
     
 ################################################################################
     def get_series_by_order(self, order: int) -> Optional[CardSeries]:
         
-        return next((s for s in self._series_list if s.order == order), None)
+        return self._series_by_order.get(order)
+    
+################################################################################
+    def get_card_by_position(self, order: int, index: str) -> Optional[TradingCard]:
+        
+        return self._by_position.get((order, index.lower()))
             
 ################################################################################
     def get_cards_by_name(self, name: str) -> List[TradingCard]:
         
-        return [card for card in self.all_cards if card.name.lower() == name.lower()]
+        return list(self._by_name.get(self._normalize(name), []))
+    
+################################################################################
+    def search_cards(self, query: str) -> List[TradingCard]:
+        """Finds cards by name, preferring an exact (case-insensitive) match,
+        then names starting with the query, then names containing it, and
+        finally close spellings. Returns at most `SEARCH_LIMIT` cards."""
+        
+        key = self._normalize(query)
+        if key is None:
+            return []
+        
+        exact = self._by_name.get(key)
+        if exact:
+            return list(exact[:self.SEARCH_LIMIT])
+        
+        if self._name_keys is None:
+            self._name_keys = sorted(self._by_name)
+        names = self._name_keys
+        
+        matches = []
+        i = bisect_left(names, key)
+        while i < len(names) and names[i].startswith(key):
+            matches.append(names[i])
+            i += 1
+            
+        if not matches:
+            matches = [n for n in names if key in n]
+        if not matches:
+            matches = difflib.get_close_matches(
+                key, names, n=self.SEARCH_LIMIT, cutoff=self.FUZZY_CUTOFF
+            )
+            
+        cards = [card for name in matches for card in self._by_name[name]]
+        return cards[:self.SEARCH_LIMIT]
     
 ################################################################################
@@ -76,7 +76,8 @@ class CardSeries:
 ################################################################################
     def __getitem__(self, card_id: str) -> Optional[TradingCard]:
         
-        return next((c for c in self._cards if c.id == card_id), None)
+        card = self._mgr.get_card(card_id)
+        return card if card is not None and card.series is self else None
         
 ################################################################################
     def __len__(self) -> int:
@@ -167,6 +168,7 @@ class CardSeries:
         
         new_card = TradingCard.new(self)
         self._cards.append(new_card)
+        self._mgr.register_card(new_card)
         
         await new_card.menu(interaction)
         
@@ -231,6 +233,6 @@ class CardSeries:
 ################################################################################
     def get_card_by_index(self, index: str) -> Optional[TradingCard]:
         
-        return next((c for c in self.cards if c.index.lower() == index.lower()), None)
+        return self._mgr.get_card_by_position(self._order, index)
             
 ################################################################################
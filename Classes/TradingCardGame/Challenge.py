@@ -49,6 +49,12 @@ class Challenge:
         
         return self._id == other._id
     
+################################################################################
+    @property
+    def id(self) -> str:
+        
+        return self._id
+    
 ################################################################################
     @property
     def player(self) -> TCGPlayer:
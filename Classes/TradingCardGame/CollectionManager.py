@@ -35,7 +35,7 @@ class CollectionManager:
 ################################################################################
     async def load_all(self, coll_data: List[Dict[str, Any]], booster_data: Dict[str, Any]) -> None:
         
-        self._collections = [await CardCollection.load(self, d) for d in coll_data]
+        self._collections = [CardCollection.load(self, d) for d in coll_data]
         self._booster_config.load_all(booster_data)
             
 ################################################################################
@@ -135,10 +135,10 @@ class CollectionManager:
         await collection.admin_menu(interaction)
 
 ################################################################################
-    async def open_booster(self, interaction: Interaction) -> None:
+    async def open_booster(self, interaction: Interaction, count: int = 1) -> None:
 
         collection = self._get_collection(interaction.user)
-        await collection.open_booster(interaction)
+        await collection.open_booster(interaction, count)
 
 ################################################################################
     async def user_menu(self, interaction: Interaction) -> None:
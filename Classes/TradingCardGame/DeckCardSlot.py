@@ -88,6 +88,8 @@ class DeckCardSlot:
         self._card = value
         self.update()
         
+        self._parent._build_indexes()
+        
 ################################################################################
     def update(self) -> None:
             
@@ -97,7 +99,7 @@ class DeckCardSlot:
     def delete(self) -> None:
         
         self._parent.bot.database.delete.deck_card_slot(self)
-        self._parent._cards.remove(self)
+        self._parent._remove_slot(self)
         
 ################################################################################
     async def remove(self, interaction: Interaction) -> None:
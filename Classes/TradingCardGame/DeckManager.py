@@ -11,7 +11,7 @@ from UI.Common import BasicTextModal, FroggeSelectView
 from UI.TradingCardGame import DeckManagerMenuView
 
 if TYPE_CHECKING:
-    from Classes import CardCollection, CardManager, RentARaBot
+    from Classes import CardCollection, CardManager, LazyUser, RentARaBot
 ################################################################################
 
 __all__ = ("DeckManager", )
@@ -58,7 +58,7 @@ class DeckManager:
     
 ################################################################################
     @property
-    def user(self) -> User:
+    def user(self) -> LazyUser:
         
         return self._parent.user
     
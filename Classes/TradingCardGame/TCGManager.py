@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING, List, Any, Dict
 
 from discord import Embed, Interaction, User
 
 from .BattleManager import BattleManager
+from .BattleSimulator import BattleSimulator
 from .CardManager import CardManager
 from .CollectionManager import CollectionManager
 from UI.TradingCardGame import (
@@ -41,7 +43,14 @@ class TCGManager:
     async def load_all(self, payload: Dict[str, Any]) -> None:
         
         self._cards.load_all(payload["cards"])
+        self._battles.load_all(payload["booster_data"]["booster_config"])
         await self._collections.load_all(payload["collections"], payload["booster_data"])
+        self._battles.resume_all(payload["battles"])
+        
+################################################################################
+    def close(self) -> None:
+        
+        self._battles.close()
         
 ################################################################################
     @property
@@ -102,15 +111,34 @@ class TCGManager:
         await self._collections.booster_management(interaction)
 
 ################################################################################
-    async def open_booster(self, interaction: Interaction) -> None:
+    async def open_booster(self, interaction: Interaction, count: int = 1) -> None:
         
-        await self._collections.open_booster(interaction)
+        await self._collections.open_booster(interaction, count)
 
 ################################################################################
     async def user_collection_menu(self, interaction: Interaction) -> None:
         
         await self._collections.user_menu(interaction)
         
+################################################################################
+    async def simulate_battles(self, interaction: Interaction, battles: int) -> None:
+        """Runs a balance simulation over the guild's card pool and reports
+        the strongest and weakest cards."""
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        try:
+            simulator = BattleSimulator.from_card_manager(self._cards)
+        except (RuntimeError, ValueError) as ex:
+            await interaction.respond(str(ex), ephemeral=True)
+            return
+        
+        # The simulation is CPU-bound, so keep it off the event loop.
+        report = await asyncio.to_thread(simulator.run, battles)
+        names = {card.id: card.name or card.id for card in self._cards.all_cards}
+        
+        await interaction.respond(f"```\n{report.summary(names, top=8)}\n```", ephemeral=True)
+        
 ################################################################################
     async def challenge_user(self, interaction: Interaction, user: User) -> None:
         
@@ -6,6 +6,7 @@ from discord import Embed, EmbedField, Interaction, SelectOption
 
 from Assets import BotEmojis
 from Enums import CharacterGroup, CardRarity
+from .BattleEngine import BattleCard, BattleEngine
 from .TradingCardStats import TradingCardStats
 from .TradingCardDetails import TradingCardDetails
 from UI.Common import ConfirmCancelView, BasicTextModal, InstructionsInfo
@@ -111,6 +112,8 @@ class TradingCard:
         self._index = value
         self.update()
         
+        self.card_manager.reindex_card(self)
+        
 ################################################################################
     @property
     def group(self) -> Optional[CharacterGroup]:
@@ -229,17 +232,12 @@ class TradingCard:
 ################################################################################
     def get_absolute_value(self, stat: str, rand: int) -> int:
 
-        match stat.lower():
-            case "cute":
-                stat_value = self.cute
-            case "cuddle":
-                stat_value = self.cuddle
-            case "crush":
-                stat_value = self.crush
-            case _:
-                raise ValueError(f"Invalid Stat: {stat}")
+        return BattleEngine.distance(self.battle_card().stat(stat), rand)
 
-        return abs(stat_value - rand)
+################################################################################
+    def battle_card(self) -> BattleCard:
+        
+        return BattleCard.from_card(self)
 
 ################################################################################
     def update(self) -> None:
@@ -371,6 +369,7 @@ class TradingCard:
         
         self.bot.database.delete.trading_card(self)
         self._parent.cards.remove(self)
+        self.card_manager.unregister_card(self)
         
 ################################################################################
     async def set_stats(self, interaction: Interaction) -> None:
@@ -382,13 +381,6 @@ class TradingCard:
         """Compare the BAD stat of the card to a value. Returns the index and 
         individual BAD value if they match."""
         
-        bad_list = self.int_to_list(self.bad)
-        rand_list = self.int_to_list(rand)
-        
-        for i, b in enumerate(bad_list):
-            if b == rand_list[i]:
-                return i, b
-            
-        return None
+        return BattleEngine.bad_match(self.bad, rand)
     
 ################################################################################
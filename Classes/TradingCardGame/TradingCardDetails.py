@@ -74,6 +74,8 @@ class TradingCardDetails:
         self._name = value
         self.update()
         
+        self._parent.card_manager.reindex_card(self._parent)
+        
 ################################################################################
     @property
     def description(self) -> Optional[str]:
@@ -128,6 +130,8 @@ class TradingCardDetails:
         self._rarity = value
         self.update()
         
+        self._parent.card_manager.invalidate()
+        
 ################################################################################
     @property
     def permalink(self) -> Optional[str]:
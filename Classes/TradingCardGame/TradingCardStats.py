@@ -115,6 +115,9 @@ class TradingCardStats:
         self._die = value
         # self.update()
         
+        # Decks index their cards by die marker.
+        self._parent.card_manager.invalidate()
+        
 ################################################################################
     def update(self) -> None:
         
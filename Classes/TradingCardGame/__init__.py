@@ -1,4 +1,7 @@
+from .BattleEngine import BattleCard, BattleEngine, BattleResult
+from .BattleLog import BattleLog
 from .BattleManager import BattleManager
+from .BattleSimulator import BattleSimulator, SimulationReport
 from .BoosterCardConfig import BoosterCardConfig
 from .BoosterPackConfig import BoosterPackConfig
 from .CardBattle import CardBattle
@@ -9,6 +9,8 @@ from discord import (
     InteractionContextType
 )
 
+from Enums import BattlePacing
+
 if TYPE_CHECKING:
     from Classes import RentARaBot
 ################################################################################
@@ -17,6 +19,12 @@ class Admin(Cog):
     def __init__(self, bot: "RentARaBot"):
         
         self.bot: "RentARaBot" = bot
+
+################################################################################
+    async def cog_check(self, ctx: ApplicationContext) -> bool:
+        
+        guild = self.bot[ctx.guild_id]
+        return guild is None or await guild.ensure_ready(ctx)
         
 ################################################################################
         
@@ -73,16 +81,99 @@ class Admin(Cog):
     )
     async def reset_battles(self, ctx: ApplicationContext) -> None:
 
+        await ctx.defer()
+        await self.bot[ctx.guild_id].card_manager._battles.reset()
+            
+        await ctx.interaction.respond("Battles reset.")
+        
+################################################################################
+    @admin.command(
+        name="battle_pacing",
+        description="Set how quickly TCG battles play out."
+    )
+    async def battle_pacing(
+        self,
+        ctx: ApplicationContext,
+        pacing: Option(
+            SlashCommandOptionType.string,
+            name="pacing",
+            description="Instant skips pauses, Dramatic keeps the full build-up.",
+            choices=[p.name for p in BattlePacing],
+            required=True
+        )
+    ) -> None:
+
         battles = self.bot[ctx.guild_id].card_manager._battles
+        battles.pacing = BattlePacing[pacing]
         
-        battles._challenges = []
-        battles._battles = []
+        await ctx.interaction.respond(f"Battle pacing set to `{pacing}`.", ephemeral=True)
         
-        for player in battles._players:
-            player.current_deck = None
-            
-        await ctx.interaction.respond("Battles reset.")
+################################################################################
+    @admin.command(
+        name="battle_limit",
+        description="Set how many TCG battles may run at once."
+    )
+    async def battle_limit(
+        self,
+        ctx: ApplicationContext,
+        limit: Option(
+            SlashCommandOptionType.integer,
+            name="limit",
+            description="Battles beyond this many wait in a queue.",
+            min_value=1,
+            max_value=25,
+            required=True
+        )
+    ) -> None:
+
+        battles = self.bot[ctx.guild_id].card_manager._battles
+        battles.limit = limit
         
+        await ctx.interaction.respond(f"Battle limit set to `{limit}`.", ephemeral=True)
+
+################################################################################
+    @admin.command(
+        name="profile_revive_budget",
+        description="Set how many API calls per minute profile revivals may use."
+    )
+    async def profile_revive_budget(
+        self,
+        ctx: ApplicationContext,
+        budget: Option(
+            SlashCommandOptionType.integer,
+            name="budget",
+            description="Each revival uses two calls. Lower values spread them out further.",
+            min_value=2,
+            max_value=60,
+            required=True
+        )
+    ) -> None:
+
+        self.bot[ctx.guild_id].profile_manager.revive_budget = budget
+
+        await ctx.interaction.respond(f"Profile revive budget set to `{budget}` calls per minute.", ephemeral=True)
+
+################################################################################
+    @admin.command(
+        name="battle_simulate",
+        description="Simulate TCG battles over this server's cards to check their balance."
+    )
+    async def battle_simulate(
+        self,
+        ctx: ApplicationContext,
+        battles: Option(
+            SlashCommandOptionType.integer,
+            name="battles",
+            description="How many battles to simulate.",
+            min_value=1_000,
+            max_value=1_000_000,
+            default=100_000,
+            required=False
+        )
+    ) -> None:
+
+        await self.bot[ctx.guild_id].card_manager.simulate_battles(ctx.interaction, battles)
+
 ################################################################################
     @admin.command(
         name="battle_test",
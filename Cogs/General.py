@@ -18,7 +18,13 @@ class General(Cog):
     def __init__(self, bot: "RentARaBot"):
         
         self.bot: "RentARaBot" = bot
-    
+
+################################################################################
+    async def cog_check(self, ctx: ApplicationContext) -> bool:
+        
+        guild = self.bot[ctx.guild_id]
+        return guild is None or await guild.ensure_ready(ctx)
+        
 ################################################################################
     @slash_command(
         name="verify",
@@ -44,10 +50,22 @@ class General(Cog):
         name="booster",
         description="Open a booster pack from your collection.",
     )
-    async def booster_pack(self, ctx: ApplicationContext) -> None:
+    async def booster_pack(
+        self, 
+        ctx: ApplicationContext,
+        count: Option(
+            SlashCommandOptionType.integer,
+            name="count",
+            description="The number of booster packs to open.",
+            min_value=1,
+            max_value=10,
+            required=False,
+            default=1
+        )
+    ) -> None:
         
         guild = self.bot[ctx.guild_id]
-        await guild.card_manager.open_booster(ctx.interaction)
+        await guild.card_manager.open_booster(ctx.interaction, count)
         
 ################################################################################
     @slash_command(
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
-from discord import Cog, Member
+from discord import (
+    Cog,
+    Member,
+    Message,
+    RawBulkMessageDeleteEvent,
+    RawMessageDeleteEvent,
+    RawMessageUpdateEvent,
+    RawThreadDeleteEvent,
+    Thread,
+)
+from discord.abc import GuildChannel
 from typing import TYPE_CHECKING
-from discord.ext import tasks
 
 if TYPE_CHECKING:
     from Classes import RentARaBot
@@ -26,15 +35,76 @@ class Internal(Cog):
     @Cog.listener("on_guild_join")
     async def on_guild_join(self, guild) -> None:
 
-        self.bot.guild_manager.add_guild(guild)
+        await self.bot.load_guild(guild)
+        
+################################################################################
+    @Cog.listener("on_guild_remove")
+    async def on_guild_remove(self, guild) -> None:
+
+        fguild = self.bot.guild_manager.remove_guild(guild.id)
+        if fguild is not None:
+            fguild.close()
 
 ################################################################################
-    @tasks.loop(hours=6)
-    async def revive_profiles(self) -> None:
+    @Cog.listener("on_thread_update")
+    async def on_thread_update(self, before: Thread, after: Thread) -> None:
+
+        if fguild := self.bot[after.guild.id]:
+            fguild.profile_manager.reviver.thread_updated(after)
+
+################################################################################
+    @Cog.listener("on_raw_thread_delete")
+    async def on_raw_thread_delete(self, payload: RawThreadDeleteEvent) -> None:
+
+        self.bot.message_cache.channel_deleted(payload.thread_id)
 
-        for fguild in self.bot.guild_manager.fguilds:
-            await fguild.profile_manager.revive_profiles()
+        if fguild := self.bot[payload.guild_id]:
+            fguild.profile_manager.reviver.thread_deleted(payload.thread_id)
+
+################################################################################
+    @Cog.listener("on_message")
+    async def on_message(self, message: Message) -> None:
+
+        if message.guild is None or not isinstance(message.channel, Thread):
+            return
+
+        if fguild := self.bot[message.guild.id]:
+            fguild.profile_manager.reviver.thread_active(message.channel)
         
+################################################################################
+    @Cog.listener("on_message_edit")
+    async def on_message_edit(self, before: Message, after: Message) -> None:
+
+        self.bot.message_cache.refresh(after)
+
+################################################################################
+    @Cog.listener("on_raw_message_edit")
+    async def on_raw_message_edit(self, payload: RawMessageUpdateEvent) -> None:
+
+        # Edits to messages the gateway had cached arrive in on_message_edit
+        # above; anything else leaves our copy stale, so drop it.
+        if payload.cached_message is None:
+            self.bot.message_cache.discard((payload.channel_id, payload.message_id))
+
+################################################################################
+    @Cog.listener("on_raw_message_delete")
+    async def on_raw_message_delete(self, payload: RawMessageDeleteEvent) -> None:
+
+        self.bot.message_cache.deleted((payload.channel_id, payload.message_id))
+
+################################################################################
+    @Cog.listener("on_raw_bulk_message_delete")
+    async def on_raw_bulk_message_delete(self, payload: RawBulkMessageDeleteEvent) -> None:
+
+        for message_id in payload.message_ids:
+            self.bot.message_cache.deleted((payload.channel_id, message_id))
+
+################################################################################
+    @Cog.listener("on_guild_channel_delete")
+    async def on_guild_channel_delete(self, channel: GuildChannel) -> None:
+
+        self.bot.message_cache.channel_deleted(channel.id)
+
 ################################################################################
     @Cog.listener("on_member_remove")
     async def on_member_remove(self, member: Member) -> None:
@@ -0,0 +1,24 @@
+from ._Enum import FroggeEnum
+################################################################################
+__all__ = ("BattlePacing",)
+################################################################################
+class BattlePacing(FroggeEnum):
+
+    Instant = 0
+    Normal = 1
+    Dramatic = 2
+
+################################################################################
+    @property
+    def delay_scale(self) -> float:
+        """Multiplier applied to a battle's pauses between steps."""
+
+        match self:
+            case BattlePacing.Instant:
+                return 0.0
+            case BattlePacing.Normal:
+                return 0.5
+            case _:
+                return 1.0
+
+################################################################################
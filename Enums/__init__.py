@@ -1,3 +1,4 @@
+from .BattlePacing import BattlePacing
 from .BedroomPreference import BedroomPreference
 from .CardRarity import CardRarity
 from .CardSeries import CardSeries
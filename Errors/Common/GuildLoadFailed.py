@@ -0,0 +1,16 @@
+from Errors._Error import ErrorMessage
+################################################################################
+
+__all__ = ("GuildLoadFailed",)
+
+################################################################################
+class GuildLoadFailed(ErrorMessage):
+
+    def __init__(self):
+        super().__init__(
+            title="Server Data Unavailable",
+            message=f"The bot ran into a problem loading this server's data.",
+            solution=f"Please try again later. If this persists, please contact bot staff.",
+        )
+
+################################################################################
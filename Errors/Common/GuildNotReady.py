@@ -0,0 +1,16 @@
+from Errors._Error import ErrorMessage
+################################################################################
+
+__all__ = ("GuildNotReady",)
+
+################################################################################
+class GuildNotReady(ErrorMessage):
+
+    def __init__(self):
+        super().__init__(
+            title="Warming Up!",
+            message=f"The bot is still loading this server's data.",
+            solution=f"Please try again in a few moments.",
+        )
+
+################################################################################
@@ -1,5 +1,7 @@
 from .ChannelNotSet import ChannelNotSet
 from .ChannelMissing import ChannelMissing
+from .GuildLoadFailed import GuildLoadFailed
+from .GuildNotReady import GuildNotReady
 from .InsufficientPermissions import InsufficientPermissions
 from .MaxItemsReached import MaxItemsReached
 from .InvalidColor import InvalidColor
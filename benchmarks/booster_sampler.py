@@ -0,0 +1,175 @@
+"""Times booster pack openings with `BoosterCardConfig.get_random_card`.
+
+    python -m benchmarks.booster_sampler [--packs 10000] [--cards 5000]
+
+Opens `--packs` packs of five slots (two of them always-new) from a pool of
+`--cards` cards over every rarity, for a collection that already owns
+`--owned` of the pool. The draw `get_random_card` used to do, rebuilding the
+candidate list and scanning the collection for every card, is timed against
+the same packs as the baseline."""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Iterable, List, Optional, Set
+
+# Imported first, as main.py does, so the package's circular imports settle.
+import Classes.Core.Bot  # noqa: F401
+from Classes.TradingCardGame import BoosterCardConfig
+from Enums import CardRarity
+
+################################################################################
+
+# Rarity weights of each pack slot, and whether it's always new.
+SLOTS = [
+    ({CardRarity.Common: 100}, False),
+    ({CardRarity.Common: 70, CardRarity.Uncommon: 30}, False),
+    ({CardRarity.Uncommon: 60, CardRarity.Rare: 40}, False),
+    ({CardRarity.Rare: 70, CardRarity.UltraRare: 25, CardRarity.Legendary: 5}, True),
+    ({CardRarity.UltraRare: 80, CardRarity.Legendary: 20}, True),
+]
+
+# Share of the pool at each rarity.
+RARITY_SHARE = {
+    CardRarity.Common: 0.4,
+    CardRarity.Uncommon: 0.3,
+    CardRarity.Rare: 0.18,
+    CardRarity.UltraRare: 0.09,
+    CardRarity.Legendary: 0.03,
+}
+
+################################################################################
+class Card:
+    """Stands in for a `TradingCard`: hashable by identity, with an id and a
+    rarity."""
+
+    __slots__ = ("id", "rarity")
+
+    def __init__(self, card_id: str, rarity: CardRarity) -> None:
+
+        self.id = card_id
+        self.rarity = rarity
+
+################################################################################
+class Collection:
+    """Stands in for a `CardCollection`, answering membership by card id."""
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+
+        self.ids: Set[str] = {card.id for card in cards}
+
+    def __contains__(self, card: Card) -> bool:
+
+        return card.id in self.ids
+
+################################################################################
+class ScanningCollection:
+    """A `CardCollection` as it used to be, scanning every count for each
+    membership test."""
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+
+        self.counts = [SimpleNamespace(card=card) for card in cards]
+
+    def __contains__(self, card: Card) -> bool:
+
+        return any(c.card == card for c in self.counts)
+
+################################################################################
+def make_pool(size: int, series: int = 10) -> SimpleNamespace:
+    """A card manager over `size` cards, split across `series`."""
+
+    cards = []
+    for rarity, share in RARITY_SHARE.items():
+        cards.extend(Card(f"{rarity.name}{i}", rarity) for i in range(max(1, int(size * share))))
+    random.Random(0).shuffle(cards)
+
+    series_list = [SimpleNamespace(cards=cards[i::series]) for i in range(series)]
+    return SimpleNamespace(
+        version=0,
+        _series_list=series_list,
+        all_cards=cards,
+    )
+
+################################################################################
+def make_config(manager: Any, weights: dict, always_new: bool = False) -> BoosterCardConfig:
+
+    config: BoosterCardConfig = BoosterCardConfig.__new__(BoosterCardConfig)
+    config._id = "config"
+    config._parent = SimpleNamespace(_mgr=SimpleNamespace(card_manager=manager))
+    config._order = 1
+    config._weights = [SimpleNamespace(rarity=r, weight=w) for r, w in weights.items()]
+    config._always_new = always_new
+    config._sampler = None
+
+    return config
+
+################################################################################
+def scanning_draw(config: BoosterCardConfig, coll: Any, exclude: Set[Card]) -> Optional[Card]:
+    """The draw `get_random_card` used to make."""
+
+    manager = config.card_manager
+    all_cards = [card for series in manager._series_list for card in series.cards]
+
+    allowed_rarities = [w.rarity for w in config._weights]
+    allowed = [c for c in all_cards if c.rarity in allowed_rarities]
+    if not allowed:
+        return
+
+    if config.always_new:
+        final_cards = [c for c in allowed if c not in coll and c not in exclude]
+    else:
+        final_cards = allowed
+    if not final_cards:
+        return random.choice(allowed)
+
+    rarity_weights = {w.rarity: w.weight for w in config._weights}
+    return random.choices(final_cards, weights=[rarity_weights[c.rarity] for c in final_cards], k=1)[0]
+
+################################################################################
+def open_packs(configs: List[BoosterCardConfig], coll: Any, packs: int, draw=None) -> List[Card]:
+
+    drawn = []
+    for _ in range(packs):
+        pack = set()
+        for config in configs:
+            card = draw(config, coll, pack) if draw else config.get_random_card(coll, pack)
+            if card is not None:
+                pack.add(card)
+        drawn.extend(pack)
+
+    return drawn
+
+################################################################################
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packs", type=int, default=10_000)
+    parser.add_argument("--cards", type=int, default=5_000)
+    parser.add_argument("--owned", type=float, default=0.5)
+    parser.add_argument("--baseline-packs", type=int, default=20)
+    args = parser.parse_args()
+
+    manager = make_pool(args.cards)
+    owned = random.Random(1).sample(manager.all_cards, int(len(manager.all_cards) * args.owned))
+    configs = [make_config(manager, weights, new) for weights, new in SLOTS]
+
+    start = time.perf_counter()
+    open_packs(configs, Collection(owned), args.packs)
+    sampled = time.perf_counter() - start
+
+    # The baseline is too slow to open every pack; it's timed over fewer and
+    # scaled up.
+    start = time.perf_counter()
+    open_packs(configs, ScanningCollection(owned), args.baseline_packs, draw=scanning_draw)
+    scanning = (time.perf_counter() - start) * args.packs / args.baseline_packs
+
+    print(f"{args.packs:,} packs from {len(manager.all_cards):,} cards, {len(owned):,} owned:")
+    print(f"  sampler:  {sampled:8.2f}s ({sampled / args.packs * 1e6:.0f}us per pack)")
+    print(f"  scanning: {scanning:8.2f}s (estimated from {args.baseline_packs:,} packs)")
+    print(f"  speed-up: {scanning / sampled:8.0f}x")
+
+################################################################################
+if __name__ == "__main__":
+    main()
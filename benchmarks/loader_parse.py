@@ -0,0 +1,279 @@
+"""Times `DatabaseLoader._parse_all` on synthetic guild payloads.
+
+    python -m benchmarks.loader_parse [--scales 1 10 100] [--baseline-max 10]
+
+Rows are generated in the shape of `DatabaseLoader.SCOPED_QUERIES`, with only
+the key columns filled in. `BASE_SIZE` is roughly one of our guilds; each
+scale multiplies the number of forms, profiles, cards and collections, with
+the same number of children each. The old nested-scan join is timed as well
+up to `--baseline-max`, past which it takes minutes."""
+
+import argparse
+import re
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+from Classes.Database.Loader import DatabaseLoader
+
+################################################################################
+
+GUILD_ID = 1
+
+BASE_SIZE = {
+    "forms": 5,
+    "questions_per_form": 8,
+    "options_per_question": 4,
+    "responses_per_question": 20,
+    "collections_per_form": 20,
+    "profiles": 300,
+    "addl_images_per_profile": 2,
+    "pref_groups_per_profile": 1,
+    "series": 4,
+    "cards_per_series": 60,
+    "collections": 200,
+    "counts_per_collection": 30,
+    "decks_per_collection": 1,
+    "slots_per_deck": 10,
+    "card_configs": 5,
+    "weights_per_config": 5,
+}
+
+################################################################################
+def _column_counts() -> Dict[str, int]:
+
+    counts = {}
+    for table, query in DatabaseLoader.SCOPED_QUERIES.items():
+        columns = re.match(r"SELECT (.*?) FROM ", query).group(1)
+        counts[table] = columns.count(",") + 1
+
+    return counts
+
+################################################################################
+def make_payload(scale: int = 1) -> Dict[str, List[Tuple[Any, ...]]]:
+    """Builds a flat (unindexed) payload for one guild at `scale` times
+    `BASE_SIZE`."""
+
+    widths = _column_counts()
+    payload: Dict[str, List[Tuple[Any, ...]]] = {table: [] for table in widths}
+    size = {k: v * scale if "_per_" not in k else v for k, v in BASE_SIZE.items()}
+
+    def add(table: str, **columns: Any) -> str:
+        row = [None] * widths[table]
+        for pos, value in columns.items():
+            row[int(pos[1:])] = value
+        payload[table].append(tuple(row))
+        return row[0]
+
+    for table in ("profile_requirements", "verification_config", "tcg_booster_config", "profile_managers"):
+        add(table, c0=GUILD_ID)
+
+    for f in range(size["forms"]):
+        form = add("forms", c0=f"form{f}", c1=GUILD_ID)
+        add("form_prompts", c0=f"{form}pre", c1=form, c6=False)
+        add("form_prompts", c0=f"{form}post", c1=form, c6=True)
+        for r in range(size["collections_per_form"]):
+            add("form_response_collections", c0=f"{form}r{r}", c1=form, c2=r)
+        for q in range(size["questions_per_form"]):
+            question = add("form_questions", c0=f"{form}q{q}", c1=form, c2=q)
+            add("form_question_prompts", c0=f"{question}p", c1=question)
+            for o in range(size["options_per_question"]):
+                add("form_options", c0=f"{question}o{o}", c1=question)
+            for r in range(size["responses_per_question"]):
+                add("form_responses", c0=question, c1=r)
+
+    for p in range(size["profiles"]):
+        profile = add("profiles", c0=f"profile{p}", c1=GUILD_ID, c2=p)
+        for table in ("profile_details", "profile_ataglance", "profile_personality",
+                      "profile_images", "profile_preferences"):
+            add(table, c0=profile)
+        for i in range(size["addl_images_per_profile"]):
+            add("profile_addl_images", c0=f"{profile}i{i}", c1=profile)
+        for g in range(size["pref_groups_per_profile"]):
+            add("profile_preference_groups", c0=f"{profile}g{g}", c1=profile)
+
+    card_ids = []
+    for s in range(size["series"]):
+        series = add("trading_card_series", c0=f"series{s}", c1=GUILD_ID, c2=s)
+        for c in range(size["cards_per_series"]):
+            card = add("trading_cards", c0=f"{series}c{c}", c1=series, c2=c)
+            add("trading_card_details", c0=card)
+            add("trading_card_stats", c0=card)
+            card_ids.append(card)
+
+    for c in range(size["collections"]):
+        coll = add("trading_card_collections", c0=f"coll{c}", c1=GUILD_ID, c2=c)
+        for n in range(size["counts_per_collection"]):
+            add("trading_card_counts", c0=f"{coll}n{n}", c1=coll, c2=card_ids[n % len(card_ids)])
+        for d in range(size["decks_per_collection"]):
+            deck = add("tcg_card_decks", c0=f"{coll}d{d}", c1=coll)
+            for s in range(size["slots_per_deck"]):
+                add("tcg_deck_card_slots", c0=f"{deck}s{s}", c1=deck, c2=s)
+
+    for c in range(size["card_configs"]):
+        config = add("tcg_booster_card_config", c0=f"config{c}", c1=GUILD_ID, c2=c)
+        for w in range(size["weights_per_config"]):
+            add("tcg_rarity_weights", c0=f"{config}w{w}", c1=config, c2=w)
+
+    return payload
+
+################################################################################
+def make_loader() -> DatabaseLoader:
+
+    return DatabaseLoader(SimpleNamespace(guilds=[SimpleNamespace(id=GUILD_ID)]))
+
+################################################################################
+def indexed_parse(loader: DatabaseLoader, payload: Dict[str, List[Tuple[Any, ...]]]) -> Dict[int, Dict[str, Any]]:
+    """The current loader: index each table as it's read, then join."""
+
+    return loader._parse_all({
+        table: loader._index_rows(table, rows) for table, rows in payload.items()
+    })
+
+################################################################################
+def nested_parse(payload: Dict[str, List[Tuple[Any, ...]]]) -> Dict[int, Dict[str, Any]]:
+    """The join `_parse_all` used to do, rescanning each child table for
+    every parent row. Kept as the baseline and as a reference for the
+    indexed join's output."""
+
+    def every(table: str, idx: int, key: Any) -> List[Tuple[Any, ...]]:
+        return [row for row in payload[table] if row[idx] == key]
+
+    def first(table: str, idx: int, key: Any) -> Any:
+        return next((row for row in payload[table] if row[idx] == key), None)
+
+    ret = {
+        GUILD_ID: {
+            "forms": [],
+            "profiles": {
+                "category_id": None, "revive_budget": None, "requirements": None,
+                "profiles": [], "channels": [],
+            },
+            "trading_card_game": {
+                "cards": [], "collections": [],
+                "booster_data": {"booster_config": None, "card_configs": []},
+                "battles": [],
+            },
+            "verification": {"config": None, "roles": []},
+        }
+    }
+
+    for form in payload["forms"]:
+        ret[form[1]]["forms"].append({
+            "form": form,
+            "questions": [
+                {
+                    "question": question,
+                    "options": every("form_options", 1, question[0]),
+                    "responses": every("form_responses", 0, question[0]),
+                    "prompt": first("form_question_prompts", 1, question[0]),
+                }
+                for question in every("form_questions", 1, form[0])
+            ],
+            "responses": every("form_response_collections", 1, form[0]),
+            "pre_prompt": next((p for p in payload["form_prompts"] if p[1] == form[0] and p[6] is False), None),
+            "post_prompt": next((p for p in payload["form_prompts"] if p[1] == form[0] and p[6] is True), None),
+        })
+
+    for req in payload["profile_requirements"]:
+        ret[req[0]]["profiles"]["requirements"] = req
+    for profile in payload["profiles"]:
+        ret[profile[1]]["profiles"]["profiles"].append({
+            "profile": profile,
+            "details": first("profile_details", 0, profile[0]),
+            "aag": first("profile_ataglance", 0, profile[0]),
+            "personality": first("profile_personality", 0, profile[0]),
+            "images": {
+                "images": first("profile_images", 0, profile[0]),
+                "additional": every("profile_addl_images", 1, profile[0]),
+            },
+            "preferences": {
+                "groups": every("profile_preference_groups", 1, profile[0]),
+                "preferences": first("profile_preferences", 0, profile[0]),
+            },
+        })
+    for group in payload["profile_channel_groups"]:
+        ret[group[1]]["profiles"]["channels"].append(group)
+    for mgr in payload["profile_managers"]:
+        ret[mgr[0]]["profiles"]["category_id"] = mgr[1]
+        ret[mgr[0]]["profiles"]["revive_budget"] = mgr[2]
+
+    for series in payload["trading_card_series"]:
+        ret[series[1]]["trading_card_game"]["cards"].append({
+            "series": series,
+            "cards": [
+                {
+                    "card": card,
+                    "details": first("trading_card_details", 0, card[0]),
+                    "stats": first("trading_card_stats", 0, card[0]),
+                }
+                for card in every("trading_cards", 1, series[0])
+            ],
+        })
+    for coll in payload["trading_card_collections"]:
+        ret[coll[1]]["trading_card_game"]["collections"].append({
+            "collection": coll,
+            "cards": every("trading_card_counts", 1, coll[0]),
+            "decks": [
+                {"deck": deck, "cards": every("tcg_deck_card_slots", 1, deck[0])}
+                for deck in every("tcg_card_decks", 1, coll[0])
+            ],
+        })
+    for booster in payload["tcg_booster_config"]:
+        ret[booster[0]]["trading_card_game"]["booster_data"]["booster_config"] = booster
+    for config in payload["tcg_booster_card_config"]:
+        ret[config[1]]["trading_card_game"]["booster_data"]["card_configs"].append({
+            "config": config,
+            "weights": every("tcg_rarity_weights", 1, config[0]),
+        })
+    for battle in payload["tcg_battles"]:
+        ret[battle[1]]["trading_card_game"]["battles"].append(battle)
+
+    for config in payload["verification_config"]:
+        ret[config[0]]["verification"]["config"] = config
+    for role in payload["role_relations"]:
+        ret[role[1]]["verification"]["roles"].append(role)
+
+    return ret
+
+################################################################################
+def _best_of(func, repeat: int) -> float:
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+################################################################################
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--baseline-max", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    loader = make_loader()
+    print(f"{'scale':>6} {'rows':>10} {'indexed':>10} {'nested':>10} {'speed-up':>9}")
+
+    for scale in args.scales:
+        payload = make_payload(scale)
+        rows = sum(len(r) for r in payload.values())
+
+        indexed = _best_of(lambda: indexed_parse(loader, payload), args.repeat)
+        line = f"{scale:>5}x {rows:>10,} {indexed * 1000:>8.1f}ms"
+
+        if scale <= args.baseline_max:
+            nested = _best_of(lambda: nested_parse(payload), 1)
+            line += f" {nested * 1000:>8.1f}ms {nested / indexed:>8.0f}x"
+        else:
+            line += f" {'-':>10} {'-':>9}"
+
+        print(line)
+
+################################################################################
+if __name__ == "__main__":
+    main()
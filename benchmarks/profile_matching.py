@@ -0,0 +1,206 @@
+"""Times profile matching against a guild's `MatchingIndex`.
+
+    python -m benchmarks.profile_matching [--profiles 10000 100000]
+
+Builds synthetic public profiles with random preferences, then times
+building the index and a search for one profile's top matches, against the
+pairwise `ProfilePreferences.match` loop matching used to run."""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+# Imported first, as main.py does, so the package's circular imports settle.
+import Classes.Core.Bot  # noqa: F401
+from Classes.Profiles.MatchingIndex import MatchingIndex
+from Enums import BedroomPreference, FFXIVActivity, Gender, MusicGenre, Race, ZodiacSign
+
+################################################################################
+
+GENDERS = [Gender.Male, Gender.Female, Gender.NonBinary]
+
+################################################################################
+class Group:
+    """Stands in for a `PreferenceGroup`."""
+
+    def __init__(self, gender: Gender, bedroom, preferences: List[Race], restrictions: List[Race]) -> None:
+
+        self.gender = gender
+        self.bedroom_pref = bedroom
+        self.preferences = preferences
+        self.restrictions = restrictions
+
+    @property
+    def is_complete(self) -> bool:
+        return all([self.bedroom_pref is not None, self.preferences, self.restrictions])
+
+################################################################################
+class Preferences:
+    """Stands in for `ProfilePreferences`, with its matching checks as they
+    were before the index."""
+
+    def __init__(self, parent, activities, music, zodiac_self, zodiac_partners, groups: List[Group]) -> None:
+
+        self.parent = parent
+        self.activities = activities
+        self.music_prefs = music
+        self.zodiac_self = zodiac_self
+        self.zodiac_partners = zodiac_partners
+        self.preference_groups = groups
+
+    def get_preference(self, gender: Gender) -> Optional[Group]:
+        return next((g for g in self.preference_groups if g.gender == gender), None)
+
+    def is_matchable(self) -> bool:
+        return all([
+            self.parent.ataglance.gender,
+            self.parent.ataglance.race,
+            self.activities,
+            self.music_prefs,
+            self.zodiac_self,
+            self.zodiac_partners,
+            any(g.is_complete for g in self.preference_groups),
+        ])
+
+    def match(self, profile) -> Tuple[object, int]:
+        """`ProfilePreferences.match` as it was, scoring `profile` against
+        these preferences' owner."""
+
+        preferences = profile.preferences
+
+        match_value = 0
+        match_max = 0
+
+        self_gender = self.parent.ataglance.gender
+        self_race = self.parent.ataglance.race
+        if isinstance(self_race, Race):
+            match_max += 1
+            if self_race in preferences.get_preference(self_gender).preferences:
+                match_value += 1
+            if self_race in preferences.get_preference(self_gender).restrictions:
+                match_value -= 1
+
+        if isinstance(self_gender, Gender):
+            match_max += 1
+            if preferences.get_preference(self_gender).is_complete:
+                match_value += 1
+
+        if self.zodiac_self and self.zodiac_partners:
+            match_max += 2
+            if preferences.zodiac_self in self.zodiac_partners:
+                match_value += 1
+            if self.zodiac_self in preferences.zodiac_partners:
+                match_value += 1
+
+        for activity in preferences.activities:
+            match_max += 1
+            if activity in self.activities:
+                match_value += 1
+        for music in preferences.music_prefs:
+            match_max += 1
+            if music in self.music_prefs:
+                match_value += 1
+
+        return profile, int((match_value / match_max) * 100)
+
+################################################################################
+def _sample(rng: random.Random, enum, low: int, high: int) -> list:
+
+    values = list(enum)
+    return rng.sample(values, rng.randint(low, min(high, len(values))))
+
+################################################################################
+def make_profiles(count: int, seed: int = 21) -> list:
+    """Public profiles with random preferences. Roughly one in ten has
+    something missing and isn't matchable."""
+
+    rng = random.Random(seed)
+    profiles = []
+
+    for i in range(count):
+        profile = SimpleNamespace(id=f"profile{i}", is_public=True)
+        profile.ataglance = SimpleNamespace(
+            gender=rng.choice(GENDERS),
+            race=rng.choice(list(Race)) if rng.random() > 0.05 else None,
+        )
+        groups = [
+            Group(
+                gender,
+                rng.choice(list(BedroomPreference)) if rng.random() > 0.3 else None,
+                _sample(rng, Race, 0, 4),
+                _sample(rng, Race, 0, 3),
+            )
+            for gender in GENDERS
+        ]
+        profile.preferences = Preferences(
+            profile,
+            _sample(rng, FFXIVActivity, 0 if rng.random() < 0.05 else 1, 6),
+            _sample(rng, MusicGenre, 1, 8),
+            rng.choice(list(ZodiacSign)),
+            _sample(rng, ZodiacSign, 1, 4),
+            groups,
+        )
+        profiles.append(profile)
+
+    return profiles
+
+################################################################################
+def pairwise_top_matches(seeker, profiles: list, count: int = 5) -> list:
+    """The matching routine as it was: score every public, matchable
+    profile, sort them all and keep the best few."""
+
+    matches = []
+    for profile in profiles:
+        if profile is seeker:
+            continue
+        if not profile.preferences.is_matchable():
+            continue
+        if match := seeker.preferences.match(profile):
+            matches.append(match)
+
+    matches.sort(key=lambda x: x[1], reverse=True)
+    return matches[:count]
+
+################################################################################
+def make_index(profiles: list) -> MatchingIndex:
+
+    index = MatchingIndex(None)
+    index.rebuild(profiles)
+    return index
+
+################################################################################
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--searches", type=int, default=5)
+    args = parser.parse_args()
+
+    for count in args.profiles:
+        profiles = make_profiles(count)
+        seekers = [p for p in profiles if p.preferences.is_matchable()][:args.searches]
+
+        start = time.perf_counter()
+        index = make_index(profiles)
+        built = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for seeker in seekers:
+            index.top_matches(seeker)
+        indexed = (time.perf_counter() - start) / len(seekers)
+
+        start = time.perf_counter()
+        for seeker in seekers:
+            pairwise_top_matches(seeker, profiles)
+        pairwise = (time.perf_counter() - start) / len(seekers)
+
+        print(f"{count:,} profiles ({len(index):,} matchable):")
+        print(f"  index build:  {built * 1000:8.1f}ms")
+        print(f"  index search: {indexed * 1000:8.1f}ms")
+        print(f"  pairwise:     {pairwise * 1000:8.1f}ms ({pairwise / indexed:.1f}x slower)")
+
+################################################################################
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, List, Optional, Tuple
+
+import pytest
+
+# The bot is run from the repository root, which its packages import from.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Classes.Database.Database import Database
+
+################################################################################
+class FakeDatabase(Database):
+    """A database with no server behind it. Each query takes `query_time`
+    seconds and is recorded as ``(query, args, fetch)`` in the order it's
+    applied. A query of ``"FAIL"`` raises."""
+
+    __slots__ = (
+        "query_time",
+        "applied",
+    )
+
+    def __init__(self, query_time: float = 0.0) -> None:
+
+        bot = SimpleNamespace()
+        super().__init__(bot)
+        bot.database = self
+
+        self.query_time: float = query_time
+        self.applied: List[Tuple[str, Any, Optional[str]]] = []
+
+    def _get_pool(self) -> None:
+
+        return None
+
+    def _run(self, pool, query, fmt_args, fetch):
+
+        if self.query_time:
+            time.sleep(self.query_time)
+        if query == "FAIL":
+            raise RuntimeError("query failed")
+        self.applied.append((query, fmt_args, fetch))
+
+################################################################################
+@pytest.fixture
+def make_database():
+
+    made: List[FakeDatabase] = []
+
+    def _make(query_time: float = 0.0) -> FakeDatabase:
+        db = FakeDatabase(query_time)
+        made.append(db)
+        return db
+
+    yield _make
+
+    for db in made:
+        db.close()
+
+################################################################################
@@ -0,0 +1,270 @@
+import asyncio
+import random
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+
+# Imported first, as main.py does, so the package's circular imports settle.
+import Classes.Core.Bot  # noqa: F401
+from Classes.TradingCardGame.BattleManager import BattleManager
+
+################################################################################
+class FakeBattle:
+    """Stands in for a `CardBattle`, playing for `duration` seconds (forever
+    if ``None``) and recording what the manager did with it."""
+
+    def __init__(self, arena: "Arena", number: int, duration: Optional[float], fail: bool = False) -> None:
+
+        self.arena = arena
+        self.id = f"battle{number}"
+        self.p1 = SimpleNamespace(user=SimpleNamespace(id=number * 2), current_deck=None)
+        self.p2 = SimpleNamespace(user=SimpleNamespace(id=number * 2 + 1), current_deck=None)
+        self.channel = SimpleNamespace(send=self._send)
+        self.duration = duration
+        self.fail = fail
+
+        self.started = False
+        self.finished = False
+        self.abandoned = False
+        self.released = 0
+        self.closed = False
+
+    async def _send(self, **kwargs) -> None:
+        await asyncio.sleep(0)
+
+    async def start(self) -> None:
+        self.started = True
+        self.arena.enter()
+        try:
+            if self.duration is None:
+                await asyncio.Event().wait()
+            await asyncio.sleep(self.duration)
+            if self.fail:
+                raise RuntimeError("battle failed")
+            self.finished = True
+        finally:
+            self.arena.leave()
+
+    async def abandon(self) -> None:
+        self.abandoned = True
+
+    async def release(self) -> None:
+        self.released += 1
+
+    async def close(self) -> None:
+        self.closed = True
+        await self.release()
+
+################################################################################
+class Arena:
+    """Counts the battles in play and checks the manager's slot accounting
+    each time one starts or finishes. Violations are recorded rather than
+    raised, since the manager logs and swallows a battle's exceptions."""
+
+    def __init__(self, manager: BattleManager) -> None:
+
+        self.manager = manager
+        self.playing = 0
+        self.peak = 0
+        self.violations: List[str] = []
+
+    def _check(self) -> None:
+        running, limit = self.manager._running, self.manager._limit
+        if not 0 <= running <= limit or self.playing > running:
+            self.violations.append(f"{self.playing} playing, {running} running, limit {limit}")
+
+    def enter(self) -> None:
+        self.playing += 1
+        self.peak = max(self.peak, self.playing)
+        self._check()
+
+    def leave(self) -> None:
+        self.playing -= 1
+        self._check()
+
+################################################################################
+class ResumingBattleManager(BattleManager):
+    """Resumes battles from `restorable` by id."""
+
+    __slots__ = ("restorable", "arena")
+
+    async def _restore(self, data):
+        return self.restorable.get(data[0])
+
+################################################################################
+@pytest.fixture
+def manager():
+
+    async def wait_until_ready(*args) -> bool:
+        return True
+
+    database = SimpleNamespace(
+        update=SimpleNamespace(battle_limit=lambda mgr: None),
+        delete=SimpleNamespace(battle_checkpoint=lambda battle_id: None),
+    )
+    mgr = SimpleNamespace(
+        bot=SimpleNamespace(database=database),
+        _state=SimpleNamespace(parent=SimpleNamespace(name="Test Guild"), wait_until_ready=wait_until_ready),
+        guild_id=1,
+    )
+
+    manager = ResumingBattleManager(mgr)
+    manager._limit = 3
+    manager.restorable = {}
+    manager.arena = Arena(manager)
+    yield manager
+
+    assert not manager.arena.violations
+
+################################################################################
+def _start(manager: BattleManager, arena: Arena, durations: List[Optional[float]], fail_every: int = 0) -> List[FakeBattle]:
+
+    first = len(manager._battles)
+    battles = []
+    for i, duration in enumerate(durations):
+        failing = bool(fail_every) and i % fail_every == 0
+        battle = FakeBattle(arena, first + i, duration, failing)
+        manager._register(battle)
+        manager._schedule(battle)
+        battles.append(battle)
+
+    return battles
+
+################################################################################
+def _assert_idle(manager: BattleManager) -> None:
+
+    assert manager._running == 0
+    assert all(waiter.done() for waiter in manager._queue)
+    assert not manager._battles and not manager._tasks and not manager._in_battle
+
+################################################################################
+def test_battles_queue_and_all_finish(manager) -> None:
+
+    async def run() -> List[FakeBattle]:
+        arena = manager.arena
+        rng = random.Random(19)
+        battles = _start(manager, arena, [rng.uniform(0, 0.01) for _ in range(60)], fail_every=7)
+        await asyncio.gather(*manager._tasks.values())
+        assert arena.peak == manager.limit
+        return battles
+
+    battles = asyncio.run(run())
+
+    _assert_idle(manager)
+    assert all(b.started and b.closed for b in battles)
+    assert sum(b.finished for b in battles) == 60 - len(range(0, 60, 7))
+
+################################################################################
+def test_reset_mid_run_frees_every_slot(manager) -> None:
+
+    async def run() -> List[FakeBattle]:
+        arena = manager.arena
+        battles = _start(manager, arena, [0.005] * 10 + [None] * 20)
+        # Some finish, three hang in play and the rest wait in the queue.
+        await asyncio.sleep(0.05)
+        assert manager._running == manager.limit and manager._queue
+
+        await manager.reset()
+        assert arena.playing == 0
+        return battles
+
+    battles = asyncio.run(run())
+
+    _assert_idle(manager)
+    assert not manager._queue or all(w.cancelled() for w in manager._queue)
+    assert all(b.closed or b.released for b in battles)
+
+################################################################################
+def test_close_mid_run_frees_every_slot(manager) -> None:
+
+    async def run() -> None:
+        arena = manager.arena
+        _start(manager, arena, [None] * 12)
+        await asyncio.sleep(0.01)
+
+        tasks = list(manager._tasks.values())
+        manager.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(run())
+
+    _assert_idle(manager)
+
+################################################################################
+def test_timed_out_battles_give_their_slots_to_the_queue(manager, monkeypatch) -> None:
+
+    monkeypatch.setattr(BattleManager, "BATTLE_TIMEOUT", 0.02)
+
+    async def run() -> List[FakeBattle]:
+        arena = manager.arena
+        battles = _start(manager, arena, [None] * 6 + [0.001] * 6)
+        await asyncio.gather(*manager._tasks.values())
+        return battles
+
+    battles = asyncio.run(run())
+
+    _assert_idle(manager)
+    assert all(b.abandoned for b in battles[:6])
+    assert all(b.finished and not b.abandoned for b in battles[6:])
+
+################################################################################
+def test_raising_the_limit_dispatches_queued_battles(manager) -> None:
+
+    async def run() -> None:
+        arena = manager.arena
+        _start(manager, arena, [None] * 8)
+        await asyncio.sleep(0.01)
+        assert arena.playing == 3
+
+        manager.limit = 6
+        await asyncio.sleep(0.01)
+        assert arena.playing == 6 and manager._running == 6
+
+        await manager.reset()
+
+    asyncio.run(run())
+
+    _assert_idle(manager)
+
+################################################################################
+def test_resume_respects_the_limit_and_skips_running_battles(manager) -> None:
+
+    async def run() -> None:
+        arena = manager.arena
+        running = _start(manager, arena, [0.02])
+        for i in range(1, 10):
+            manager.restorable[f"battle{i}"] = FakeBattle(arena, i, 0.005)
+
+        # The already running battle is listed again, as after a reconnect.
+        manager.resume_all([(f"battle{i}", ) for i in range(10)])
+        manager.resume_all([(f"battle{i}", ) for i in range(10)])
+        await manager._resume_task
+        await asyncio.gather(*manager._tasks.values())
+
+        assert arena.peak <= manager.limit
+        assert running[0].closed
+        assert all(b.finished for b in manager.restorable.values())
+
+    asyncio.run(run())
+
+    _assert_idle(manager)
+
+################################################################################
+def test_reset_during_resume_frees_every_slot(manager) -> None:
+
+    async def run() -> None:
+        arena = manager.arena
+        for i in range(10):
+            manager.restorable[f"battle{i}"] = FakeBattle(arena, i, None)
+
+        manager.resume_all([(f"battle{i}", ) for i in range(10)])
+        await asyncio.sleep(0.01)
+        await manager.reset()
+        assert manager._resume_task is None
+
+    asyncio.run(run())
+
+    _assert_idle(manager)
+
+################################################################################
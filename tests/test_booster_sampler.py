@@ -0,0 +1,133 @@
+import random
+from collections import Counter
+from types import SimpleNamespace
+
+from benchmarks.booster_sampler import Card, Collection, make_config, make_pool
+from Enums import CardRarity
+
+################################################################################
+
+# Critical chi-square values at p = 0.001, by degrees of freedom.
+CHI2_CRITICAL = {1: 10.83, 2: 13.82, 3: 16.27, 4: 18.47}
+
+DRAWS = 20_000
+
+################################################################################
+def _pool(counts):
+
+    cards = [
+        Card(f"{rarity.name}{i}", rarity)
+        for rarity, n in counts.items()
+        for i in range(n)
+    ]
+    return SimpleNamespace(version=0, all_cards=cards)
+
+################################################################################
+def _assert_rarity_frequencies(drawn, eligible, weights) -> None:
+    """Checks each rarity is drawn in proportion to its weight times the
+    number of eligible cards of that rarity."""
+
+    mass = {r: w * sum(1 for c in eligible if c.rarity == r) for r, w in weights.items()}
+    total = sum(mass.values())
+    seen = Counter(card.rarity for card in drawn)
+
+    chi2 = sum(
+        (seen[r] - len(drawn) * m / total) ** 2 / (len(drawn) * m / total)
+        for r, m in mass.items()
+    )
+    assert chi2 < CHI2_CRITICAL[len(mass) - 1], (seen, mass)
+
+################################################################################
+def test_rarity_frequencies_match_weights() -> None:
+
+    random.seed(11)
+    weights = {CardRarity.Common: 70, CardRarity.Rare: 25, CardRarity.Legendary: 5}
+    pool = _pool({CardRarity.Common: 10, CardRarity.Rare: 6, CardRarity.Legendary: 3, CardRarity.Uncommon: 5})
+    config = make_config(pool, weights)
+
+    drawn = [config.get_random_card(Collection()) for _ in range(DRAWS)]
+
+    assert all(card.rarity in weights for card in drawn)
+    _assert_rarity_frequencies(drawn, pool.all_cards, weights)
+
+################################################################################
+def test_always_new_frequencies_match_weights_over_unowned_cards() -> None:
+
+    random.seed(12)
+    weights = {CardRarity.Common: 60, CardRarity.UltraRare: 40}
+    pool = _pool({CardRarity.Common: 12, CardRarity.UltraRare: 8})
+    owned = pool.all_cards[:9] + pool.all_cards[12:14]
+    config = make_config(pool, weights, always_new=True)
+
+    coll = Collection(owned)
+    drawn = [config.get_random_card(coll) for _ in range(DRAWS)]
+    unowned = [card for card in pool.all_cards if card not in coll]
+
+    assert not any(card in coll for card in drawn)
+    _assert_rarity_frequencies(drawn, unowned, weights)
+
+################################################################################
+def test_rejections_running_out_still_draw_an_unowned_card() -> None:
+
+    random.seed(13)
+    weights = {CardRarity.Common: 1000, CardRarity.Legendary: 1}
+    pool = _pool({CardRarity.Common: 500, CardRarity.Legendary: 1})
+    legendary = pool.all_cards[-1]
+    config = make_config(pool, weights, always_new=True)
+
+    # Rejection sampling all but never lands on the one unowned card, so
+    # this goes through the fallback every time.
+    coll = Collection(pool.all_cards[:-1])
+    assert all(config.get_random_card(coll) is legendary for _ in range(200))
+
+################################################################################
+def test_exclusions_are_honoured_once_rejections_run_out() -> None:
+
+    random.seed(14)
+    weights = {CardRarity.Common: 1000, CardRarity.Rare: 1}
+    pool = _pool({CardRarity.Common: 300, CardRarity.Rare: 2})
+    first, second = pool.all_cards[-2:]
+    config = make_config(pool, weights, always_new=True)
+
+    coll = Collection(pool.all_cards[:-2])
+    assert all(config.get_random_card(coll, {first}) is second for _ in range(100))
+
+################################################################################
+def test_owning_every_card_falls_back_to_any_eligible_card() -> None:
+
+    random.seed(15)
+    weights = {CardRarity.Common: 1}
+    pool = _pool({CardRarity.Common: 4, CardRarity.Rare: 4})
+    config = make_config(pool, weights, always_new=True)
+
+    coll = Collection(pool.all_cards)
+    drawn = {config.get_random_card(coll) for _ in range(200)}
+
+    assert drawn == {card for card in pool.all_cards if card.rarity == CardRarity.Common}
+
+################################################################################
+def test_no_eligible_cards_draws_nothing() -> None:
+
+    pool = _pool({CardRarity.Common: 4})
+    config = make_config(pool, {CardRarity.Legendary: 1})
+
+    assert config.get_random_card(Collection()) is None
+
+################################################################################
+def test_sampler_is_rebuilt_only_when_the_pool_or_weights_change() -> None:
+
+    pool = make_pool(100)
+    config = make_config(pool, {CardRarity.Common: 1})
+
+    sampler = config._get_sampler()
+    assert config._get_sampler()[0] is sampler[0]
+
+    pool.version += 1
+    rebuilt = config._get_sampler()
+    assert rebuilt[0] is not sampler[0]
+
+    config._weights.append(SimpleNamespace(rarity=CardRarity.Rare, weight=5))
+    assert config._get_sampler()[0] is not rebuilt[0]
+    assert any(card.rarity == CardRarity.Rare for card in config._get_sampler()[0])
+
+################################################################################
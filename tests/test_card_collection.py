@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+# Imported first, as main.py does, so the package's circular imports settle.
+import Classes.Core.Bot  # noqa: F401
+from Classes.TradingCardGame import CardCollection, CardCount
+from Enums import CardRarity
+
+################################################################################
+def _collection(counts):
+
+    manager = SimpleNamespace(version=0)
+    coll: CardCollection = CardCollection.__new__(CardCollection)
+    coll._mgr = SimpleNamespace(_mgr=SimpleNamespace(card_manager=manager))
+    coll._cards = [
+        CardCount(coll, f"count{i}", SimpleNamespace(id=f"card{i}", series=SimpleNamespace(id=series), rarity=rarity), qty)
+        for i, (series, rarity, qty) in enumerate(counts)
+    ]
+    coll._build_indexes()
+    return coll, manager
+
+################################################################################
+def test_removing_a_count_updates_every_index() -> None:
+
+    coll, _ = _collection([("s1", CardRarity.Common, 2), ("s1", CardRarity.Rare, 1), ("s2", CardRarity.Common, 3)])
+    first, second, third = coll.cards
+
+    coll._remove_count(first)
+
+    assert coll.cards == [second, third] and len(coll) == 4
+    assert first.card not in coll
+    assert coll.get_cards_by_series(SimpleNamespace(id="s1")) == [second.card]
+    assert coll.common_cards == [third]
+
+################################################################################
+def test_removing_a_count_twice_is_harmless() -> None:
+
+    coll, _ = _collection([("s1", CardRarity.Common, 2), ("s1", CardRarity.Rare, 1)])
+    first, second = coll.cards
+
+    coll._remove_count(first)
+    coll._remove_count(first)
+
+    assert coll.cards == [second] and len(coll) == 1
+    assert coll.get_cards_by_series(SimpleNamespace(id="s1")) == [second.card]
+
+################################################################################
+def test_removing_a_count_whose_rarity_just_changed() -> None:
+
+    coll, manager = _collection([("s1", CardRarity.Common, 1), ("s1", CardRarity.Common, 1)])
+    first, second = coll.cards
+
+    # The card is edited, and the collection hasn't regrouped it yet.
+    first.card.rarity = CardRarity.Legendary
+    manager.version += 1
+    coll._remove_count(first)
+
+    assert coll.cards == [second]
+    assert coll.common_cards == [second] and coll.legendary_cards == []
+
+################################################################################
@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+# Imported first, as main.py does, so the package's circular imports settle.
+import Classes.Core.Bot  # noqa: F401
+from Classes.TradingCardGame import CardDeck
+
+################################################################################
+class RecordingDeck(CardDeck):
+    """A deck whose card picker returns `picked` and which records what it
+    re-renders, in place of the real UI and renderer."""
+
+    __slots__ = ("picked", "rendered")
+
+    async def select_card(self, interaction, prompt):
+        return self.picked
+
+    def reorder(self) -> None:
+        self.rendered.append("reorder")
+
+    async def generate_image(self, interaction) -> None:
+        self.rendered.append("image")
+
+################################################################################
+class FakeSlot:
+
+    def __init__(self, deck: CardDeck, card_id: str, confirm: bool) -> None:
+
+        self.deck = deck
+        self.card = SimpleNamespace(id=card_id)
+        self.confirm = confirm
+
+    async def remove(self, interaction) -> None:
+        if self.confirm:
+            self.deck._remove_slot(self)
+
+################################################################################
+def _deck(confirm: bool) -> RecordingDeck:
+
+    deck: RecordingDeck = RecordingDeck.__new__(RecordingDeck)
+    deck._cards = [FakeSlot(deck, f"card{i}", confirm) for i in range(3)]
+    deck._by_card = {slot.card.id: slot for slot in deck._cards}
+    deck._by_marker = None
+    deck.rendered = []
+    return deck
+
+################################################################################
+def test_removing_a_card_reorders_and_rerenders() -> None:
+
+    deck = _deck(confirm=True)
+    deck.picked = deck._cards[1].card
+
+    asyncio.run(deck.remove_card(None))
+
+    assert len(deck._cards) == 2
+    assert deck.rendered == ["reorder", "image"]
+
+################################################################################
+def test_cancelled_removal_changes_nothing() -> None:
+
+    deck = _deck(confirm=False)
+    deck.picked = deck._cards[1].card
+
+    asyncio.run(deck.remove_card(None))
+
+    assert len(deck._cards) == 3
+    assert deck.rendered == []
+
+################################################################################
+def test_picking_nothing_changes_nothing() -> None:
+
+    deck = _deck(confirm=True)
+    deck.picked = None
+
+    asyncio.run(deck.remove_card(None))
+
+    assert len(deck._cards) == 3
+    assert deck.rendered == []
+
+################################################################################
@@ -0,0 +1,86 @@
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+
+################################################################################
+async def _measure_lag(workload, interval: float = 0.001) -> Tuple[float, float]:
+    """Runs `workload` while a heartbeat measures how late the event loop
+    wakes it up, returning the p50 and p99 lag in seconds."""
+
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    try:
+        await workload()
+    finally:
+        done.set()
+        await beat
+
+    cuts = statistics.quantiles(lags, n=100)
+    return cuts[49], cuts[98]
+
+################################################################################
+def test_inserts_do_not_block_the_event_loop(make_database) -> None:
+
+    db = make_database(query_time=0.01)
+    inserts = 50
+
+    async def blocking() -> None:
+        # How inserts used to be made: waiting on the query from the loop.
+        for _ in range(inserts):
+            db.execute("INSERT")
+            await asyncio.sleep(0)
+
+    async def queued() -> None:
+        for i in range(inserts):
+            db.insert.card_count("collection", f"card{i}", 1)
+            await asyncio.sleep(0)
+        # The loop keeps serving while the lane works through the backlog.
+        await asyncio.to_thread(db.drain)
+
+    before = asyncio.run(_measure_lag(blocking))
+    after = asyncio.run(_measure_lag(queued))
+
+    print(
+        f"\nEvent loop lag over {inserts} inserts of {db.query_time * 1000:.0f}ms each:"
+        f"\n  blocking: p50 {before[0] * 1000:.2f}ms, p99 {before[1] * 1000:.2f}ms"
+        f"\n  queued:   p50 {after[0] * 1000:.2f}ms, p99 {after[1] * 1000:.2f}ms"
+    )
+
+    assert before[0] >= db.query_time * 0.8
+    assert after[1] < db.query_time / 2
+
+################################################################################
+def test_insert_returns_its_id_and_keeps_write_order(make_database) -> None:
+
+    db = make_database(query_time=0.01)
+    new_id = db.insert.card_count("collection", "card", 1)
+    db.update.execute("UPDATE")
+    db.delete.execute("DELETE")
+    db.drain()
+
+    queries = [query for query, _, _ in db.applied]
+    assert queries[0].startswith("INSERT INTO trading_card_counts")
+    assert queries[1:] == ["UPDATE", "DELETE"]
+    assert db.applied[0][1][0] == new_id
+
+################################################################################
+def test_failed_queued_write_is_reported(make_database, capsys) -> None:
+
+    db = make_database()
+    db.submit("FAIL", 1)
+    db.drain()
+
+    out = capsys.readouterr().out
+    assert "Queued database write failed" in out and "RuntimeError" in out
+
+################################################################################
@@ -0,0 +1,195 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+import pytest
+from psycopg2 import OperationalError
+from psycopg2.errors import UniqueViolation
+
+from Classes.Database.Database import Database
+
+################################################################################
+class FakeConnection:
+    """A connection whose commits go through the given scripted outcomes in
+    turn: ``None`` commits, an exception class raises it."""
+
+    def __init__(self, outcomes: List[Any]) -> None:
+
+        self.outcomes = outcomes
+        self.rolled_back = False
+
+    def cursor(self):
+
+        return FakeCursor()
+
+    def commit(self) -> None:
+
+        outcome = self.outcomes.pop(0)
+        if outcome is not None:
+            raise outcome()
+
+    def rollback(self) -> None:
+
+        self.rolled_back = True
+
+################################################################################
+class FakeCursor:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def execute(self, query, args) -> None:
+        pass
+
+################################################################################
+class FakePool:
+
+    def __init__(self, outcomes: List[Any]) -> None:
+
+        self.outcomes = outcomes
+        self.closed_conns = 0
+
+    def getconn(self) -> FakeConnection:
+
+        return FakeConnection(self.outcomes)
+
+    def putconn(self, conn, close: bool = False) -> None:
+
+        self.closed_conns += close
+
+################################################################################
+@pytest.fixture
+def database():
+
+    db = Database(SimpleNamespace())
+    yield db
+    db.close()
+
+################################################################################
+def test_replayed_insert_that_already_landed_succeeds(database) -> None:
+
+    # The commit lands but the connection drops before it's acknowledged, so
+    # the retry collides with the row it inserted the first time.
+    pool = FakePool([OperationalError, UniqueViolation])
+
+    assert database._run(pool, "INSERT", (), None) is None
+    assert pool.closed_conns == 1
+
+################################################################################
+def test_unique_violation_on_first_attempt_is_raised(database) -> None:
+
+    pool = FakePool([UniqueViolation])
+
+    with pytest.raises(UniqueViolation):
+        database._run(pool, "INSERT", (), None)
+
+################################################################################
+def test_connection_lost_on_every_attempt_is_raised(database) -> None:
+
+    pool = FakePool([OperationalError] * (Database.MAX_RETRIES + 1))
+
+    with pytest.raises(OperationalError):
+        database._run(pool, "INSERT", (), None)
+
+################################################################################
+def _profile_editing_session(db) -> List[List[Callable[[], None]]]:
+    """A typical session of creating and filling in a profile, as the writes
+    each interaction makes. Each modal or select sets several fields, and
+    every field's setter writes its row."""
+
+    profile_id = db.insert.profile(1, 2)
+
+    details = SimpleNamespace(
+        profile_id=profile_id, name=None, custom_url=None, color=None,
+        jobs=[], rates=None
+    )
+    aag = SimpleNamespace(
+        profile_id=profile_id, world=None, gender=None, pronouns=[], race=None,
+        clan=None, orientation=None, height=None, age=None, mare=None
+    )
+    personality = SimpleNamespace(
+        profile_id=profile_id, likes=None, dislikes=None, personality=None,
+        aboutme=None
+    )
+    images = SimpleNamespace(profile_id=profile_id, thumbnail=None, main_image=None)
+    profile = SimpleNamespace(id=profile_id, post_url=None, is_public=True)
+
+    def add_image(url: str) -> Callable[[], None]:
+        def _add() -> None:
+            image = SimpleNamespace(
+                id=db.insert.additional_image(profile_id, url), url=url, caption=None
+            )
+            image.caption = "Caption"
+            db.update.additional_image(image)
+        return _add
+
+    # Name, URL, color, jobs and rates modal.
+    edit_details = [lambda: db.update.profile_details(details)] * 5
+    # Height, age, race/clan, gender/pronouns, orientation, world and mare.
+    edit_ataglance = [lambda: db.update.profile_ataglance(aag)] * 9
+    # Likes, dislikes, personality and about me.
+    edit_personality = [lambda: db.update.profile_personality(personality)] * 4
+    edit_images = [lambda: db.update.profile_images(images)] * 2
+    add_images = [add_image("https://example.com/1.png"), add_image("https://example.com/2.png")]
+    # Posting sets the post URL and makes the profile public.
+    post = [lambda: db.update.profile(profile)] * 2
+
+    return [edit_details, edit_ataglance, edit_personality, edit_images, add_images, post]
+
+################################################################################
+def _replay(db) -> int:
+
+    for interaction in _profile_editing_session(db):
+        for write in interaction:
+            write()
+        # Interactions are seconds apart, well past the flush delay.
+        db.update.flush()
+
+    db.drain()
+    return len(db.applied)
+
+################################################################################
+def test_profile_editing_session_query_count(make_database) -> None:
+
+    # Outside of an event loop deferred updates are written straight away, so
+    # this is one query per write.
+    writes = _replay(make_database())
+
+    async def replay_on_loop() -> int:
+        return _replay(make_database())
+
+    after = asyncio.run(replay_on_loop())
+    # Every query used to be preceded by a `SELECT 1` liveness check.
+    before = writes * 2
+
+    print(
+        f"\nProfile editing session round trips:"
+        f"\n  SELECT 1 before every query:   {before}"
+        f"\n  reconnecting on failure:       {writes}"
+        f"\n  with deferred updates batched: {after}"
+    )
+
+    assert after < writes < before
+
+################################################################################
+def test_deferred_updates_land_before_later_inserts_and_deletes(make_database) -> None:
+
+    db = make_database()
+    count = SimpleNamespace(id="count", quantity=2)
+
+    async def edit() -> None:
+        db.update.card_count(count)
+        db.delete.execute("DELETE")
+        db.update.card_count(count)
+        db.insert.card_count("collection", "card", 1)
+
+    asyncio.run(edit())
+    db.drain()
+
+    queries = [query.split()[0] for query, _, _ in db.applied]
+    assert queries == ["UPDATE", "DELETE", "UPDATE", "INSERT"]
+
+################################################################################
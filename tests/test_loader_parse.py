@@ -0,0 +1,65 @@
+import time
+from types import SimpleNamespace
+
+from benchmarks.loader_parse import GUILD_ID, indexed_parse, make_loader, make_payload, nested_parse
+from Classes.Database.Loader import DatabaseLoader
+
+################################################################################
+def _timed(func) -> float:
+
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+################################################################################
+def test_indexed_parse_matches_nested_scan() -> None:
+
+    payload = make_payload(1)
+
+    assert indexed_parse(make_loader(), payload) == nested_parse(payload)
+
+################################################################################
+def test_indexed_parse_scales_linearly() -> None:
+
+    loader = make_loader()
+    small, large = make_payload(1), make_payload(10)
+
+    small_time = min(_timed(lambda: indexed_parse(loader, small)) for _ in range(3))
+    large_time = min(_timed(lambda: indexed_parse(loader, large)) for _ in range(3))
+
+    # Ten times the rows; a join that rescans child tables would take ~100x.
+    assert large_time < small_time * 30
+
+################################################################################
+def test_indexed_parse_beats_nested_scan() -> None:
+
+    loader = make_loader()
+    payload = make_payload(2)
+
+    indexed = min(_timed(lambda: indexed_parse(loader, payload)) for _ in range(3))
+    nested = _timed(lambda: nested_parse(payload))
+
+    assert indexed * 10 < nested
+
+################################################################################
+def test_unscoped_load_reads_the_scoped_projection() -> None:
+
+    payload = make_payload(1)
+    queries = {}
+
+    def stream(query, *args):
+        table = next(t for t in DatabaseLoader.SCOPED_QUERIES if DatabaseLoader._unscoped_query(t) == query)
+        queries[table] = (query, args)
+        return iter(payload[table])
+
+    bot = SimpleNamespace(guilds=[SimpleNamespace(id=GUILD_ID)], database=SimpleNamespace(stream=stream))
+    loader = DatabaseLoader(bot)
+
+    assert loader._parse_all(loader._get_payload()) == nested_parse(payload)
+    assert queries.keys() == DatabaseLoader.SCOPED_QUERIES.keys()
+    for table, (query, args) in queries.items():
+        scoped = DatabaseLoader.SCOPED_QUERIES[table]
+        assert not args and "%s" not in query
+        assert query.split(" FROM ")[0] == scoped.split(" FROM ")[0]
+
+################################################################################
@@ -0,0 +1,51 @@
+from benchmarks.profile_matching import make_index, make_profiles, pairwise_top_matches
+from Classes.Profiles.MatchingIndex import MatchFeatures, MatchingIndex
+
+################################################################################
+def _ranked(matches):
+
+    return [(profile.id, score) for profile, score in matches]
+
+################################################################################
+def test_scores_match_pairwise_scoring() -> None:
+
+    profiles = [p for p in make_profiles(300) if p.preferences.is_matchable()]
+    features = {p.id: MatchFeatures.from_profile(p) for p in profiles}
+
+    for seeker in profiles:
+        for candidate in profiles:
+            expected = seeker.preferences.match(candidate)[1]
+            assert MatchingIndex.score(features[seeker.id], features[candidate.id]) == expected
+
+################################################################################
+def test_top_matches_rank_like_pairwise_matching() -> None:
+
+    profiles = make_profiles(2_000)
+    index = make_index(profiles)
+    seekers = [p for p in profiles if p.preferences.is_matchable()][:200]
+
+    for seeker in seekers:
+        assert _ranked(index.top_matches(seeker)) == _ranked(pairwise_top_matches(seeker, profiles))
+
+################################################################################
+def test_refreshed_profiles_rank_like_pairwise_matching() -> None:
+
+    profiles = make_profiles(500)
+    index = make_index(profiles)
+
+    # Hide some profiles and make others unmatchable after the index is built.
+    for profile in profiles[::7]:
+        profile.is_public = False
+        index.refresh(profile)
+    for profile in profiles[3::11]:
+        profile.preferences.music_prefs = []
+        index.refresh(profile)
+
+    public = [p for p in profiles if p.is_public]
+    seekers = [p for p in public if p.preferences.is_matchable()][:100]
+
+    assert len(index) == sum(p.preferences.is_matchable() for p in public)
+    for seeker in seekers:
+        assert _ranked(index.top_matches(seeker)) == _ranked(pairwise_top_matches(seeker, public))
+
+################################################################################
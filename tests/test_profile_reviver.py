@@ -0,0 +1,84 @@
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+# Imported first, as main.py does, so the package's circular imports settle.
+import Classes.Core.Bot  # noqa: F401
+from Classes.Profiles.ProfileReviver import ProfileReviver
+
+################################################################################
+DURATION = 24 * 60
+
+################################################################################
+def _thread(thread_id: int, archived: bool) -> SimpleNamespace:
+
+    # Last active well over a day ago, as the cache still has it just after
+    # the profile is reposted.
+    return SimpleNamespace(
+        id=thread_id,
+        archived=archived,
+        archive_timestamp=datetime.now(timezone.utc) - timedelta(days=2),
+        last_message_id=None,
+        auto_archive_duration=DURATION,
+    )
+
+################################################################################
+def _profile(profile_id: str, thread_id: int, public: bool = True) -> SimpleNamespace:
+
+    return SimpleNamespace(
+        id=profile_id,
+        is_public=public,
+        post_url=f"https://discord.com/channels/1/{thread_id}/{thread_id + 1}",
+    )
+
+################################################################################
+@pytest.fixture
+def reviver():
+
+    threads = {}
+    guild = SimpleNamespace(parent=SimpleNamespace(get_thread=threads.get))
+    return ProfileReviver(SimpleNamespace(guild=guild)), threads
+
+################################################################################
+def test_repost_is_scheduled_from_now_not_the_stale_thread(reviver) -> None:
+
+    reviver, threads = reviver
+    threads[100] = _thread(100, archived=True)
+    profile = _profile("p", 100)
+
+    reviver.track(profile)
+    assert reviver._due["p"] <= time.time()
+
+    reviver.track(profile, posted=True)
+    expected = time.time() + DURATION * 60 * (1 - ProfileReviver.REVIVE_MARGIN)
+    assert reviver._due["p"] == pytest.approx(expected, abs=5)
+
+################################################################################
+def test_thread_maps_stay_in_step(reviver) -> None:
+
+    reviver, threads = reviver
+    for i in range(3):
+        threads[100 + i] = _thread(100 + i, archived=False)
+
+    profile = _profile("p", 100)
+    other = _profile("q", 102)
+    reviver.track(profile)
+    reviver.track(other)
+
+    # Moving to another thread forgets the old one.
+    profile.post_url = _profile("p", 101).post_url
+    reviver.track(profile, posted=True)
+    assert reviver._threads == {101: "p", 102: "q"}
+    assert reviver._profile_threads == {"p": 101, "q": 102}
+
+    reviver.thread_deleted(102)
+    assert reviver._threads == {101: "p"} and reviver._profile_threads == {"p": 101}
+    assert "q" not in reviver._due
+
+    profile.is_public = False
+    reviver.track(profile)
+    assert not reviver._threads and not reviver._profile_threads and not reviver._due
+
+################################################################################